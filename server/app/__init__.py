@@ -8,33 +8,47 @@ env_path = Path(__file__).resolve().parents[1] / ".env"
 load_dotenv(dotenv_path=env_path)
 
 from .config import Config
-from .extensions import db, migrate, jwt
+from .extensions import db, migrate, jwt, cache
+from .utils.db_tuning import configure_engine_options, register_engine_hooks
+from .utils.json_provider import FastJSONProvider
+
+def absolute_sqlite_uri(app, uri: str) -> str:
+    if not uri.startswith("sqlite:///"):
+        return uri
+
+    # Everything after sqlite:/// is a filesystem path (often relative)
+    rel_path = uri.replace("sqlite:///", "", 1)
+
+    # If it's already absolute, leave it; if relative, anchor it to instance_path
+    p = Path(rel_path)
+    if not p.is_absolute():
+        p = Path(app.instance_path) / rel_path
+
+    p.parent.mkdir(parents=True, exist_ok=True)
+    return f"sqlite:///{p}"
+
 
 def create_app():
     # instance_relative_config makes instance_path consistent
     app = Flask(__name__, instance_relative_config=True)
+    app.json = FastJSONProvider(app)
     app.url_map.strict_slashes = False
     app.config.from_object(Config)
 
-    # If using sqlite and path is relative, force an absolute path inside instance/
-    uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
-    if uri.startswith("sqlite:///"):
-        # Everything after sqlite:/// is a filesystem path (often relative)
-        rel_path = uri.replace("sqlite:///", "", 1)
-
-        # If it's already absolute, leave it; if relative, anchor it to instance_path
-        p = Path(rel_path)
-        if not p.is_absolute():
-            p = Path(app.instance_path) / rel_path
-
-        p.parent.mkdir(parents=True, exist_ok=True)
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{p}"
+    # If using sqlite and paths are relative, force absolute paths inside instance/
+    app.config["SQLALCHEMY_DATABASE_URI"] = absolute_sqlite_uri(app, app.config.get("SQLALCHEMY_DATABASE_URI", ""))
+    app.config["SQLALCHEMY_BINDS"] = {
+        key: absolute_sqlite_uri(app, uri) for key, uri in (app.config.get("SQLALCHEMY_BINDS") or {}).items()
+    }
 
     CORS(app, supports_credentials=True, origins=[app.config["CORS_ORIGIN"]])
 
+    configure_engine_options(app)
     db.init_app(app)
+    register_engine_hooks(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    cache.init_app(app)
 
     from .routes.auth import auth_bp
     app.register_blueprint(auth_bp, url_prefix="/auth")
@@ -52,6 +66,24 @@ def create_app():
     register_error_handlers(app)
     from .routes.reviews import reviews_bp
     app.register_blueprint(reviews_bp, url_prefix="/reviews")
+    from .routes.changes import changes_bp
+    app.register_blueprint(changes_bp, url_prefix="/changes")
+    from .utils.changes import register_change_tracking
+    register_change_tracking(app)
+    from .cli import register_commands
+    register_commands(app)
+    from .utils.query_budget import register_query_debug
+    register_query_debug(app)
+    from .utils.slow_queries import register_slow_query_log
+    register_slow_query_log(app)
+    from .utils.metrics import register_metrics
+    register_metrics(app)
+    from .utils.profiling import register_profiling
+    register_profiling(app)
+    from .utils.compression import register_compression
+    register_compression(app)
+    from .utils.invalidation import register_invalidation_bus
+    register_invalidation_bus(app)
 
     @app.get("/health")
     def health():
@@ -0,0 +1,343 @@
+import asyncio
+import logging
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import decode_token
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import create_app
+from .extensions import db
+from .models.notification import Notification
+from .models.user_change import UserChange
+from .routes.notifications import NOTIFICATION_LIST
+from .serializers.notification import notification_dict
+from .utils.changes import changes_since
+from .utils.json_provider import dumps_bytes
+
+# ASGI serving mode (`uvicorn asgi:app`, or SERVER_MODE=asgi in start.sh).
+#
+# Every Flask blueprint is served unchanged through a2wsgi's WSGI bridge (a
+# small thread pool, ASGI_WSGI_THREADS). The long-lived notification endpoints
+# are native coroutines, so an idle client costs a task and a socket, not a
+# thread:
+#
+#   GET /notifications/stream             server-sent events; "unread" event
+#                                         with {unread, latest_id} on change
+#   GET /notifications/wait?after=<id>    long-poll; {items, more}: the next
+#       &timeout=<s>                      WAIT_PAGE notifications by id (pass the
+#                                         last id as `after` again while more is
+#                                         true), or 204 after timeout (max
+#                                         NOTIFY_WAIT_MAX)
+#   GET /changes?since=<seq>&timeout=<s>  same contract as routes/changes.py,
+#                                         without holding a thread
+#
+# One ChangeHub task per process polls user_changes for new rows (a
+# primary-key range query, whatever the number of clients) and wakes only the
+# affected users. It starts from the current head when the first client
+# subscribes (before that client's first query) and stops when the last one
+# leaves. Handlers clear their event before each query, so a wake-up that
+# lands during the query isn't lost. Database work runs in the default executor with its own app
+# context. The notification routes only exist in ASGI mode.
+
+log = logging.getLogger("app.asgi")
+
+WAIT_PAGE = 20
+
+SSE_HEADERS = [
+    (b"content-type", b"text/event-stream"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),  # don't let a proxy buffer the stream
+]
+
+
+class ChangeHub:
+    def __init__(self, app, interval: float):
+        self.app = app
+        self.interval = interval
+        self.last_id = None
+        self.waiters = defaultdict(set)  # user_id -> {asyncio.Event}
+        self._task = None
+        self._starting = None
+
+    async def subscribe(self, user_id: int) -> asyncio.Event:
+        """Register a waiter; the hub watches from now on, before the caller's first query."""
+        event = asyncio.Event()
+        self.waiters[user_id].add(event)
+        try:
+            if self._task is None or self._task.done():
+                if self._starting is None:
+                    self._starting = asyncio.get_running_loop().create_task(self._start())
+                await asyncio.shield(self._starting)
+        except BaseException:  # cancelled while the hub was starting
+            self.unsubscribe(user_id, event)
+            raise
+        return event
+
+    async def _start(self):
+        try:
+            # a restarted hub starts from the current head, not where it stopped
+            self.last_id = await asyncio.to_thread(self._head)
+        except SQLAlchemyError as e:
+            log.warning("change hub start failed: %s", e)
+            self.last_id = None  # _changed_users retries
+        finally:
+            self._starting = None
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def unsubscribe(self, user_id: int, event: asyncio.Event):
+        events = self.waiters.get(user_id)
+        if events is not None:
+            events.discard(event)
+            if not events:
+                del self.waiters[user_id]
+
+    async def _run(self):
+        # stops by itself once nobody is listening
+        while self.waiters:
+            try:
+                changed = await asyncio.to_thread(self._changed_users)
+            except SQLAlchemyError as e:
+                log.warning("change poll failed: %s", e)
+                changed = ()
+
+            for user_id in changed:
+                for event in self.waiters.get(user_id, ()):
+                    event.set()
+            await asyncio.sleep(self.interval)
+
+    def _head(self) -> int:
+        with self.app.app_context():
+            return db.session.execute(select(func.coalesce(func.max(UserChange.id), 0))).scalar()
+
+    def _changed_users(self) -> set:
+        if self.last_id is None:
+            self.last_id = self._head()
+            return set()
+
+        with self.app.app_context():
+            rows = db.session.execute(
+                select(UserChange.user_id, func.max(UserChange.id))
+                .where(UserChange.id > self.last_id)
+                .group_by(UserChange.user_id)
+            ).all()
+
+        if rows:
+            self.last_id = max(latest for _, latest in rows)
+        return {user_id for user_id, _ in rows}
+
+
+class ASGIApp:
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        config = flask_app.config
+        self.wsgi = WSGIMiddleware(flask_app, workers=config.get("ASGI_WSGI_THREADS", 10))
+        self.hub = ChangeHub(flask_app, config.get("NOTIFY_POLL_INTERVAL", 1.0))
+        self.heartbeat = config.get("NOTIFY_HEARTBEAT", 15.0)
+        self.wait_max = config.get("NOTIFY_WAIT_MAX", 30.0)
+        self.changes_wait_max = config.get("CHANGES_WAIT_MAX", 25.0)
+        self.routes = {
+            "/notifications/stream": self.stream,
+            "/notifications/wait": self.wait,
+            "/changes": self.changes,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+
+        if scope["type"] == "http" and scope["method"] == "GET":
+            handler = self.routes.get(scope["path"].rstrip("/"))
+            if handler is not None:
+                return await handler(scope, receive, send)
+
+        await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # --- helpers ---
+
+    def headers_for(self, scope, extra=()):
+        headers = list(extra)
+        origin = dict(scope["headers"]).get(b"origin", b"").decode("latin-1")
+        if origin and origin == self.flask_app.config.get("CORS_ORIGIN"):
+            headers += [
+                (b"access-control-allow-origin", origin.encode("latin-1")),
+                (b"access-control-allow-credentials", b"true"),
+                (b"vary", b"Origin"),
+            ]
+        return headers
+
+    async def respond(self, scope, send, status, body=None):
+        payload = dumps_bytes(body) if body is not None else b""
+        headers = [(b"content-type", b"application/json")] if body is not None else []
+        await send({"type": "http.response.start", "status": status, "headers": self.headers_for(scope, headers)})
+        await send({"type": "http.response.body", "body": payload})
+
+    def identity(self, scope):
+        """user id from the JWT access cookie, or None."""
+        cookies = SimpleCookie()
+        try:
+            cookies.load(dict(scope["headers"]).get(b"cookie", b"").decode("latin-1"))
+        except Exception:
+            return None
+
+        morsel = cookies.get(self.flask_app.config["JWT_ACCESS_COOKIE_NAME"])
+        if morsel is None:
+            return None
+        try:
+            with self.flask_app.app_context():
+                return int(decode_token(morsel.value)["sub"])
+        except Exception:  # expired / tampered / wrong type
+            return None
+
+    async def query(self, fn, *args):
+        def run():
+            with self.flask_app.app_context():
+                return fn(*args)
+        return await asyncio.to_thread(run)
+
+    # --- database reads (run in the executor) ---
+
+    @staticmethod
+    def unread_state(user_id):
+        unread, latest = db.session.execute(
+            select(
+                func.count(Notification.id).filter(Notification.is_read.is_(False)),
+                func.coalesce(func.max(Notification.id), 0),
+            ).where(Notification.user_id == user_id)
+        ).one()
+        return {"unread": unread, "latest_id": latest}
+
+    @staticmethod
+    def notifications_after(user_id, after):
+        # a cursor on id: oldest first, unlike the newest-first list
+        rows = db.session.execute(
+            NOTIFICATION_LIST.order_by(None)
+            .order_by(Notification.id)
+            .where(Notification.user_id == user_id, Notification.id > after)
+            .limit(WAIT_PAGE + 1)
+        ).all()
+        return [notification_dict(n) for n in rows[:WAIT_PAGE]], len(rows) > WAIT_PAGE
+
+    # --- handlers ---
+
+    async def wait(self, scope, receive, send):
+        user_id = self.identity(scope)
+        if user_id is None:
+            return await self.respond(scope, send, 401, {"error": "Missing or invalid token."})
+
+        args = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        try:
+            after = int(args.get("after", ["0"])[0])
+            timeout = min(max(float(args.get("timeout", ["25"])[0]), 0), self.wait_max)
+        except ValueError:
+            return await self.respond(scope, send, 400, {"error": "after and timeout must be numbers."})
+
+        # subscribe before the first check so nothing lands in between
+        event = await self.hub.subscribe(user_id)
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                # clear before querying: a wake-up during the query must not be lost
+                event.clear()
+                items, more = await self.query(self.notifications_after, user_id, after)
+                remaining = deadline - loop.time()
+                if items or remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.hub.unsubscribe(user_id, event)
+
+        if not items:
+            return await self.respond(scope, send, 204)
+        await self.respond(scope, send, 200, {"items": items, "more": more})
+
+    async def changes(self, scope, receive, send):
+        user_id = self.identity(scope)
+        if user_id is None:
+            return await self.respond(scope, send, 401, {"error": "Missing or invalid token."})
+
+        args = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        try:
+            since = int(args["since"][0]) if "since" in args else None
+            timeout = min(max(float(args.get("timeout", ["0"])[0]), 0), self.changes_wait_max)
+        except ValueError:
+            return await self.respond(scope, send, 400, {"error": "since and timeout must be numbers."})
+
+        event = await self.hub.subscribe(user_id)
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                event.clear()
+                result = await self.query(changes_since, user_id, since)
+                remaining = deadline - loop.time()
+                if result is not None or remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.hub.unsubscribe(user_id, event)
+
+        await self.respond(scope, send, 200, result or {"seq": since, "changes": {}, "refetch": [], "reset": False, "more": False})
+
+    async def stream(self, scope, receive, send):
+        user_id = self.identity(scope)
+        if user_id is None:
+            return await self.respond(scope, send, 401, {"error": "Missing or invalid token."})
+
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        event = await self.hub.subscribe(user_id)
+        watcher = asyncio.get_running_loop().create_task(watch_disconnect())
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": self.headers_for(scope, SSE_HEADERS)})
+            await send({"type": "http.response.body", "body": b"retry: 5000\n\n", "more_body": True})
+
+            last = None
+            while not disconnected.is_set():
+                event.clear()
+                # re-read on every wake-up and heartbeat (cheap, and catches anything missed)
+                state = await self.query(self.unread_state, user_id)
+                if state != last:
+                    chunk = b"event: unread\ndata: " + dumps_bytes(state) + b"\n\n"
+                    last = state
+                else:
+                    chunk = b": ping\n\n"
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+                waits = [asyncio.ensure_future(event.wait()), asyncio.ensure_future(disconnected.wait())]
+                _, pending = await asyncio.wait(waits, timeout=self.heartbeat, return_when=asyncio.FIRST_COMPLETED)
+                for task in pending:
+                    task.cancel()
+        except OSError:  # client went away mid-send
+            pass
+        finally:
+            self.hub.unsubscribe(user_id, event)
+            watcher.cancel()
+
+
+def create_asgi_app():
+    return ASGIApp(create_app())
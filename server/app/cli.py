@@ -0,0 +1,192 @@
+import sqlite3
+
+import click
+from flask.cli import AppGroup
+
+rollups_cli = AppGroup("rollups", help="Daily analytics rollups.")
+replica_cli = AppGroup("replica", help="Local read-replica helpers.")
+changes_cli = AppGroup("changes", help="Per-user change feed.")
+jobs_cli = AppGroup("jobs", help="Periodic maintenance jobs (app/jobs.py).")
+tasks_cli = AppGroup("tasks", help="Background task queue (app/tasks.py).")
+
+
+@click.command("seed")
+@click.option("--users", default=1000, show_default=True)
+@click.option("--skills", default=10000, show_default=True)
+@click.option("--requests", default=20000, show_default=True, help="Session requests (all statuses).")
+@click.option("--slots", default=5000, show_default=True, help="Availability slots.")
+@click.option("--admins", default=1, show_default=True, help="First N seeded users are admins.")
+@click.option("--seed", default=42, show_default=True, help="Same seed + same empty DB = same data.")
+@click.option("--batch-size", default=5000, show_default=True, help="Rows per executemany/commit.")
+@click.option("--password", default="password", show_default=True, help="Password of every seeded account.")
+def seed_command(users, skills, requests, slots, admins, seed, batch_size, password):
+    """Bulk-generate synthetic users, skills, sessions, reviews, notifications and availability."""
+    from .utils.seed import Seeder
+    from .utils.slow_queries import slow_queries
+
+    if users < 2:
+        raise click.BadParameter("need at least 2 users (requests go between two people).", param_hint="--users")
+
+    seeder = Seeder(seed=seed, batch_size=batch_size, password=password, echo=click.echo)
+    with slow_queries.paused():  # every bulk batch would be "slow"
+        stats = seeder.run(users=users, skills=skills, requests=requests, slots=slots, admins=admins)
+    click.echo(f"Seeded {sum(stats.values())} rows. Accounts: user<id>@seed.skillswap.test / {password}")
+    click.echo("Run `flask rollups update` to fold the new rows into the admin timeseries.")
+
+
+@rollups_cli.command("update")
+@click.option("--batch-size", default=5000, show_default=True, help="Rows folded in per transaction.")
+def rollups_update(batch_size):
+    """Fold rows added since the last run into daily_rollups."""
+    from .utils.rollups import update_rollups
+
+    stats = update_rollups(batch_size=batch_size)
+    for source, n in stats.items():
+        click.echo(f"{source}: {n} rows")
+
+
+@replica_cli.command("sync")
+def replica_sync():
+    """Copy the primary SQLite file onto the replica (local testing stand-in for replication)."""
+    from .extensions import db
+    from .utils.replica import REPLICA_BIND
+
+    engines = db.engines
+    if REPLICA_BIND not in engines:
+        raise click.ClickException("No replica configured (set DATABASE_REPLICA_URL).")
+
+    primary, replica = engines[None].url, engines[REPLICA_BIND].url
+    if primary.get_backend_name() != "sqlite" or replica.get_backend_name() != "sqlite":
+        raise click.ClickException("replica sync only supports SQLite files.")
+
+    src = sqlite3.connect(primary.database)
+    dst = sqlite3.connect(replica.database)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+    click.echo(f"Copied {primary.database} -> {replica.database}")
+
+
+@changes_cli.command("prune")
+@click.option("--days", default=7, show_default=True, help="Keep this many days of changes.")
+def changes_prune(days):
+    """Drop old user_changes rows (clients further behind get reset=true)."""
+    from .utils.changes import prune_changes
+
+    click.echo(f"Pruned {prune_changes(days)} changes older than {days} days.")
+
+
+@jobs_cli.command("run")
+@click.option("--tick", type=float, default=None, help="Seconds between due-job checks [JOBS_TICK].")
+@click.option("--threads", type=int, default=None, help="Jobs run in parallel [JOBS_THREADS].")
+def jobs_run(tick, threads):
+    """Run the scheduler until SIGTERM/ctrl-C. Safe to start on several instances."""
+    from flask import current_app
+    from . import jobs  # noqa: F401  registers the jobs
+    from .utils.scheduler import scheduler
+
+    app = current_app._get_current_object()
+    tick = tick or app.config.get("JOBS_TICK", 5)
+    threads = threads or app.config.get("JOBS_THREADS", 2)
+    click.echo(f"Scheduler {scheduler.instance}: {len(scheduler.jobs)} jobs, tick {tick}s, {threads} threads")
+    scheduler.run_forever(app, tick=tick, threads=threads)
+
+
+@jobs_cli.command("list")
+def jobs_list():
+    """Registered jobs with their schedule, next run and last result."""
+    from sqlalchemy import select
+    from .extensions import db
+    from . import jobs  # noqa: F401
+    from .models.job import ScheduledJob
+    from .utils.scheduler import scheduler
+
+    scheduler.sync()
+    rows = {r.name: r for r in db.session.execute(select(ScheduledJob)).scalars()}
+    for name, job in sorted(scheduler.jobs.items()):
+        row = rows.get(name)
+        click.echo(
+            f"{name:<24}{job.cron.expr:<16}next {row.next_run_at:%Y-%m-%d %H:%M:%S}  "
+            f"last {row.last_run_at or '-'} {row.last_status or ''}"
+        )
+
+
+@jobs_cli.command("trigger")
+@click.argument("name")
+def jobs_trigger(name):
+    """Run one job now (still takes its lease, so it never overlaps a scheduled run)."""
+    from . import jobs  # noqa: F401
+    from .utils.scheduler import scheduler
+
+    job = scheduler.jobs.get(name)
+    if job is None:
+        raise click.BadParameter(f"no such job; one of: {', '.join(sorted(scheduler.jobs))}", param_hint="NAME")
+
+    scheduler.sync()
+    run = scheduler.run_job(job, force=True)
+    if run is None:
+        raise click.ClickException(f"{name} is running on another instance.")
+    click.echo(f"{name}: {run.status} in {run.duration_ms:.0f} ms {run.result or ''}")
+    if run.error:
+        click.echo(run.error, err=True)
+
+
+@tasks_cli.command("work")
+@click.option("--processes", type=int, default=None, help="Worker processes [TASKS_PROCESSES].")
+@click.option("--threads", type=int, default=None, help="Threads per process [TASKS_THREADS].")
+@click.option("--batch", default=1, show_default=True, help="Tasks claimed per round-trip.")
+def tasks_work(processes, threads, batch):
+    """Process queued tasks until SIGTERM/ctrl-C. Safe to start on several instances."""
+    from flask import current_app
+    from . import tasks  # noqa: F401  registers the tasks
+    from .utils.task_queue import task_queue
+
+    app = current_app._get_current_object()
+    processes = processes or app.config.get("TASKS_PROCESSES", 1)
+    threads = threads or app.config.get("TASKS_THREADS", 4)
+    poll = app.config.get("TASKS_POLL_INTERVAL", 1.0)
+    click.echo(f"Task worker {task_queue.instance}: {len(task_queue.tasks)} tasks, "
+               f"{processes} process(es) x {threads} thread(s)")
+    if processes > 1:
+        task_queue.work_processes(app, processes, threads, batch, poll)
+    else:
+        task_queue.work(app, threads, batch, poll)
+
+
+@tasks_cli.command("stats")
+def tasks_stats():
+    """Tasks per status and how long the oldest ready one has waited."""
+    from .utils.task_queue import task_queue
+
+    stats = task_queue.stats()
+    for status, n in sorted(stats["counts"].items()):
+        click.echo(f"{status:<10}{n}")
+    click.echo(f"oldest ready task waiting {stats['oldest_ready_s']}s")
+
+
+@tasks_cli.command("retry-dead")
+def tasks_retry_dead():
+    """Requeue every dead task with a fresh set of attempts."""
+    from datetime import datetime
+    from sqlalchemy import update
+    from .extensions import db
+    from .models.task import Task
+
+    result = db.session.execute(
+        update(Task).where(Task.status == "dead")
+        .values(status="queued", attempts=0, run_at=datetime.utcnow(), finished_at=None)
+    )
+    db.session.commit()
+    click.echo(f"Requeued {result.rowcount} tasks.")
+
+
+def register_commands(app):
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(tasks_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(changes_cli)
+    app.cli.add_command(replica_cli)
+    app.cli.add_command(seed_command)
@@ -5,9 +5,98 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///instance/skillswap.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Optional read replica: GET requests read from it (see utils/replica.py)
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+    SQLALCHEMY_BINDS = {"replica": DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+
+    # --- SQLite connection tuning (applied on every new connection) ---
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-20000"))  # negative = KiB
+    SQLITE_FOREIGN_KEYS = os.getenv("SQLITE_FOREIGN_KEYS", "true").lower() == "true"
+
+    # --- Pool settings for Postgres (ignored for SQLite) ---
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-jwt-fallback")
     CORS_ORIGIN = os.getenv("CORS_ORIGIN", "http://localhost:5173")
 
+    # --- Response compression (utils/compression.py) ---
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # bytes
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))  # gzip 1-9
+    COMPRESS_BROTLI = os.getenv("COMPRESS_BROTLI", "true").lower() == "true"  # if installed
+    COMPRESS_BR_QUALITY = int(os.getenv("COMPRESS_BR_QUALITY", "4"))  # brotli 0-11
+    COMPRESS_CACHE_ENTRIES = int(os.getenv("COMPRESS_CACHE_ENTRIES", "128"))
+
+    # --- Application cache (utils/cache.py) ---
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local")  # local | sqlite | null
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", "60"))  # seconds
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH")  # default: instance/cache.db
+    CACHE_FLIGHT_WAIT = float(os.getenv("CACHE_FLIGHT_WAIT", "5"))  # max wait on another worker's fill
+    # cross-worker invalidation for the local backend (utils/invalidation.py)
+    CACHE_BUS_ENABLED = os.getenv("CACHE_BUS_ENABLED", "true").lower() == "true"
+    CACHE_BUS_INTERVAL = float(os.getenv("CACHE_BUS_INTERVAL", "0"))  # seconds; 0 = every request
+
+    # --- Prometheus /metrics (utils/metrics.py) ---
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # if set, scrapes need "Authorization: Bearer <token>"
+
+    # --- Slow-query log (utils/slow_queries.py) ---
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))  # negative = off
+    SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "200"))  # records kept per worker
+
+    # --- Query debugging for dev/tests (utils/query_budget.py) ---
+    QUERY_DEBUG = os.getenv("QUERY_DEBUG", "false").lower() == "true"
+    QUERY_DEBUG_REPEAT = int(os.getenv("QUERY_DEBUG_REPEAT", "3"))  # same statement N+ times = N+1 suspect
+    QUERY_DEBUG_STRICT = os.getenv("QUERY_DEBUG_STRICT", "false").lower() == "true"  # raise on budget overrun
+
+    # --- Admin rollups (utils/rollups.py) ---
+    ROLLUP_SAFETY_LAG = int(os.getenv("ROLLUP_SAFETY_LAG", "300"))  # seconds rows must age before they're folded in
+
+    # --- Change feed (utils/changes.py, GET /changes) ---
+    CHANGES_WAIT_MAX = float(os.getenv("CHANGES_WAIT_MAX", "25"))  # longest ?timeout=, seconds
+    CHANGES_POLL_INTERVAL = float(os.getenv("CHANGES_POLL_INTERVAL", "1"))  # WSGI mode re-check interval
+
+    # --- Periodic jobs (utils/scheduler.py, app/jobs.py) ---
+    JOBS_TICK = float(os.getenv("JOBS_TICK", "5"))  # seconds between due-job checks
+    JOBS_THREADS = int(os.getenv("JOBS_THREADS", "2"))
+    SESSION_REMINDER_MINUTES = int(os.getenv("SESSION_REMINDER_MINUTES", "60"))
+    NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))  # read ones only
+    CHANGES_RETENTION_DAYS = int(os.getenv("CHANGES_RETENTION_DAYS", "7"))
+    JOB_RUNS_RETENTION_DAYS = int(os.getenv("JOB_RUNS_RETENTION_DAYS", "30"))
+
+    # --- Background tasks (utils/task_queue.py, app/tasks.py) ---
+    TASKS_EAGER = os.getenv("TASKS_EAGER", "true").lower() == "true"  # false once a `flask tasks work` runs
+    TASKS_VISIBILITY_TIMEOUT = int(os.getenv("TASKS_VISIBILITY_TIMEOUT", "300"))  # seconds before redelivery
+    TASKS_POLL_INTERVAL = float(os.getenv("TASKS_POLL_INTERVAL", "1"))
+    TASKS_PROCESSES = int(os.getenv("TASKS_PROCESSES", "1"))
+    TASKS_THREADS = int(os.getenv("TASKS_THREADS", "4"))
+    TASKS_RETENTION_DAYS = int(os.getenv("TASKS_RETENTION_DAYS", "7"))  # done/dead rows
+
+    # --- Idempotency keys (utils/idempotency.py) ---
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))  # seconds a stored response is replayed
+    IDEMPOTENCY_WAIT = float(os.getenv("IDEMPOTENCY_WAIT", "10"))  # how long a duplicate waits on the first
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", "60"))  # then a stuck key is taken over
+
+    # --- ASGI mode (app/asgi.py) ---
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "10"))  # threads serving the Flask routes
+    NOTIFY_POLL_INTERVAL = float(os.getenv("NOTIFY_POLL_INTERVAL", "1"))  # seconds between new-notification checks
+    NOTIFY_HEARTBEAT = float(os.getenv("NOTIFY_HEARTBEAT", "15"))  # SSE keep-alive, seconds
+    NOTIFY_WAIT_MAX = float(os.getenv("NOTIFY_WAIT_MAX", "30"))  # longest long-poll, seconds
+
+    # --- On-demand profiling (utils/profiling.py) ---
+    PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "true").lower() == "true"  # admins: "X-Profile: 1"
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # fraction of all requests, 0..1
+    PROFILE_STORE_SIZE = int(os.getenv("PROFILE_STORE_SIZE", "20"))  # profiles kept per worker
+
     JWT_TOKEN_LOCATION = ["cookies"]
     JWT_ACCESS_COOKIE_NAME = "access_token_cookie"
     JWT_COOKIE_CSRF_PROTECT = False
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, select, update
+
+from .extensions import db, cache
+from .models.availabililty import Availability
+from .models.idempotency_key import IdempotencyKey
+from .models.job import JobRun
+from .models.notification import Notification
+from .models.session_request import SessionRequest
+from .models.task import Task
+from .utils.changes import prune_changes
+from .utils.rollups import update_rollups
+from .utils.scheduler import scheduler
+
+# Maintenance jobs run by `flask jobs run` (see utils/scheduler.py).
+# Schedules are cron expressions in UTC.
+
+PRUNE_BATCH_SIZE = 5000
+
+
+def delete_in_batches(model, *where) -> int:
+    """Delete matching rows PRUNE_BATCH_SIZE at a time so no transaction holds locks for long."""
+    total = 0
+    while True:
+        ids = db.session.execute(select(model.id).where(*where).limit(PRUNE_BATCH_SIZE)).scalars().all()
+        if not ids:
+            return total
+        db.session.execute(delete(model).where(model.id.in_(ids)))
+        db.session.commit()
+        total += len(ids)
+
+
+@scheduler.job("*/15 * * * *", jitter=60)
+def expire_slots():
+    """Deactivate open availability slots that already ended."""
+    now = datetime.utcnow()
+    expired = (
+        Availability.is_active.is_(True),
+        Availability.reserved_request_id.is_(None),
+        Availability.end_time < now,
+    )
+    users = db.session.execute(select(Availability.user_id).where(*expired).distinct()).scalars().all()
+    if not users:
+        return {"expired": 0}
+
+    result = db.session.execute(update(Availability).where(*expired).values(is_active=False))
+    db.session.commit()
+    cache.invalidate(*(f"availability:{u}" for u in users))
+    return {"expired": result.rowcount}
+
+
+@scheduler.job("*/5 * * * *", jitter=20)
+def session_reminders():
+    """Notify both sides of confirmed sessions starting within SESSION_REMINDER_MINUTES."""
+    now = datetime.utcnow()
+    lead = timedelta(minutes=current_app.config.get("SESSION_REMINDER_MINUTES", 60))
+
+    reminded = select(Notification.session_request_id).where(Notification.type == "session_reminder")
+    upcoming = db.session.execute(
+        select(SessionRequest).where(
+            SessionRequest.status == "accepted",
+            SessionRequest.schedule_status == "confirmed",
+            SessionRequest.scheduled_start > now,
+            SessionRequest.scheduled_start <= now + lead,
+            SessionRequest.id.not_in(reminded),
+        )
+    ).scalars().all()
+
+    for req in upcoming:
+        minutes = max(int((req.scheduled_start - now).total_seconds() // 60), 1)
+        for user_id in (req.requester_id, req.provider_id):
+            db.session.add(Notification(
+                user_id=user_id,
+                type="session_reminder",
+                title="Session starting soon",
+                body=f"Your session for '{req.skill.title}' starts in {minutes} minutes.",
+                session_request_id=req.id,
+                skill_id=req.skill_id,
+                is_read=False,
+            ))
+
+    if upcoming:
+        db.session.commit()
+        cache.invalidate("notifications")
+    return {"reminded": len(upcoming)}
+
+
+@scheduler.job("5 * * * *")
+def rollups():
+    """Fold new rows into daily_rollups (same as `flask rollups update`)."""
+    return update_rollups()
+
+
+@scheduler.job("30 3 * * *", jitter=300)
+def prune_notifications():
+    """Drop read notifications older than NOTIFICATION_RETENTION_DAYS."""
+    cutoff = datetime.utcnow() - timedelta(days=current_app.config.get("NOTIFICATION_RETENTION_DAYS", 90))
+    deleted = delete_in_batches(Notification, Notification.is_read.is_(True), Notification.created_at < cutoff)
+    if deleted:
+        cache.invalidate("notifications")
+    return {"deleted": deleted}
+
+
+@scheduler.job("0 4 * * *", jitter=300)
+def prune_change_feed():
+    """Drop user_changes older than CHANGES_RETENTION_DAYS (clients further behind reset)."""
+    return {"deleted": prune_changes(current_app.config.get("CHANGES_RETENTION_DAYS", 7))}
+
+
+@scheduler.job("15 4 * * *", jitter=300)
+def prune_job_runs():
+    cutoff = datetime.utcnow() - timedelta(days=current_app.config.get("JOB_RUNS_RETENTION_DAYS", 30))
+    return {"deleted": delete_in_batches(JobRun, JobRun.started_at < cutoff)}
+
+
+@scheduler.job("45 4 * * *", jitter=300)
+def prune_tasks():
+    """Drop finished (done/dead) tasks older than TASKS_RETENTION_DAYS."""
+    cutoff = datetime.utcnow() - timedelta(days=current_app.config.get("TASKS_RETENTION_DAYS", 7))
+    return {"deleted": delete_in_batches(Task, Task.status.in_(("done", "dead")), Task.finished_at < cutoff)}
+
+
+@scheduler.job("20 * * * *", jitter=120)
+def prune_idempotency_keys():
+    """Drop idempotency keys past their IDEMPOTENCY_TTL."""
+    return {"deleted": delete_in_batches(IdempotencyKey, IdempotencyKey.expires_at < datetime.utcnow())}
@@ -0,0 +1,15 @@
+from datetime import datetime
+from ..extensions import db
+
+class CacheVersion(db.Model):
+    __tablename__ = "cache_versions"
+
+    # cache tag, e.g. "skills", "user:12", "availability:3"
+    tag = db.Column(db.String(100), primary_key=True)
+
+    # set to the next value of the "__head__" counter row on every invalidation
+    # of the tag, so "version > last seen" lists every tag changed since a
+    # worker last looked
+    version = db.Column(db.Integer, nullable=False, index=True)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
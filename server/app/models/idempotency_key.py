@@ -0,0 +1,27 @@
+from datetime import datetime
+from ..extensions import db
+
+class IdempotencyKey(db.Model):
+    __tablename__ = "idempotency_keys"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+
+    # sha256 of method + path + body: the same key with another request is rejected
+    fingerprint = db.Column(db.String(64), nullable=False)
+
+    # pending (first request still running) | done
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    locked_until = db.Column(db.DateTime, nullable=True)
+
+    response_status = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.LargeBinary, nullable=True)
+    response_type = db.Column(db.String(100), nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "key", name="uq_idempotency_user_key"),
+    )
@@ -0,0 +1,41 @@
+from datetime import datetime
+from ..extensions import db
+
+class ScheduledJob(db.Model):
+    __tablename__ = "scheduled_jobs"
+
+    # name the job was registered under (app/jobs.py)
+    name = db.Column(db.String(100), primary_key=True)
+
+    # cron expression it was last synced with; a change recomputes next_run_at
+    schedule = db.Column(db.String(100), nullable=False)
+    next_run_at = db.Column(db.DateTime, nullable=False)
+
+    # lease: whoever flips locked_until into the future runs the job
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+
+    last_run_at = db.Column(db.DateTime, nullable=True)
+    last_status = db.Column(db.String(20), nullable=True)
+
+
+class JobRun(db.Model):
+    __tablename__ = "job_runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+
+    # host:pid of the scheduler that ran it
+    instance = db.Column(db.String(100), nullable=False)
+
+    # "ok" | "error"
+    status = db.Column(db.String(20), nullable=False)
+    error = db.Column(db.Text, nullable=True)
+    result = db.Column(db.Text, nullable=True)
+
+    started_at = db.Column(db.DateTime, nullable=False, index=True)
+    duration_ms = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_job_runs_name_started", "name", "started_at"),
+    )
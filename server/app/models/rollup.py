@@ -0,0 +1,29 @@
+from datetime import datetime
+from ..extensions import db
+
+class DailyRollup(db.Model):
+    __tablename__ = "daily_rollups"
+
+    # e.g. "users.new", "requests.accepted", "reviews.new"
+    metric = db.Column(db.String(50), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    # running sum for metrics that need an average (reviews.new -> sum of ratings)
+    total = db.Column(db.Float, nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class RollupWatermark(db.Model):
+    __tablename__ = "rollup_watermarks"
+
+    # one row per rollup source, e.g. "users", "requests.responded"
+    source = db.Column(db.String(50), primary_key=True)
+
+    # id-based sources track the last id folded in, time-based ones the last timestamp
+    last_id = db.Column(db.Integer, nullable=True)
+    last_ts = db.Column(db.DateTime, nullable=True)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
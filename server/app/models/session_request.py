@@ -28,4 +28,9 @@ class SessionRequest(db.Model):
     schedule_status = db.Column(db.String(20), nullable=False, default="none")
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    responded_at = db.Column(db.DateTime, nullable=True)
+    responded_at = db.Column(db.DateTime, nullable=True, index=True)
+
+    # deleting a request (with its skill) takes its reviews along and frees
+    # the slot it reserved, so the delete holds with SQLITE_FOREIGN_KEYS on
+    reviews = db.relationship("Review", backref="session_request", lazy=True, cascade="all, delete-orphan")
+    reserved_slots = db.relationship("Availability", backref="reserved_request", lazy=True)
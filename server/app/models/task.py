@@ -0,0 +1,34 @@
+from datetime import datetime
+from ..extensions import db
+
+class Task(db.Model):
+    __tablename__ = "tasks"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # registered @task_queue.task name (app/tasks.py)
+    name = db.Column(db.String(100), nullable=False)
+    # JSON {"args": [...], "kwargs": {...}}
+    payload = db.Column(db.Text, nullable=False)
+
+    # queued | running | done | dead
+    status = db.Column(db.String(20), nullable=False, default="queued")
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+
+    # not picked up before this (retry backoff)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # visibility timeout: a running task whose locked_until passed is handed out again
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_tasks_status_run_at", "status", "run_at"),
+    )
@@ -13,6 +13,9 @@ class User(db.Model):
     role = db.Column(db.String(20), nullable=False, default="student")
     bio = db.Column(db.Text, nullable=True)
 
+    # bumped on every write the user can see (see utils/changes.py)
+    change_seq = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     skills = db.relationship("Skill", backref="user", lazy=True, cascade="all, delete-orphan")
 
     # Requests I created
@@ -0,0 +1,22 @@
+from datetime import datetime
+from ..extensions import db
+
+class UserChange(db.Model):
+    __tablename__ = "user_changes"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    # users.change_seq at the time of the write; several rows can share one
+    seq = db.Column(db.Integer, nullable=False)
+
+    # "sessions" | "notifications" | "reviews"
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        db.Index("ix_user_changes_user_seq", "user_id", "seq"),
+    )
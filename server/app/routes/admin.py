@@ -1,19 +1,59 @@
-from datetime import datetime
-from flask import Blueprint, request
+from datetime import date, datetime, timedelta
+from flask import Blueprint, Response, request
 from flask_jwt_extended import jwt_required, get_jwt
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select
 
-from ..extensions import db
+from ..extensions import db, cache
 from ..models.user import User
 from ..models.skill import Skill
 from ..models.session_request import SessionRequest
 from ..models.notification import Notification
+from ..models.job import JobRun, ScheduledJob
+from ..models.task import Task
+from ..utils.search import build_search_filter
+from ..utils.export import stream_export
+from ..utils.fieldsets import parse_fieldset, project
+from ..serializers.skill import SKILL_FIELDS, skill_dict, skill_summary
+from ..serializers.user import USER_FIELDS, user_dict, user_summary
+from ..serializers.session_request import SESSION_FIELDS, session_dict
+from ..utils.rollups import METRICS, timeseries
+from ..utils.slow_queries import slow_queries
+from ..utils.profiling import profiles, summary
+from ..utils.task_queue import task_queue
+from ..utils.query_budget import query_budget
+from ..utils.invalidation import bump_tag_version
 
 admin_bp = Blueprint("admin", __name__)
 
 ALLOWED_ROLES = {"admin", "student"}
 ALLOWED_SESSION_STATUS = {"pending", "accepted", "declined", "cancelled", "completed"}
 ALLOWED_SCHEDULE_STATUS = {"none", "proposed", "confirmed"}
+ALLOWED_BUCKETS = {"day", "week"}
+MAX_TIMESERIES_DAYS = 731
+
+# cached KPI snapshot; write routes invalidate the tags, the TTL bounds drift
+REPORTS_TTL = 60
+REPORTS_TAGS = ["skills", "users", "sessions", "notifications"]
+USER_SUMMARY_TTL = 600
+
+# field:value syntax for the admin search boxes (see utils/search.py)
+USER_SEARCH_FIELDS = {
+    "id": ("id", [User.id]),
+    "name": ("text", [User.name]),
+    "email": ("text", [User.email]),
+    "role": ("exact", [User.role]),
+}
+
+SESSION_SEARCH_FIELDS = {
+    "id": ("id", [SessionRequest.id]),
+    "requester": ("id", [SessionRequest.requester_id]),
+    "provider": ("id", [SessionRequest.provider_id]),
+    "user": ("id", [SessionRequest.requester_id, SessionRequest.provider_id]),
+    "skill": ("id", [SessionRequest.skill_id]),
+    "status": ("exact", [SessionRequest.status]),
+    "schedule": ("exact", [SessionRequest.schedule_status]),
+    "message": ("text", [SessionRequest.message]),
+}
 
 
 # ----------------------------
@@ -45,25 +85,162 @@ def parse_pagination(default_size: int = 20, max_size: int = 50):
     return page, page_size, None
 
 
-def iso(dt):
-    return dt.isoformat() if dt else None
-
-
 def to_meta(page: int, page_size: int, total: int):
     total_pages = (total + page_size - 1) // page_size
     return {"page": page, "pageSize": page_size, "total": total, "totalPages": total_pages}
 
 
+def user_summaries(user_ids) -> dict:
+    """{id: user_summary} for nested user info; misses are fetched in one query."""
+    keys = {uid: f"user:{uid}" for uid in user_ids}
+    found = cache.get_many(keys.values())
+    user_map = {uid: found[k] for uid, k in keys.items() if k in found}
+
+    missing = [uid for uid in keys if uid not in user_map]
+    if missing:
+        users = db.session.execute(
+            select(User.id, User.name, User.email, User.role).where(User.id.in_(missing))
+        ).all()
+        for u in users:
+            user_map[u.id] = user_summary(u)
+            cache.set(keys[u.id], user_map[u.id], ttl=USER_SUMMARY_TTL, tags=[f"user:{u.id}"])
+
+    return user_map
+
+
 # ----------------------------
-# REPORTS
+# list filters (shared by list views + exports)
 # ----------------------------
-@admin_bp.get("/reports")
-@jwt_required()
-def reports():
-    denied = require_admin()
-    if denied:
-        return denied
+def skill_filters():
+    q = (request.args.get("q") or "").strip()
+    skill_type = (request.args.get("type") or "").strip().lower()
+
+    filters = []
+
+    if skill_type in ("offer", "seek"):
+        filters.append(Skill.type == skill_type)
+
+    if q:
+        like = f"%{q}%"
+        filters.append(
+            or_(
+                Skill.title.ilike(like),
+                Skill.description.ilike(like),
+                Skill.tags.ilike(like),
+            )
+        )
+
+    return filters, None
+
+
+def user_filters():
+    q = (request.args.get("q") or "").strip()
+    role = (request.args.get("role") or "").strip().lower()
+
+    # optional: includeInactive=true to show only inactive, etc (easy to expand later)
+    include_inactive = (request.args.get("includeInactive") or "true").lower() == "true"
+
+    filters = []
+
+    if role in ALLOWED_ROLES:
+        filters.append(User.role == role)
+
+    if not include_inactive and hasattr(User, "is_active"):
+        filters.append(User.is_active.is_(True))
+
+    search, err = build_search_filter(
+        q,
+        model=User,
+        id_columns=[User.id],
+        fields=USER_SEARCH_FIELDS,
+        text_columns=[User.name, User.email],
+        fts_table="users_fts",
+    )
+    if err:
+        return None, err
+    if search is not None:
+        filters.append(search)
+
+    return filters, None
+
+
+def session_filters():
+    q = (request.args.get("q") or "").strip()
+    status = (request.args.get("status") or "").strip().lower()
+    schedule_status = (request.args.get("scheduleStatus") or "").strip().lower()
+
+    filters = []
+
+    if status in ALLOWED_SESSION_STATUS:
+        filters.append(SessionRequest.status == status)
+
+    if schedule_status in ALLOWED_SCHEDULE_STATUS:
+        filters.append(SessionRequest.schedule_status == schedule_status)
+
+    search, err = build_search_filter(
+        q,
+        model=SessionRequest,
+        id_columns=[
+            SessionRequest.id,
+            SessionRequest.requester_id,
+            SessionRequest.provider_id,
+            SessionRequest.skill_id,
+        ],
+        fields=SESSION_SEARCH_FIELDS,
+        text_columns=[SessionRequest.message],
+        fts_table="session_requests_fts",
+    )
+    if err:
+        return None, err
+    if search is not None:
+        filters.append(search)
+
+    return filters, None
+
+
+def count_rows(model, filters) -> int:
+    return db.session.execute(select(func.count()).select_from(model).where(*filters)).scalar() or 0
+
+
+def page_rows(columns, filters, order_by, page: int, page_size: int):
+    return db.session.execute(
+        select(*columns)
+        .where(*filters)
+        .order_by(order_by)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    ).all()
+
+
+# ----------------------------
+# column projections (serializers live in app/serializers)
+# ----------------------------
+def by_key(*columns):
+    return {c.key: c for c in columns}
+
+
+SKILL_COLUMNS = by_key(
+    Skill.id, Skill.user_id, Skill.type, Skill.title, Skill.description,
+    Skill.tags, Skill.visibility, Skill.created_at,
+)
+USER_COLUMNS = by_key(User.id, User.name, User.email, User.role, User.is_active, User.created_at)
+SESSION_COLUMNS = by_key(
+    SessionRequest.id, SessionRequest.requester_id, SessionRequest.provider_id,
+    SessionRequest.skill_id, SessionRequest.message, SessionRequest.status,
+    SessionRequest.schedule_status, SessionRequest.scheduled_start, SessionRequest.scheduled_end,
+    SessionRequest.timezone, SessionRequest.created_at, SessionRequest.responded_at,
+)
+
+# ?fields= allowlists: the column fields plus nested lookups
+ADMIN_SKILL_FIELDS = SKILL_FIELDS + ["user"]
+ADMIN_SESSION_FIELDS = SESSION_FIELDS + ["requester", "provider", "skill"]
 
+# ----------------------------
+# REPORTS
+# ----------------------------
+# several admin tabs polling at once compute the snapshot once
+@cache.cached("reports", ttl=REPORTS_TTL, tags=REPORTS_TAGS, coalesce=True)
+def report_snapshot():
     total_users = db.session.query(func.count(User.id)).scalar() or 0
     total_skills = db.session.query(func.count(Skill.id)).scalar() or 0
 
@@ -135,6 +312,207 @@ def reports():
         },
         "sessionsByStatus": sessions_by_status,
         "topTags": [{"tag": t, "count": c} for t, c in top_tags],
+    }
+
+
+@admin_bp.get("/reports")
+@jwt_required()
+def reports():
+    denied = require_admin()
+    if denied:
+        return denied
+
+    return report_snapshot(), 200
+
+
+@admin_bp.get("/cache")
+@jwt_required()
+def cache_stats():
+    """Hit/miss counters for this worker's view of the cache."""
+    denied = require_admin()
+    if denied:
+        return denied
+
+    return cache.stats(), 200
+
+
+@admin_bp.get("/slow-queries")
+@jwt_required()
+def list_slow_queries():
+    """Newest first; each worker keeps its own buffer (see utils/slow_queries.py)."""
+    denied = require_admin()
+    if denied:
+        return denied
+
+    try:
+        limit = clamp(int(request.args.get("limit", 50)), 1, 500)
+    except ValueError:
+        return {"error": "limit must be a number."}, 400
+
+    return {"data": slow_queries.recent(limit)}, 200
+
+
+@admin_bp.delete("/slow-queries")
+@jwt_required()
+def clear_slow_queries():
+    denied = require_admin()
+    if denied:
+        return denied
+
+    slow_queries.clear()
+    return {"message": "Slow-query log cleared."}, 200
+
+
+@admin_bp.get("/profiles")
+@jwt_required()
+def list_profiles():
+    """Newest first; send "X-Profile: 1" on any request to add one (see utils/profiling.py)."""
+    denied = require_admin()
+    if denied:
+        return denied
+
+    return {"data": [summary(p) for p in profiles.recent()]}, 200
+
+
+@admin_bp.get("/profiles/<profile_id>")
+@jwt_required()
+def get_profile(profile_id):
+    denied = require_admin()
+    if denied:
+        return denied
+
+    profile = profiles.get(profile_id)
+    if not profile:
+        return {"error": "Profile not found (profiles are kept per worker)."}, 404
+
+    return {**summary(profile), "top": profile["top"]}, 200
+
+
+@admin_bp.get("/profiles/<profile_id>/download")
+@jwt_required()
+def download_profile(profile_id):
+    """pstats dump: `python -m pstats file.prof` or `snakeviz file.prof`."""
+    denied = require_admin()
+    if denied:
+        return denied
+
+    profile = profiles.get(profile_id)
+    if not profile:
+        return {"error": "Profile not found (profiles are kept per worker)."}, 404
+
+    return Response(
+        profile["stats"],
+        mimetype="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'},
+    )
+
+
+@admin_bp.get("/jobs")
+@jwt_required()
+def list_jobs():
+    """Scheduled jobs and their recent runs (?name= to filter, ?limit=)."""
+    denied = require_admin()
+    if denied:
+        return denied
+
+    try:
+        limit = clamp(int(request.args.get("limit", 50)), 1, 500)
+    except ValueError:
+        return {"error": "limit must be a number."}, 400
+
+    runs = select(JobRun).order_by(JobRun.started_at.desc()).limit(limit)
+    name = request.args.get("name")
+    if name:
+        runs = runs.where(JobRun.name == name)
+
+    jobs = db.session.execute(select(ScheduledJob).order_by(ScheduledJob.name)).scalars().all()
+    return {
+        "jobs": [
+            {
+                "name": j.name,
+                "schedule": j.schedule,
+                "next_run_at": j.next_run_at,
+                "running_on": j.locked_by,
+                "last_run_at": j.last_run_at,
+                "last_status": j.last_status,
+            }
+            for j in jobs
+        ],
+        "runs": [
+            {
+                "id": r.id,
+                "name": r.name,
+                "instance": r.instance,
+                "status": r.status,
+                "started_at": r.started_at,
+                "duration_ms": r.duration_ms,
+                "result": r.result,
+                "error": r.error,
+            }
+            for r in db.session.execute(runs).scalars()
+        ],
+    }, 200
+
+
+@admin_bp.get("/tasks")
+@jwt_required()
+def list_tasks():
+    """Queue depth per status plus the most recent dead tasks."""
+    denied = require_admin()
+    if denied:
+        return denied
+
+    dead = db.session.execute(
+        select(Task).where(Task.status == "dead").order_by(Task.finished_at.desc()).limit(20)
+    ).scalars()
+    return {
+        **task_queue.stats(),
+        "dead": [
+            {
+                "id": t.id,
+                "name": t.name,
+                "attempts": t.attempts,
+                "finished_at": t.finished_at,
+                "last_error": t.last_error,
+            }
+            for t in dead
+        ],
+    }, 200
+
+
+@admin_bp.get("/reports/timeseries")
+@jwt_required()
+def reports_timeseries():
+    """Reads daily_rollups only; `flask rollups update` keeps them current."""
+    denied = require_admin()
+    if denied:
+        return denied
+
+    metric = (request.args.get("metric") or "").strip()
+    bucket = (request.args.get("bucket") or "day").strip().lower()
+
+    if metric not in METRICS:
+        return {"error": f"metric must be one of: {', '.join(sorted(METRICS))}."}, 400
+    if bucket not in ALLOWED_BUCKETS:
+        return {"error": "bucket must be 'day' or 'week'."}, 400
+
+    try:
+        end = date.fromisoformat(request.args["to"]) if request.args.get("to") else datetime.utcnow().date()
+        start = date.fromisoformat(request.args["from"]) if request.args.get("from") else end - timedelta(days=29)
+    except ValueError:
+        return {"error": "from/to must be dates like '2026-01-31'."}, 400
+
+    if end < start:
+        return {"error": "to must be on or after from."}, 400
+    if (end - start).days >= MAX_TIMESERIES_DAYS:
+        return {"error": f"Range is limited to {MAX_TIMESERIES_DAYS} days."}, 400
+
+    return {
+        "metric": metric,
+        "bucket": bucket,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "points": timeseries(metric, start, end, bucket),
     }, 200
 
 
@@ -142,61 +520,41 @@ def reports():
 # ADMIN: SKILLS MODERATION
 # ----------------------------
 @admin_bp.get("/skills")
+@query_budget(3)
 @jwt_required()
 def admin_list_skills():
     denied = require_admin()
     if denied:
         return denied
 
-    q = (request.args.get("q") or "").strip()
-    skill_type = (request.args.get("type") or "").strip().lower()
-
     page, page_size, err = parse_pagination(default_size=20)
     if err:
         return err
 
-    query = Skill.query
-
-    if skill_type in ("offer", "seek"):
-        query = query.filter(Skill.type == skill_type)
+    fields, err = parse_fieldset(ADMIN_SKILL_FIELDS)
+    if err:
+        return err
 
-    if q:
-        like = f"%{q}%"
-        query = query.filter(
-            or_(
-                Skill.title.ilike(like),
-                Skill.description.ilike(like),
-                Skill.tags.ilike(like),
-            )
-        )
+    with_user = "user" in fields
+    columns = project(SKILL_COLUMNS, fields, required=["user_id"] if with_user else [])
+    skill_fields = [f for f in fields if f in SKILL_COLUMNS]
 
-    query = query.order_by(Skill.created_at.desc())
+    filters, _ = skill_filters()
 
-    total = query.count()
-    rows = query.offset((page - 1) * page_size).limit(page_size).all()
+    total = count_rows(Skill, filters)
+    rows = page_rows(columns, filters, Skill.created_at.desc(), page, page_size)
 
     # include user info for moderation clarity
-    user_ids = list({s.user_id for s in rows})
-    users = User.query.filter(User.id.in_(user_ids)).all() if user_ids else []
-    user_map = {u.id: {"name": u.name, "email": u.email} for u in users}
+    user_map = user_summaries({s.user_id for s in rows}) if with_user else {}
 
-    return {
-        "data": [
-            {
-                "id": s.id,
-                "user_id": s.user_id,
-                "user": user_map.get(s.user_id),
-                "type": s.type,
-                "title": s.title,
-                "description": s.description,
-                "tags": s.tags,
-                "visibility": s.visibility,
-                "created_at": iso(s.created_at),
-            }
-            for s in rows
-        ],
-        "meta": to_meta(page, page_size, total),
-    }, 200
+    data = []
+    for s in rows:
+        item = skill_dict(s, skill_fields)
+        if with_user:
+            item["user"] = user_map.get(s.user_id)
+        data.append(item)
+
+    return {"data": data, "meta": to_meta(page, page_size, total)}, 200
 
 
 @admin_bp.delete("/skills/<int:skill_id>")
@@ -210,8 +568,11 @@ def admin_delete_skill(skill_id: int):
     if not s:
         return {"error": "Skill not found."}, 404
 
-    db.session.delete(s)
+    owner_id = s.user_id
+    db.session.delete(s)  # its requests, their reviews and slot reservations go too
+    bump_tag_version("skills")
     db.session.commit()
+    cache.invalidate("skills", "sessions", f"availability:{owner_id}")
     return {"message": "Skill removed by admin."}, 200
 
 
@@ -219,57 +580,26 @@ def admin_delete_skill(skill_id: int):
 # ADMIN: USERS
 # ----------------------------
 @admin_bp.get("/users")
+@query_budget(2)
 @jwt_required()
 def admin_list_users():
     denied = require_admin()
     if denied:
         return denied
 
-    q = (request.args.get("q") or "").strip()
-    role = (request.args.get("role") or "").strip().lower()
-
-    # optional: includeInactive=true to show only inactive, etc (easy to expand later)
-    include_inactive = (request.args.get("includeInactive") or "true").lower() == "true"
-
     page, page_size, err = parse_pagination(default_size=20)
     if err:
         return err
 
-    query = User.query
-
-    if role in ALLOWED_ROLES:
-        query = query.filter(User.role == role)
-
-    if not include_inactive and hasattr(User, "is_active"):
-        query = query.filter(User.is_active.is_(True))
-
-    if q:
-        like = f"%{q}%"
-        query = query.filter(
-            or_(
-                User.name.ilike(like),
-                User.email.ilike(like),
-                func.cast(User.id, db.String).ilike(like),
-            )
-        )
-
-    query = query.order_by(User.created_at.desc())
+    filters, err = user_filters()
+    if err:
+        return err
 
-    total = query.count()
-    rows = query.offset((page - 1) * page_size).limit(page_size).all()
+    total = count_rows(User, filters)
+    rows = page_rows(USER_COLUMNS.values(), filters, User.created_at.desc(), page, page_size)
 
     return {
-        "data": [
-            {
-                "id": u.id,
-                "name": u.name,
-                "email": u.email,
-                "role": u.role,
-                "is_active": bool(getattr(u, "is_active", True)),
-                "created_at": iso(u.created_at),
-            }
-            for u in rows
-        ],
+        "data": [user_dict(u) for u in rows],
         "meta": to_meta(page, page_size, total),
     }, 200
 
@@ -293,6 +623,7 @@ def admin_set_user_role(user_id: int):
 
     u.role = new_role
     db.session.commit()
+    cache.invalidate(f"user:{u.id}")
     return {"message": "Role updated.", "id": u.id, "role": u.role}, 200
 
 
@@ -319,6 +650,7 @@ def admin_set_user_active(user_id: int):
 
     u.is_active = is_active
     db.session.commit()
+    cache.invalidate(f"user:{u.id}")
     return {"message": "User updated.", "id": u.id, "is_active": bool(u.is_active)}, 200
 
 
@@ -326,82 +658,57 @@ def admin_set_user_active(user_id: int):
 # ADMIN: SESSIONS
 # ----------------------------
 @admin_bp.get("/sessions")
+@query_budget(4)
 @jwt_required()
 def admin_list_sessions():
     denied = require_admin()
     if denied:
         return denied
 
-    q = (request.args.get("q") or "").strip()
-    status = (request.args.get("status") or "").strip().lower()
-    schedule_status = (request.args.get("scheduleStatus") or "").strip().lower()
-
     page, page_size, err = parse_pagination(default_size=20)
     if err:
         return err
 
-    query = SessionRequest.query
+    fields, err = parse_fieldset(ADMIN_SESSION_FIELDS)
+    if err:
+        return err
 
-    if status in ALLOWED_SESSION_STATUS:
-        query = query.filter(SessionRequest.status == status)
+    nested_users = [f for f in ("requester", "provider") if f in fields]
+    with_skill = "skill" in fields
+    required = [f"{f}_id" for f in nested_users] + (["skill_id"] if with_skill else [])
+    columns = project(SESSION_COLUMNS, fields, required=required)
+    session_fields = [f for f in fields if f in SESSION_COLUMNS]
 
-    if schedule_status in ALLOWED_SCHEDULE_STATUS:
-        query = query.filter(SessionRequest.schedule_status == schedule_status)
+    filters, err = session_filters()
+    if err:
+        return err
 
-    if q:
-        like = f"%{q}%"
-        query = query.filter(
-            or_(
-                SessionRequest.message.ilike(like),
-                func.cast(SessionRequest.id, db.String).ilike(like),
-                func.cast(SessionRequest.requester_id, db.String).ilike(like),
-                func.cast(SessionRequest.provider_id, db.String).ilike(like),
-                func.cast(SessionRequest.skill_id, db.String).ilike(like),
-            )
-        )
+    total = count_rows(SessionRequest, filters)
+    rows = page_rows(columns, filters, SessionRequest.created_at.desc(), page, page_size)
+
+    # Attach lightweight user + skill info (only when requested)
+    user_ids = {getattr(r, f"{f}_id") for r in rows for f in nested_users}
+    skill_ids = {r.skill_id for r in rows} if with_skill else set()
 
-    query = query.order_by(SessionRequest.created_at.desc())
+    user_map = user_summaries(user_ids)
 
-    total = query.count()
-    rows = query.offset((page - 1) * page_size).limit(page_size).all()
+    skill_map = {}
+    if skill_ids:
+        skills = db.session.execute(
+            select(Skill.id, Skill.title, Skill.type, Skill.visibility).where(Skill.id.in_(list(skill_ids)))
+        ).all()
+        skill_map = {s.id: skill_summary(s) for s in skills}
 
-    # Attach lightweight user + skill info
-    user_ids = set()
-    skill_ids = set()
+    data = []
     for r in rows:
-        user_ids.add(r.requester_id)
-        user_ids.add(r.provider_id)
-        skill_ids.add(r.skill_id)
+        item = session_dict(r, session_fields)
+        for f in nested_users:
+            item[f] = user_map.get(getattr(r, f"{f}_id"))
+        if with_skill:
+            item["skill"] = skill_map.get(r.skill_id)
+        data.append(item)
 
-    users = User.query.filter(User.id.in_(list(user_ids))).all() if user_ids else []
-    user_map = {u.id: {"id": u.id, "name": u.name, "email": u.email, "role": u.role} for u in users}
-
-    skills = Skill.query.filter(Skill.id.in_(list(skill_ids))).all() if skill_ids else []
-    skill_map = {s.id: {"id": s.id, "title": s.title, "type": s.type, "visibility": s.visibility} for s in skills}
-
-    return {
-        "data": [
-            {
-                "id": r.id,
-                "requester_id": r.requester_id,
-                "provider_id": r.provider_id,
-                "skill_id": r.skill_id,
-                "message": r.message,
-                "status": r.status,
-                "schedule_status": r.schedule_status,
-                "scheduled_start": iso(r.scheduled_start),
-                "scheduled_end": iso(r.scheduled_end),
-                "timezone": r.timezone,
-                "created_at": iso(r.created_at),
-                "responded_at": iso(r.responded_at),
-                "requester": user_map.get(r.requester_id),
-                "provider": user_map.get(r.provider_id),
-                "skill": skill_map.get(r.skill_id),
-            }
-            for r in rows
-        ],
-        "meta": to_meta(page, page_size, total),
-    }, 200
+    return {"data": data, "meta": to_meta(page, page_size, total)}, 200
 
 
 @admin_bp.patch("/sessions/<int:request_id>/status")
@@ -424,5 +731,42 @@ def admin_set_session_status(request_id: int):
     r.status = new_status
     r.responded_at = datetime.utcnow()
     db.session.commit()
+    cache.invalidate("sessions")
 
     return {"message": "Status updated.", "id": r.id, "status": r.status}, 200
+
+
+# ----------------------------
+# ADMIN: EXPORTS
+# ----------------------------
+@admin_bp.get("/<resource>/export")
+@jwt_required()
+def admin_export(resource: str):
+    """Full CSV/NDJSON dump of a list view, honoring the same filters."""
+    denied = require_admin()
+    if denied:
+        return denied
+
+    fmt = (request.args.get("format") or "csv").strip().lower()
+
+    if resource == "skills":
+        filters, err = skill_filters()
+        columns, serialize, fields = SKILL_COLUMNS, skill_dict, SKILL_FIELDS
+        order = Skill.id
+    elif resource == "users":
+        filters, err = user_filters()
+        columns, serialize, fields = USER_COLUMNS, user_dict, USER_FIELDS
+        order = User.id
+    elif resource == "sessions":
+        filters, err = session_filters()
+        columns, serialize, fields = SESSION_COLUMNS, session_dict, SESSION_FIELDS
+        order = SessionRequest.id
+    else:
+        return {"error": "Unknown export resource."}, 404
+
+    if err:
+        return err
+
+    # PK order streams straight off the primary key index
+    stmt = select(*columns.values()).where(*filters).order_by(order)
+    return stream_export(stmt, serialize, fields, fmt, f"{resource}-export")
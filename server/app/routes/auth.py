@@ -9,8 +9,10 @@ from flask_jwt_extended import (
 )
 import bcrypt
 
-from ..extensions import db
+from ..extensions import db, cache
 from ..models.user import User
+from ..serializers.user import me_dict
+from ..utils.replica import primary_reads
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -33,6 +35,7 @@ def register():
     user = User(name=name, email=email, password_hash=hashed, role="student")
     db.session.add(user)
     db.session.commit()
+    cache.invalidate("users")
 
     return {"message": "User registered successfully."}, 201
 
@@ -73,6 +76,7 @@ def logout():
 
 @auth_bp.get("/me")
 @jwt_required()
+@primary_reads  # role/is_active must never lag behind an admin change
 def me():
     user_id = int(get_jwt_identity())
     user = User.query.get(user_id)
@@ -84,11 +88,4 @@ def me():
     if hasattr(user, "is_active") and not user.is_active:
         return {"error": "Account is deactivated. Contact an admin."}, 403
 
-    return {
-        "id": user.id,
-        "name": user.name,
-        "email": user.email,
-        "role": user.role,
-        "bio": user.bio,
-        "is_active": bool(getattr(user, "is_active", True)),
-    }, 200
+    return me_dict(user), 200
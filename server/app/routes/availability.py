@@ -3,8 +3,9 @@ from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import and_
 
-from ..extensions import db
+from ..extensions import db, cache
 from ..models.availabililty import Availability  # (keep your filename as-is)
+from ..serializers.availability import my_slot_dict, slot_dict
 
 availability_bp = Blueprint("availability", __name__)
 
@@ -47,16 +48,7 @@ def list_my_availability():
         .all()
     )
 
-    return [
-        {
-            "id": a.id,
-            "start_time": a.start_time.isoformat(),
-            "end_time": a.end_time.isoformat(),
-            "timezone": a.timezone,
-            "is_active": a.is_active,
-        }
-        for a in slots
-    ], 200
+    return [my_slot_dict(a) for a in slots], 200
 
 
 @availability_bp.post("")
@@ -102,12 +94,7 @@ def create_availability():
     if conflict:
         return {
             "error": "This time overlaps an existing availability slot.",
-            "conflict": {
-                "id": conflict.id,
-                "start_time": conflict.start_time.isoformat(),
-                "end_time": conflict.end_time.isoformat(),
-                "timezone": conflict.timezone,
-            },
+            "conflict": slot_dict(conflict),
         }, 409
 
     slot = Availability(
@@ -120,6 +107,7 @@ def create_availability():
 
     db.session.add(slot)
     db.session.commit()
+    cache.invalidate(f"availability:{user_id}")
     return {"id": slot.id, "message": "Availability slot created."}, 201
 
 
@@ -135,5 +123,6 @@ def delete_availability(slot_id):
     # ✅ Recommended: soft delete to avoid weird scheduling edge cases
     slot.is_active = False
     db.session.commit()
+    cache.invalidate(f"availability:{user_id}")
 
     return {"message": "Availability slot deleted."}, 200
@@ -0,0 +1,47 @@
+import time
+
+from flask import Blueprint, current_app, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+from ..extensions import db
+from ..utils.changes import changes_since
+from ..utils.replica import primary_reads
+
+changes_bp = Blueprint("changes", __name__)
+
+
+@changes_bp.get("")
+@jwt_required()
+@primary_reads
+def list_changes():
+    """
+    ?since=<seq>&timeout=<s>: ids of sessions/notifications/reviews changed
+    after `since` (or entities to refetch whole), waiting up to `timeout`
+    seconds for the first one. Without
+    `since` returns the current seq. Holds a worker thread while it waits; in
+    ASGI mode the same endpoint is a coroutine (app/asgi.py).
+    """
+    user_id = int(get_jwt_identity())
+
+    try:
+        since = request.args.get("since", type=int, default=None)
+        timeout = float(request.args.get("timeout", 0))
+    except ValueError:
+        return {"error": "timeout must be a number."}, 400
+    if request.args.get("since") and since is None:
+        return {"error": "since must be an integer."}, 400
+
+    timeout = min(max(timeout, 0), current_app.config.get("CHANGES_WAIT_MAX", 25))
+    interval = current_app.config.get("CHANGES_POLL_INTERVAL", 1.0)
+    deadline = time.monotonic() + timeout
+
+    while True:
+        result = changes_since(user_id, since)
+        remaining = deadline - time.monotonic()
+        if result is not None or remaining <= 0:
+            break
+        # end the read transaction so the next check sees new commits
+        db.session.rollback()
+        time.sleep(min(interval, remaining))
+
+    return result or {"seq": since, "changes": {}, "refetch": [], "reset": False, "more": False}, 200
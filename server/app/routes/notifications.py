@@ -1,39 +1,61 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import case, func, select, update
 
-from ..extensions import db
+from ..extensions import db, cache
 from ..models.notification import Notification
+from ..serializers.notification import notification_dict
+from ..utils.changes import ALL, record_changes
+from ..utils.etag import conditional
+from ..utils.query_budget import query_budget
 
 notifications_bp = Blueprint("notifications", __name__)
 
+# polled constantly by the bell; project columns instead of hydrating entities
+NOTIFICATION_LIST = select(
+    Notification.id,
+    Notification.type,
+    Notification.title,
+    Notification.body,
+    Notification.session_request_id,
+    Notification.skill_id,
+    Notification.is_read,
+    Notification.created_at,
+).order_by(Notification.created_at.desc())
+
+def notifications_version():
+    # changes on every new notification and every read toggle
+    user_id = int(get_jwt_identity())
+    return db.session.execute(
+        select(
+            func.count(Notification.id),
+            func.max(Notification.id),
+            func.sum(case((Notification.is_read.is_(True), 1), else_=0)),
+        ).where(Notification.user_id == user_id)
+    ).one()
+
+
 @notifications_bp.get("")
+@query_budget(2)
 @jwt_required()
+@conditional(notifications_version)
 def list_notifications():
     user_id = int(get_jwt_identity())
 
     limit = int(request.args.get("limit", 20))
     limit = max(1, min(limit, 100))
 
-    items = (Notification.query
-             .filter_by(user_id=user_id)
-             .order_by(Notification.created_at.desc())
-             .limit(limit)
-             .all())
+    items = db.session.execute(
+        NOTIFICATION_LIST.where(Notification.user_id == user_id).limit(limit)
+    ).all()
 
-    return [{
-        "id": n.id,
-        "type": n.type,
-        "title": n.title,
-        "body": n.body,
-        "session_request_id": n.session_request_id,
-        "skill_id": n.skill_id,
-        "is_read": n.is_read,
-        "created_at": n.created_at.isoformat(),
-    } for n in items], 200
+    return [notification_dict(n) for n in items], 200
 
 
 @notifications_bp.get("/unread-count")
+@query_budget(2)
 @jwt_required()
+@conditional(notifications_version)
 def unread_count():
     user_id = int(get_jwt_identity())
     count = Notification.query.filter_by(user_id=user_id, is_read=False).count()
@@ -51,6 +73,7 @@ def mark_read(notification_id):
 
     n.is_read = True
     db.session.commit()
+    cache.invalidate("notifications")
     return {"message": "Marked read."}, 200
 
 
@@ -58,6 +81,14 @@ def mark_read(notification_id):
 @jwt_required()
 def mark_all_read():
     user_id = int(get_jwt_identity())
-    Notification.query.filter_by(user_id=user_id, is_read=False).update({"is_read": True})
+    result = db.session.execute(
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+    )
+    if result.rowcount:
+        # bulk update skips the ORM flush hook: record one "refetch all" feed entry by hand
+        record_changes({user_id: {("notifications", ALL)}})
     db.session.commit()
+    cache.invalidate("notifications")
     return {"message": "All marked read."}, 200
@@ -4,6 +4,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from ..extensions import db
 from ..models.review import Review
 from ..models.session_request import SessionRequest
+from ..serializers.review import review_dict
+from ..utils.idempotency import commit_or_defer, idempotent
 
 reviews_bp = Blueprint("reviews", __name__, url_prefix="/reviews")
 
@@ -32,22 +34,12 @@ def list_reviews_for_session(session_id):
         .all()
     )
 
-    return [
-        {
-            "id": r.id,
-            "session_request_id": r.session_request_id,
-            "from_user_id": r.from_user_id,
-            "to_user_id": r.to_user_id,
-            "rating": r.rating,
-            "comment": r.comment,
-            "created_at": r.created_at.isoformat(),
-        }
-        for r in reviews
-    ], 200
+    return [review_dict(r) for r in reviews], 200
 
 
 @reviews_bp.post("")
 @jwt_required()
+@idempotent
 def create_review():
     user_id = int(get_jwt_identity())
     data = request.get_json() or {}
@@ -94,7 +86,7 @@ def create_review():
     if existing:
         existing.rating = rating
         existing.comment = comment
-        db.session.commit()
+        commit_or_defer()
         return {"message": "Review updated."}, 200
 
     rev = Review(
@@ -105,5 +97,5 @@ def create_review():
         comment=comment,
     )
     db.session.add(rev)
-    db.session.commit()
+    commit_or_defer()
     return {"message": "Review created."}, 201
@@ -1,32 +1,67 @@
 from datetime import datetime
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select
 
-from ..extensions import db
+from ..extensions import db, cache
 from ..models.skill import Skill
 from ..models.session_request import SessionRequest
-from ..models.notification import Notification
 from ..models.availabililty import Availability
+from ..serializers.session_request import my_session_dict
+from ..serializers.availability import open_slot_dict
+from ..tasks import create_notification
+from ..utils.idempotency import commit_or_defer, idempotent
+from ..utils.etag import conditional
+from ..utils.query_budget import query_budget
 
 sessions_bp = Blueprint("sessions", __name__)
 
+# Column projections for the list/read paths (plain row tuples, no entity hydration)
+SESSION_LIST = (
+    select(
+        SessionRequest.id,
+        SessionRequest.skill_id,
+        Skill.title.label("skill_title"),
+        SessionRequest.requester_id,
+        SessionRequest.provider_id,
+        SessionRequest.message,
+        SessionRequest.status,
+        SessionRequest.schedule_status,
+        SessionRequest.scheduled_start,
+        SessionRequest.scheduled_end,
+        SessionRequest.timezone,
+        SessionRequest.created_at,
+        SessionRequest.responded_at,
+    )
+    .outerjoin(Skill, Skill.id == SessionRequest.skill_id)
+    .order_by(SessionRequest.created_at.desc())
+)
+
+SESSION_PARTIES = select(
+    SessionRequest.id,
+    SessionRequest.requester_id,
+    SessionRequest.provider_id,
+)
+
+# provider's open slots, cached per provider ("availability:<id>" tag)
+OPEN_SLOTS_TTL = 300
+
+OPEN_SLOTS = select(
+    Availability.id,
+    Availability.start_time,
+    Availability.end_time,
+    Availability.timezone,
+    Availability.reserved_request_id,
+).order_by(Availability.start_time.asc())
+
 
 def is_admin():
     return (get_jwt() or {}).get("role") == "admin"
 
 
 def notify(user_id, ntype, title, body="", session_request_id=None, skill_id=None):
-    n = Notification(
-        user_id=user_id,
-        type=ntype,
-        title=title,
-        body=body,
-        session_request_id=session_request_id,
-        skill_id=skill_id,
-        is_read=False,
-    )
-    db.session.add(n)
+    # queued with this request's transaction; inline when TASKS_EAGER
+    create_notification.delay(user_id, ntype, title, body, session_request_id, skill_id)
 
 
 def parse_iso(dt_str: str):
@@ -186,10 +221,13 @@ def schedule_request(request_id):
         return {"error": "action must be propose, confirm, or clear."}, 400
 
     db.session.commit()
+    # slot reservations changed what the requester sees as open
+    cache.invalidate("sessions", "notifications", f"availability:{req.provider_id}")
     return {"message": f"Schedule {req.schedule_status}."}, 200
 
 @sessions_bp.post("/<int:request_id>/respond")
 @jwt_required()
+@idempotent
 def respond_to_request(request_id):
     user_id = int(get_jwt_identity())
     data = request.get_json() or {}
@@ -257,15 +295,32 @@ def respond_to_request(request_id):
     else:
         return {"error": "action must be one of: accept, decline, cancel, complete."}, 400
 
-    db.session.commit()
+    commit_or_defer("sessions", "notifications")
     return {"message": f"Request {req.status}."}, 200
 
+def provider_slots(provider_id: int):
+    """Every active slot of a provider (reserved or not), shared across requests."""
+    tag = f"availability:{provider_id}"
+
+    def load():
+        slots = db.session.execute(
+            OPEN_SLOTS.where(
+                Availability.user_id == provider_id,
+                Availability.is_active == True,  # noqa: E712
+            )
+        ).all()
+        return [open_slot_dict(s) for s in slots]
+
+    return cache.get_or_set(tag, load, ttl=OPEN_SLOTS_TTL, tags=[tag])
+
+
 @sessions_bp.get("/<int:request_id>/availability")
+@query_budget(2)
 @jwt_required()
 def get_provider_availability(request_id):
     user_id = int(get_jwt_identity())
 
-    req = SessionRequest.query.get(request_id)
+    req = db.session.execute(SESSION_PARTIES.where(SessionRequest.id == request_id)).first()
     if not req:
         return {"error": "Request not found."}, 404
 
@@ -277,33 +332,13 @@ def get_provider_availability(request_id):
     # - active
     # - owned by provider
     # - NOT reserved, OR reserved for THIS request
-    slots = (
-        Availability.query
-        .filter(
-            Availability.user_id == req.provider_id,
-            Availability.is_active == True,  # noqa: E712
-            or_(
-                Availability.reserved_request_id.is_(None),
-                Availability.reserved_request_id == req.id,
-            )
-        )
-        .order_by(Availability.start_time.asc())
-        .all()
-    )
+    slots = provider_slots(req.provider_id)
 
-    return [
-        {
-            "id": s.id,
-            "start_time": s.start_time.isoformat(),
-            "end_time": s.end_time.isoformat(),
-            "timezone": s.timezone,
-            "reserved_request_id": s.reserved_request_id,  # optional but helpful for debugging
-        }
-        for s in slots
-    ], 200
+    return [s for s in slots if s["reserved_request_id"] in (None, req.id)], 200
 
 @sessions_bp.post("")
 @jwt_required()
+@idempotent
 def create_session_request():
     user_id = int(get_jwt_identity())
     data = request.get_json() or {}
@@ -361,6 +396,7 @@ def create_session_request():
     )
 
     db.session.add(req)
+    db.session.flush()  # req.id for the notification below
 
     notify(
         user_id=req.provider_id,
@@ -371,59 +407,53 @@ def create_session_request():
         skill_id=req.skill_id,
     )
 
-    db.session.commit()
+    commit_or_defer("sessions", "notifications")
 
     return {
         "id": req.id,
         "status": req.status,
         "schedule_status": req.schedule_status,
-        "created_at": req.created_at.isoformat(),
+        "created_at": req.created_at,
     }, 201
 
+def my_sessions_version():
+    # every status/schedule change stamps responded_at; deletes change the count
+    user_id = int(get_jwt_identity())
+    return db.session.execute(
+        select(
+            func.count(SessionRequest.id),
+            func.max(SessionRequest.id),
+            func.max(SessionRequest.responded_at),
+        ).where(
+            or_(
+                SessionRequest.requester_id == user_id,
+                SessionRequest.provider_id == user_id,
+            )
+        )
+    ).one()
+
+
 @sessions_bp.get("/mine")
+@query_budget(2)
 @jwt_required()
+@conditional(my_sessions_version)
 def my_sessions():
     user_id = int(get_jwt_identity())
 
-    reqs = (
-        SessionRequest.query
-        .filter(
+    # one query: skill title comes along via the join
+    reqs = db.session.execute(
+        SESSION_LIST.where(
             or_(
                 SessionRequest.requester_id == user_id,
                 SessionRequest.provider_id == user_id,
             )
         )
-        .order_by(SessionRequest.created_at.desc())
-        .all()
-    )
-
-    # optional: load skills for titles
-    skill_ids = list({r.skill_id for r in reqs})
-    skills = Skill.query.filter(Skill.id.in_(skill_ids)).all() if skill_ids else []
-    skill_map = {s.id: s for s in skills}
-
-    def serialize(r: SessionRequest):
-        s = skill_map.get(r.skill_id)
-        return {
-            "id": r.id,
-            "skill_id": r.skill_id,
-            "skill_title": s.title if s else None,
-            "requester_id": r.requester_id,
-            "provider_id": r.provider_id,
-            "message": r.message,
-            "status": r.status,
-            "schedule_status": r.schedule_status,
-            "scheduled_start": r.scheduled_start.isoformat() if r.scheduled_start else None,
-            "scheduled_end": r.scheduled_end.isoformat() if r.scheduled_end else None,
-            "timezone": r.timezone,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-            "responded_at": r.responded_at.isoformat() if r.responded_at else None,
-        }
+    ).all()
 
     made = []
     received = []
     for r in reqs:
-        item = serialize(r)
+        item = my_session_dict(r)
         if r.requester_id == user_id:
             made.append(item)
         else:
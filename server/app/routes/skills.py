@@ -1,10 +1,35 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from ..extensions import db
+from sqlalchemy import func, select
+from ..extensions import db, cache
 from ..models.skill import Skill
+from ..serializers.skill import SKILL_FIELDS, skill_dict
+from ..utils.fieldsets import parse_fieldset, project
+from ..utils.etag import conditional
+from ..utils.cache import make_key
+from ..utils.query_budget import query_budget
+from ..utils.invalidation import bump_tag_version, tag_version
 
 skills_bp = Blueprint("skills", __name__)
 
+# Column projection for the catalog: rows come back as plain tuples, no ORM
+# identity map / entity hydration. Statements are built from these module-level
+# pieces so SQLAlchemy's compiled cache hits on every request.
+SKILL_COLUMNS = {c.key: c for c in (
+    Skill.id,
+    Skill.user_id,
+    Skill.type,
+    Skill.title,
+    Skill.description,
+    Skill.tags,
+    Skill.visibility,
+    Skill.created_at,
+)}
+
+# public catalog pages are cached until a skill is created/deleted ("skills" tag)
+SKILLS_LIST_TTL = 300
+
+
 def is_admin():
     return (get_jwt() or {}).get("role") == "admin"
 
@@ -36,12 +61,22 @@ def create_skill():
         visibility=visibility,
     )
     db.session.add(s)
+    bump_tag_version("skills")
     db.session.commit()
+    cache.invalidate("skills")
     return {"id": s.id, "message": "Skill created."}, 201
 
 
+def skills_version():
+    # skills are create/delete only, and every create/delete bumps the "skills"
+    # tag row: one primary-key read instead of scanning the table
+    return (tag_version("skills"),)
+
+
 @skills_bp.get("")
+@query_budget(3)
 @jwt_required(optional=True)
+@conditional(skills_version)
 def list_skills():
     # Existing params (keep)
     q = (request.args.get("q") or "").strip().lower()
@@ -59,6 +94,11 @@ def list_skills():
     page = max(page, 1)
     page_size = min(max(page_size, 1), 50)  # cap for safety
 
+    # sparse fieldset (?fields=id,title,type)
+    fields, err = parse_fieldset(SKILL_FIELDS)
+    if err:
+        return err
+
     # Determine current user (keep)
     current_user_id = None
     try:
@@ -67,14 +107,14 @@ def list_skills():
     except:
         current_user_id = None
 
-    query = Skill.query
+    filters = []
 
     # Filters (keep)
     if user_id_filter:
-        query = query.filter(Skill.user_id == int(user_id_filter))
+        filters.append(Skill.user_id == int(user_id_filter))
 
     if skill_type in ("offer", "seek"):
-        query = query.filter(Skill.type == skill_type)
+        filters.append(Skill.type == skill_type)
 
     # Visibility enforcement (keep your rules)
     if include_private:
@@ -82,46 +122,51 @@ def list_skills():
             return {"error": "Not allowed to include private skills."}, 403
         # if allowed, do NOT filter by public only
     else:
-        query = query.filter(Skill.visibility == "public")
+        filters.append(Skill.visibility == "public")
 
     # Search (keep)
     if q:
         like = f"%{q}%"
-        query = query.filter(
+        filters.append(
             Skill.title.ilike(like) |
             Skill.description.ilike(like) |
             Skill.tags.ilike(like)
         )
 
-    # Sorting
-    query = query.order_by(Skill.created_at.desc())
-
-    # NEW: total count BEFORE pagination
-    total = query.count()
-    total_pages = (total + page_size - 1) // page_size
-
-    # NEW: apply pagination
-    skills = query.offset((page - 1) * page_size).limit(page_size).all()
-
-    # NEW: consistent response shape for frontend
-    return {
-        "data": [{
-            "id": s.id,
-            "user_id": s.user_id,
-            "type": s.type,
-            "title": s.title,
-            "description": s.description,
-            "tags": s.tags,
-            "visibility": s.visibility,
-            "created_at": s.created_at.isoformat()
-        } for s in skills],
-        "meta": {
-            "page": page,
-            "pageSize": page_size,
-            "total": total,
-            "totalPages": total_pages
+    def load_page():
+        # NEW: total count BEFORE pagination
+        total = db.session.execute(select(func.count()).select_from(Skill).where(*filters)).scalar()
+        total_pages = (total + page_size - 1) // page_size
+
+        # NEW: apply pagination (sorted newest first)
+        skills = db.session.execute(
+            select(*project(SKILL_COLUMNS, fields))
+            .where(*filters)
+            .order_by(Skill.created_at.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        ).all()
+
+        # NEW: consistent response shape for frontend
+        return {
+            "data": [skill_dict(s, fields) for s in skills],
+            "meta": {
+                "page": page,
+                "pageSize": page_size,
+                "total": total,
+                "totalPages": total_pages
+            }
         }
-    }, 200
+
+    # private listings depend on who's asking; only the public catalog is shared
+    if include_private:
+        return load_page(), 200
+
+    key = make_key("skills", q, skill_type, user_id_filter, page, page_size, tuple(fields))
+    # the unfiltered catalog is what everyone lands on after a deploy/invalidation:
+    # concurrent misses share one query instead of stampeding the DB
+    unfiltered = not (q or skill_type or user_id_filter)
+    return cache.get_or_set(key, load_page, ttl=SKILLS_LIST_TTL, tags=["skills"], coalesce=unfiltered), 200
 
 
 @skills_bp.delete("/<int:skill_id>")
@@ -135,7 +180,10 @@ def delete_skill(skill_id):
     if not (is_admin() or s.user_id == current_user_id):
         return {"error": "Not authorized."}, 403
 
-    db.session.delete(s)
+    owner_id = s.user_id
+    db.session.delete(s)  # its requests, their reviews and slot reservations go too
+    bump_tag_version("skills")
     db.session.commit()
+    cache.invalidate("skills", "sessions", f"availability:{owner_id}")
     return {"message": "Skill deleted."}, 200
 
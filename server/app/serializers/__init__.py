@@ -0,0 +1,8 @@
+# One module per model. Serializers accept ORM objects or projected rows
+# (anything with the attributes) and leave datetimes as-is: the app's JSON
+# provider (utils/json_provider.py) encodes them natively.
+
+
+def pick(obj, fields):
+    """Sparse-fieldset serialization: only the requested attributes."""
+    return {f: getattr(obj, f) for f in fields}
@@ -0,0 +1,19 @@
+def slot_dict(a):
+    return {
+        "id": a.id,
+        "start_time": a.start_time,
+        "end_time": a.end_time,
+        "timezone": a.timezone,
+    }
+
+
+def my_slot_dict(a):
+    d = slot_dict(a)
+    d["is_active"] = a.is_active
+    return d
+
+
+def open_slot_dict(a):
+    d = slot_dict(a)
+    d["reserved_request_id"] = a.reserved_request_id  # optional but helpful for debugging
+    return d
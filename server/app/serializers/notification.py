@@ -0,0 +1,11 @@
+def notification_dict(n):
+    return {
+        "id": n.id,
+        "type": n.type,
+        "title": n.title,
+        "body": n.body,
+        "session_request_id": n.session_request_id,
+        "skill_id": n.skill_id,
+        "is_read": n.is_read,
+        "created_at": n.created_at,
+    }
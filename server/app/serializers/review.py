@@ -0,0 +1,10 @@
+def review_dict(r):
+    return {
+        "id": r.id,
+        "session_request_id": r.session_request_id,
+        "from_user_id": r.from_user_id,
+        "to_user_id": r.to_user_id,
+        "rating": r.rating,
+        "comment": r.comment,
+        "created_at": r.created_at,
+    }
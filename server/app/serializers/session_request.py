@@ -0,0 +1,32 @@
+from . import pick
+
+SESSION_FIELDS = [
+    "id", "requester_id", "provider_id", "skill_id", "message", "status", "schedule_status",
+    "scheduled_start", "scheduled_end", "timezone", "created_at", "responded_at",
+]
+
+
+def session_dict(r, fields=None):
+    if fields is not None:
+        return pick(r, fields)
+    return {
+        "id": r.id,
+        "requester_id": r.requester_id,
+        "provider_id": r.provider_id,
+        "skill_id": r.skill_id,
+        "message": r.message,
+        "status": r.status,
+        "schedule_status": r.schedule_status,
+        "scheduled_start": r.scheduled_start,
+        "scheduled_end": r.scheduled_end,
+        "timezone": r.timezone,
+        "created_at": r.created_at,
+        "responded_at": r.responded_at,
+    }
+
+
+def my_session_dict(r):
+    # /sessions/mine rows carry the joined skill title
+    d = session_dict(r)
+    d["skill_title"] = r.skill_title
+    return d
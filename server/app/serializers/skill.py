@@ -0,0 +1,23 @@
+from . import pick
+
+SKILL_FIELDS = ["id", "user_id", "type", "title", "description", "tags", "visibility", "created_at"]
+
+
+def skill_dict(s, fields=None):
+    if fields is not None:
+        return pick(s, fields)
+    return {
+        "id": s.id,
+        "user_id": s.user_id,
+        "type": s.type,
+        "title": s.title,
+        "description": s.description,
+        "tags": s.tags,
+        "visibility": s.visibility,
+        "created_at": s.created_at,
+    }
+
+
+def skill_summary(s):
+    # nested under admin session rows
+    return {"id": s.id, "title": s.title, "type": s.type, "visibility": s.visibility}
@@ -0,0 +1,28 @@
+USER_FIELDS = ["id", "name", "email", "role", "is_active", "created_at"]
+
+
+def user_dict(u):
+    return {
+        "id": u.id,
+        "name": u.name,
+        "email": u.email,
+        "role": u.role,
+        "is_active": bool(getattr(u, "is_active", True)),
+        "created_at": u.created_at,
+    }
+
+
+def me_dict(u):
+    return {
+        "id": u.id,
+        "name": u.name,
+        "email": u.email,
+        "role": u.role,
+        "bio": u.bio,
+        "is_active": bool(getattr(u, "is_active", True)),
+    }
+
+
+def user_summary(u):
+    # nested under admin skill/session rows
+    return {"id": u.id, "name": u.name, "email": u.email, "role": u.role}
@@ -0,0 +1,19 @@
+from .extensions import db
+from .models.notification import Notification
+from .utils.task_queue import task_queue
+
+# Background tasks run by `flask tasks work` (see utils/task_queue.py).
+# Call them with .delay(); arguments must be JSON-serializable.
+
+
+@task_queue.task(max_attempts=5, backoff=5)
+def create_notification(user_id, ntype, title, body="", session_request_id=None, skill_id=None):
+    db.session.add(Notification(
+        user_id=user_id,
+        type=ntype,
+        title=title,
+        body=body,
+        session_request_id=session_request_id,
+        skill_id=skill_id,
+        is_read=False,
+    ))
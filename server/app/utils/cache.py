@@ -0,0 +1,437 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+
+from .singleflight import SingleFlight
+
+# Application cache.
+#
+# `cache` (extensions.py) is a thin front over one backend picked by
+# CACHE_BACKEND:
+#   - "local":  bounded in-process LRU with per-entry TTL (default)
+#   - "sqlite": a shared SQLite file, so every gunicorn worker sees the same
+#               entries and the same invalidations
+#   - "null":   caching off (every get misses)
+#
+# Entries carry tags ("skills", "user:12", ...). Write routes call
+# cache.invalidate(<tag>) after committing, which drops every entry carrying
+# that tag. TTLs are the safety net, not the invalidation mechanism.
+#
+# Keys are "<namespace>:<rest>"; hits/misses are counted per namespace.
+#
+# With the local backend each worker has its own copy, so invalidations are
+# also published on the DB-backed bus (utils/invalidation.py) for the others.
+#
+# get_or_set(coalesce=True) makes concurrent misses on one key compute once:
+# threads of a worker share the call (utils/singleflight.py), and with a shared
+# backend a "lock:<key>" entry makes other workers wait for the result too.
+
+MISSING = object()
+
+
+def make_key(namespace: str, *parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def namespace_of(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+class NullBackend:
+    name = "null"
+    shared = False
+
+    def get(self, key):
+        return MISSING
+
+    def set(self, key, value, ttl, tags):
+        pass
+
+    def add(self, key, value, ttl) -> bool:
+        return True
+
+    def delete(self, key):
+        pass
+
+    def invalidate(self, tags) -> int:
+        return 0
+
+    def clear(self):
+        pass
+
+    def size(self) -> int:
+        return 0
+
+
+class LocalBackend:
+    """Thread-safe LRU with TTL; private to the worker process."""
+
+    name = "local"
+    shared = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._items = OrderedDict()  # key -> (expires_at, tags, value)
+        self._tags = {}  # tag -> {keys}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return MISSING
+            if item[0] <= time.monotonic():
+                self._drop(key)
+                return MISSING
+            self._items.move_to_end(key)
+            return item[2]
+
+    def set(self, key, value, ttl, tags):
+        with self._lock:
+            self._store(key, value, ttl, tags)
+
+    def add(self, key, value, ttl) -> bool:
+        """Set only if absent (or expired); True if this call stored it."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] > time.monotonic():
+                return False
+            self._store(key, value, ttl, ())
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._drop(key)
+
+    def invalidate(self, tags) -> int:
+        dropped = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    dropped += self._drop(key)
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._tags.clear()
+
+    def size(self) -> int:
+        return len(self._items)
+
+    def _store(self, key, value, ttl, tags):
+        if key in self._items:
+            self._drop(key)
+        self._items[key] = (time.monotonic() + ttl, tags, value)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._items) > self.max_entries:
+            self._drop(next(iter(self._items)))
+            self.evictions += 1
+
+    def _drop(self, key) -> int:
+        item = self._items.pop(key, None)
+        if item is None:
+            return 0
+        for tag in item[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return 1
+
+
+class SQLiteBackend:
+    """
+    Shared cache in a SQLite file (WAL, one connection per thread).
+
+    Values are pickled. Expired rows are purged and the table trimmed to
+    max_entries (oldest writes first) every PURGE_EVERY sets.
+    """
+
+    name = "sqlite"
+    shared = True
+    PURGE_EVERY = 200
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache_entries ("
+        " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS cache_tags ("
+        " tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key)) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS ix_cache_tags_key ON cache_tags (key)",
+    )
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._local = threading.local()
+        self._sets = 0
+
+        with self._conn() as conn:
+            for stmt in self.SCHEMA:
+                conn.execute(stmt)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        # never reuse a connection opened before a fork (gunicorn preload_app)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return MISSING
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl, tags):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, blob, time.time() + ttl),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+
+        self._sets += 1
+        if self._sets % self.PURGE_EVERY == 0:
+            self.purge()
+
+    def add(self, key, value, ttl) -> bool:
+        """Set only if absent (or expired); True if this call stored it."""
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        cur = self._conn().execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE cache_entries.expires_at <= ?",
+            (key, blob, now + ttl, now),
+        )
+        return cur.rowcount == 1
+
+    def delete(self, key):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+
+    def invalidate(self, tags) -> int:
+        tags = list(tags)
+        marks = ", ".join("?" for _ in tags)
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            dropped = conn.execute(
+                f"DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_tags WHERE tag IN ({marks}))",
+                tags,
+            ).rowcount
+            conn.execute(
+                f"DELETE FROM cache_tags WHERE key IN (SELECT key FROM cache_tags WHERE tag IN ({marks}))",
+                tags,
+            )
+        return dropped
+
+    def purge(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+            trimmed = conn.execute(
+                "DELETE FROM cache_entries WHERE rowid NOT IN ("
+                " SELECT rowid FROM cache_entries ORDER BY rowid DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+            conn.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+        self.evictions += trimmed
+
+    def clear(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cache_entries")
+            conn.execute("DELETE FROM cache_tags")
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT count(*) FROM cache_entries").fetchone()[0]
+
+
+class Cache:
+    def __init__(self):
+        self.backend = NullBackend()
+        self.bus = None  # set by register_invalidation_bus
+        self.default_ttl = 60
+        self.flight_wait = 5.0
+        self.flights = SingleFlight()
+        self.hits = Counter()
+        self.misses = Counter()
+        self.invalidations = Counter()
+
+    def init_app(self, app):
+        kind = (app.config.get("CACHE_BACKEND") or "local").lower()
+        self.default_ttl = app.config.get("CACHE_DEFAULT_TTL", 60)
+        self.flight_wait = app.config.get("CACHE_FLIGHT_WAIT", 5.0)
+        max_entries = app.config.get("CACHE_MAX_ENTRIES", 1024)
+
+        if kind == "local":
+            self.backend = LocalBackend(max_entries)
+        elif kind == "sqlite":
+            path = app.config.get("CACHE_SQLITE_PATH") or os.path.join(app.instance_path, "cache.db")
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.backend = SQLiteBackend(path, max_entries)
+        elif kind == "null":
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"CACHE_BACKEND must be 'local', 'sqlite' or 'null', not {kind!r}.")
+
+        app.extensions["cache"] = self
+
+    # --- explicit API ---
+
+    def get(self, key, default=None):
+        value = self.backend.get(key)
+        if value is MISSING:
+            self.misses[namespace_of(key)] += 1
+            return default
+        self.hits[namespace_of(key)] += 1
+        return value
+
+    def set(self, key, value, ttl=None, tags=()):
+        self.backend.set(key, value, self.default_ttl if ttl is None else ttl, tuple(tags))
+
+    def delete(self, key):
+        self.backend.delete(key)
+
+    def get_or_set(self, key, fn, ttl=None, tags=(), coalesce=False):
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        if coalesce:
+            return self.flights.do(key, lambda: self._fill_once(key, fn, ttl, tags))
+
+        value = fn()
+        self.set(key, value, ttl, tags)
+        return value
+
+    def _fill_once(self, key, fn, ttl, tags):
+        # a previous leader may have filled it between our miss and now
+        value = self.backend.get(key)
+        if value is not MISSING:
+            return value
+
+        lock = f"lock:{key}"
+        locked = False
+        if self.backend.shared:
+            locked = self.backend.add(lock, os.getpid(), self.flight_wait)
+            if not locked:
+                value = self._wait_for(key)
+                if value is not MISSING:
+                    return value
+
+        try:
+            value = fn()
+            self.set(key, value, ttl, tags)
+        finally:
+            if locked:
+                self.backend.delete(lock)
+        return value
+
+    def _wait_for(self, key):
+        """Another worker holds the lock: poll for its result, up to flight_wait."""
+        deadline = time.monotonic() + self.flight_wait
+        delay = 0.01
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            value = self.backend.get(key)
+            if value is not MISSING:
+                return value
+            delay = min(delay * 2, 0.2)
+        return MISSING
+
+    def get_many(self, keys) -> dict:
+        """{key: value} for the keys that hit."""
+        found = {}
+        for key in keys:
+            value = self.get(key, MISSING)
+            if value is not MISSING:
+                found[key] = value
+        return found
+
+    def invalidate(self, *tags) -> int:
+        for tag in tags:
+            self.invalidations[tag] += 1
+        dropped = self.backend.invalidate(tags)
+        if self.bus is not None:
+            self.bus.publish(tags)
+        return dropped
+
+    def clear(self):
+        self.backend.clear()
+
+    # --- decorator ---
+
+    def cached(self, key, ttl=None, tags=(), coalesce=False):
+        """
+        Cache a function's return value.
+
+        key is a namespace string (arguments are hashed onto it) or a callable
+        taking the function's arguments and returning the full key.
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if callable(key):
+                    k = key(*args, **kwargs)
+                elif args or kwargs:
+                    k = make_key(key, args, sorted(kwargs.items()))
+                else:
+                    k = key
+                return self.get_or_set(k, lambda: fn(*args, **kwargs), ttl, tags, coalesce)
+
+            wrapper.uncached = fn
+            return wrapper
+        return decorator
+
+    # --- metrics ---
+
+    def stats(self) -> dict:
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        stats = {
+            "backend": self.backend.name,
+            "entries": self.backend.size(),
+            "evictions": getattr(self.backend, "evictions", 0),
+            "hits": hits,
+            "misses": misses,
+            "hitRate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "namespaces": {
+                ns: {"hits": self.hits[ns], "misses": self.misses[ns]} for ns in namespaces
+            },
+            "invalidations": dict(self.invalidations),
+            "coalesced": self.flights.coalesced,
+        }
+        if self.bus is not None:
+            stats["bus"] = self.bus.stats()
+        return stats
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import chain
+
+from sqlalchemy import event, select
+
+from ..extensions import db
+from ..models.user import User
+from ..models.user_change import UserChange
+from ..models.session_request import SessionRequest
+from ..models.notification import Notification
+from ..models.review import Review
+from .replica import RoutingSession
+
+# Per-user change feed (GET /changes?since=<seq>).
+#
+# Every flush that adds, modifies or deletes a session request, notification
+# or review bumps users.change_seq once for each user who can see it (one
+# UPDATE ... RETURNING) and writes a user_changes row per entity at the new
+# seq, in the same transaction. The UPDATE holds the user's row lock until
+# commit, so on Postgres seqs become visible in order; a client that has seen
+# seq N has seen everything up to N.
+#
+# Bulk updates that bypass the ORM (notifications read-all) call
+# record_changes() themselves, with entity_id ALL when every row of that kind
+# may have changed: one feed row, reported as "refetch": [entity] instead of
+# a list of ids. Old rows are dropped by `flask changes prune`; a client whose
+# `since` fell off the end, or whose next seq alone is bigger than a page,
+# gets reset=true and refetches.
+
+CHANGES_LIMIT = 500
+ALL = 0  # entity_id: everything of this entity for the user
+
+# model -> (entity name, users who see it)
+TRACKED = {
+    SessionRequest: ("sessions", lambda o: (o.requester_id, o.provider_id)),
+    Notification: ("notifications", lambda o: (o.user_id,)),
+    Review: ("reviews", lambda o: (o.from_user_id, o.to_user_id)),
+}
+
+
+def record_changes(changes, connection=None) -> dict:
+    """
+    changes: {user_id: {(entity, entity_id), ...}}. Returns {user_id: new seq}.
+    Runs on the current transaction (or `connection`).
+    """
+    changes = {uid: refs for uid, refs in changes.items() if uid and refs}
+    if not changes:
+        return {}
+
+    conn = connection if connection is not None else db.session.connection()
+    users = User.__table__
+    seqs = dict(conn.execute(
+        users.update()
+        .where(users.c.id.in_(changes))
+        .values(change_seq=users.c.change_seq + 1)
+        .returning(users.c.id, users.c.change_seq)
+    ).all())
+
+    now = datetime.utcnow()
+    conn.execute(UserChange.__table__.insert(), [
+        {"user_id": uid, "seq": seqs[uid], "entity": entity, "entity_id": entity_id, "created_at": now}
+        for uid, refs in changes.items() if uid in seqs
+        for entity, entity_id in sorted(refs)
+    ])
+    return seqs
+
+
+def track_changes(session, flush_context):
+    changes = defaultdict(set)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        spec = TRACKED.get(type(obj))
+        if spec is None or obj.id is None:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+
+        entity, audience = spec
+        for uid in audience(obj):
+            changes[uid].add((entity, obj.id))
+
+    if changes:
+        record_changes(changes, session.connection())
+
+
+def current_seq(user_id: int) -> int:
+    return db.session.execute(select(User.change_seq).where(User.id == user_id)).scalar() or 0
+
+
+def changes_since(user_id: int, since, limit: int = CHANGES_LIMIT):
+    """
+    {"seq", "changes": {entity: [ids]}, "refetch": [entities], "reset", "more"}
+    for writes after `since`, or None if there are none yet. since=None just
+    returns the current seq to start from.
+    """
+    seq = current_seq(user_id)
+    reset = {"seq": seq, "changes": {}, "refetch": [], "reset": True, "more": False}
+    if since is None or since > seq:
+        # first call, or a seq from some other database: start over
+        return dict(reset, reset=since is not None)
+    if since == seq:
+        return None
+
+    rows = db.session.execute(
+        select(UserChange.seq, UserChange.entity, UserChange.entity_id)
+        .where(UserChange.user_id == user_id, UserChange.seq > since)
+        .order_by(UserChange.seq)
+        .limit(limit + 1)
+    ).all()
+
+    # every seq bump writes at least one row, so a gap means it was pruned
+    if not rows or rows[0].seq != since + 1:
+        return reset
+
+    more = len(rows) > limit
+    if more:
+        # don't hand out half of a seq
+        last = rows[limit].seq
+        rows = [r for r in rows[:limit] if r.seq < last]
+        if not rows:
+            # one seq alone doesn't fit in a page: refetching is cheaper anyway
+            return reset
+
+    changes = defaultdict(set)
+    refetch = set()
+    for r in rows:
+        if r.entity_id == ALL:
+            refetch.add(r.entity)
+        else:
+            changes[r.entity].add(r.entity_id)
+
+    return {
+        "seq": rows[-1].seq if more else seq,
+        "changes": {entity: sorted(ids) for entity, ids in changes.items() if entity not in refetch},
+        "refetch": sorted(refetch),
+        "reset": False,
+        "more": more,
+    }
+
+
+def prune_changes(days: int) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    result = db.session.execute(UserChange.__table__.delete().where(UserChange.created_at < cutoff))
+    db.session.commit()
+    return result.rowcount
+
+
+def register_change_tracking(app):
+    # session events are class-wide: install once per process
+    if not event.contains(RoutingSession, "after_flush", track_changes):
+        event.listen(RoutingSession, "after_flush", track_changes)
@@ -0,0 +1,144 @@
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Response compression.
+#
+# after_request hook: negotiates br (when the brotli package is installed) or
+# gzip from Accept-Encoding. Buffered bodies under COMPRESS_MIN_SIZE are left
+# alone; streamed bodies (exports) are compressed chunk by chunk as they're
+# generated. Bodies that carry an ETag are kept compressed in a small LRU so a
+# repeat of the same representation isn't compressed twice.
+
+SKIP_MIMETYPE_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+SKIP_MIMETYPES = {
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-brotli",
+    "application/pdf",
+    "application/octet-stream",
+}
+
+
+class PrecompressedCache:
+    """Thread-safe LRU (gthread workers share it)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def put(self, key, body: bytes):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._items[key] = body
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+
+def choose_encoding(accept_encodings, allow_br=True):
+    if allow_br and brotli is not None and accept_encodings["br"] > 0:
+        return "br"
+    if accept_encodings["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def gzip_compressor(level: int):
+    # wbits=31 -> gzip container
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def compress_bytes(data: bytes, encoding: str, config) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESS_BR_QUALITY"])
+    c = gzip_compressor(config["COMPRESS_LEVEL"])
+    return c.compress(data) + c.flush()
+
+
+def compress_stream(iterable, encoding: str, config, charset="utf-8"):
+    if encoding == "br":
+        c = brotli.Compressor(quality=config["COMPRESS_BR_QUALITY"])
+        step, finish = c.process, c.finish
+    else:
+        c = gzip_compressor(config["COMPRESS_LEVEL"])
+        step, finish = c.compress, c.flush
+
+    try:
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            out = step(chunk)
+            if out:
+                yield out
+        yield finish()
+    finally:
+        close = getattr(iterable, "close", None)
+        if close is not None:
+            close()
+
+
+def should_skip(response) -> bool:
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return True
+    if "Content-Encoding" in response.headers or response.direct_passthrough:
+        return True
+    if request.method == "HEAD":
+        return True
+
+    mimetype = response.mimetype or ""
+    return mimetype in SKIP_MIMETYPES or mimetype.startswith(SKIP_MIMETYPE_PREFIXES)
+
+
+def register_compression(app):
+    if not app.config.get("COMPRESS_ENABLED", True):
+        return
+
+    cache = PrecompressedCache(app.config.get("COMPRESS_CACHE_ENTRIES", 128))
+
+    @app.after_request
+    def compress_response(response):
+        if should_skip(response):
+            return response
+
+        encoding = choose_encoding(request.accept_encodings, app.config.get("COMPRESS_BROTLI", True))
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, app.config)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+                return response
+
+            etag, _ = response.get_etag()
+            key = (etag, encoding, request.full_path) if etag else None
+            body = cache.get(key) if key else None
+            if body is None:
+                body = compress_bytes(data, encoding, app.config)
+                if key:
+                    cache.put(key, body)
+            response.set_data(body)
+
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
@@ -0,0 +1,79 @@
+from sqlalchemy import event
+
+from ..extensions import db
+
+# Connection setup driven by Config.
+#
+# SQLite: every new DBAPI connection gets the SQLITE_* pragmas below (WAL so
+# readers don't block on the writer, a busy timeout instead of instant
+# "database is locked", bigger page cache + mmap, FK enforcement).
+# Anything else (Postgres on Render): pool settings go through
+# SQLALCHEMY_ENGINE_OPTIONS.
+
+
+def is_sqlite(uri: str) -> bool:
+    return (uri or "").startswith("sqlite")
+
+
+def sqlite_pragmas(config) -> list:
+    pragmas = []
+
+    if config.get("SQLITE_JOURNAL_MODE"):
+        pragmas.append(f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}")
+    if config.get("SQLITE_SYNCHRONOUS"):
+        pragmas.append(f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}")
+    if config.get("SQLITE_BUSY_TIMEOUT_MS") is not None:
+        pragmas.append(f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}")
+    if config.get("SQLITE_MMAP_SIZE") is not None:
+        pragmas.append(f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}")
+    if config.get("SQLITE_CACHE_SIZE") is not None:
+        pragmas.append(f"PRAGMA cache_size={int(config['SQLITE_CACHE_SIZE'])}")
+    if config.get("SQLITE_FOREIGN_KEYS") is not None:
+        pragmas.append(f"PRAGMA foreign_keys={'ON' if config['SQLITE_FOREIGN_KEYS'] else 'OFF'}")
+
+    return pragmas
+
+
+def engine_options(config) -> dict:
+    """Pool settings for server databases (ignored for SQLite)."""
+    if is_sqlite(config.get("SQLALCHEMY_DATABASE_URI")):
+        return {}
+
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+    }
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def configure_engine_options(app):
+    """Call before db.init_app so the options reach create_engine."""
+    options = engine_options(app.config)
+    if options:
+        merged = dict(options)
+        merged.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = merged
+
+
+def register_engine_hooks(app):
+    """Call after db.init_app; hooks every configured engine (binds included)."""
+    pragmas = sqlite_pragmas(app.config)
+    if not pragmas:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                install_sqlite_pragmas(engine, pragmas)
@@ -0,0 +1,40 @@
+import hashlib
+from functools import wraps
+
+from flask import make_response, request
+from flask_jwt_extended import get_jwt_identity
+
+# Conditional GET.
+#
+# @conditional(version_fn) computes a cheap version marker for the resource
+# (e.g. count + max(id) off an index) *before* the handler runs. The ETag is a
+# hash of that marker plus the request path/query and the caller, so
+# If-None-Match hits return 304 without running the list query or serializing.
+# Must sit below @jwt_required() so the identity is available.
+
+CACHE_CONTROL = "private, no-cache"  # browser keeps a copy but revalidates every time
+
+
+def make_etag(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def conditional(version_fn, vary_user=True):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            user = get_jwt_identity() if vary_user else None
+            tag = make_etag(request.full_path, user, tuple(version_fn(*args, **kwargs)))
+
+            if request.if_none_match.contains_weak(tag):
+                resp = make_response("", 304)
+            else:
+                resp = make_response(fn(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+
+            resp.set_etag(tag, weak=True)
+            resp.headers["Cache-Control"] = CACHE_CONTROL
+            return resp
+        return wrapper
+    return decorator
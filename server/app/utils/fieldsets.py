@@ -0,0 +1,32 @@
+from flask import request
+
+# Sparse fieldsets: ?fields=id,title,status
+#
+# The requested names are validated against a per-resource allowlist and then
+# drive both the select() column list and the serializer, so unrequested Text
+# columns are never read or sent. No ?fields= means every allowed field.
+
+
+def parse_fieldset(allowed, param: str = "fields"):
+    """Returns (ordered field names, error) like parse_pagination. `id` is always included."""
+    raw = (request.args.get(param) or "").strip()
+    if not raw:
+        return list(allowed), None
+
+    names = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in names if f not in allowed]
+    if unknown:
+        return None, ({
+            "error": f"Unknown field(s): {', '.join(unknown)}.",
+            "allowed": list(allowed),
+        }, 400)
+
+    if "id" in allowed and "id" not in names:
+        names.insert(0, "id")
+    return list(dict.fromkeys(names)), None
+
+
+def project(columns, fields, required=()):
+    """Columns for the requested fields plus any the handler needs internally."""
+    names = dict.fromkeys([*fields, *required])
+    return [columns[n] for n in names if n in columns]
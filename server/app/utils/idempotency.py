@@ -0,0 +1,214 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from ..extensions import db, cache
+from ..models.idempotency_key import IdempotencyKey
+
+# Idempotency-Key support for mutating endpoints.
+#
+# @idempotent (below @jwt_required()) makes a retried request with the same
+# Idempotency-Key header replay the first response instead of running the
+# handler again:
+#   - the first request inserts a pending (user, key) row in its own
+#     transaction, so duplicates see it right away, then runs the handler and
+#     stores status + body for IDEMPOTENCY_TTL seconds
+#   - the handler ends its writes with commit_or_defer(): under a claimed key
+#     that only flushes, and the decorator commits the writes together with
+#     the stored response, so they land (or roll back) as one. A crash before
+#     that commit leaves nothing behind and the key is safe to run again
+#   - a duplicate arriving while the first is still running polls for up to
+#     IDEMPOTENCY_WAIT seconds and replays the result (409 + Retry-After if it
+#     still isn't done)
+#   - the same key with a different method/path/body is a 422
+#   - 5xx responses and exceptions aren't stored: the writes roll back, the
+#     key is released and a retry runs the handler for real
+# If a worker dies mid-request, the pending row is taken over once its
+# IDEMPOTENCY_LOCK_TIMEOUT passes. Requests without the header are untouched.
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+WAIT_STEP = 0.1  # seconds between checks while a duplicate is in flight
+
+keys = IdempotencyKey.__table__
+
+
+def request_fingerprint() -> str:
+    h = hashlib.sha256()
+    h.update(f"{request.method} {request.path}\n".encode("utf-8"))
+    h.update(request.get_data(cache=True))
+    return h.hexdigest()
+
+
+def row_filter(user_id, key):
+    return and_(keys.c.user_id == user_id, keys.c.key == key)
+
+
+def claim(user_id: int, key: str, fingerprint: str):
+    """Insert the pending row (committed at once); returns its locked_until, None if the key exists."""
+    now = datetime.utcnow()
+    config = current_app.config
+    until = now + timedelta(seconds=config.get("IDEMPOTENCY_LOCK_TIMEOUT", 60))
+    try:
+        # db.engine: its own connection/transaction, and always the primary
+        with db.engine.begin() as conn:
+            conn.execute(keys.insert().values(
+                user_id=user_id,
+                key=key,
+                fingerprint=fingerprint,
+                status="pending",
+                locked_until=until,
+                created_at=now,
+                expires_at=now + timedelta(seconds=config.get("IDEMPOTENCY_TTL", 86400)),
+            ))
+        return until
+    except IntegrityError:
+        return None
+
+
+def take_over(user_id: int, key: str, fingerprint: str):
+    """Claim an existing row whose owner died mid-request or whose TTL ran out (like claim())."""
+    now = datetime.utcnow()
+    config = current_app.config
+    until = now + timedelta(seconds=config.get("IDEMPOTENCY_LOCK_TIMEOUT", 60))
+    with db.engine.begin() as conn:
+        result = conn.execute(
+            keys.update()
+            .where(
+                row_filter(user_id, key),
+                or_(
+                    and_(keys.c.status == "pending", keys.c.locked_until < now),
+                    keys.c.expires_at < now,
+                ),
+            )
+            .values(
+                fingerprint=fingerprint,
+                status="pending",
+                locked_until=until,
+                response_status=None,
+                response_body=None,
+                response_type=None,
+                created_at=now,
+                expires_at=now + timedelta(seconds=config.get("IDEMPOTENCY_TTL", 86400)),
+            )
+        )
+    return until if result.rowcount == 1 else None
+
+
+def lookup(user_id: int, key: str):
+    with db.engine.connect() as conn:
+        return conn.execute(select(keys).where(row_filter(user_id, key))).first()
+
+
+def store(user_id: int, key: str, until, response) -> bool:
+    """Mark our claim done in the request's own transaction; False if it was taken over meanwhile."""
+    result = db.session.execute(
+        keys.update()
+        .where(row_filter(user_id, key), keys.c.status == "pending", keys.c.locked_until == until)
+        .values(
+            status="done",
+            locked_until=None,
+            response_status=response.status_code,
+            response_body=response.get_data(),
+            response_type=response.content_type,
+        )
+    )
+    return result.rowcount == 1
+
+
+def release(user_id: int, key: str, until):
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(delete(keys).where(
+                row_filter(user_id, key), keys.c.status == "pending", keys.c.locked_until == until,
+            ))
+    except SQLAlchemyError as e:
+        # nothing was committed, so the key just runs again after its lock timeout
+        current_app.logger.warning("idempotency key %r not released: %s", key, e)
+
+
+def commit_or_defer(*invalidate):
+    """
+    End an @idempotent view's writes: commit and invalidate the cache tags, or,
+    while a key is claimed, flush and leave both to the decorator.
+    """
+    if "idempotency_tags" in g:
+        db.session.flush()
+        g.idempotency_tags.update(invalidate)
+        return
+    db.session.commit()
+    if invalidate:
+        cache.invalidate(*invalidate)
+
+
+def in_progress():
+    resp = make_response({"error": f"A request with this {HEADER} is still in progress."}, 409)
+    resp.headers["Retry-After"] = "1"
+    return resp
+
+
+def replay(row):
+    resp = current_app.response_class(row.response_body, status=row.response_status, content_type=row.response_type)
+    resp.headers["Idempotent-Replayed"] = "true"
+    return resp
+
+
+def idempotent(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return fn(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return {"error": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters."}, 400
+
+        user_id = int(get_jwt_identity())
+        fingerprint = request_fingerprint()
+        deadline = time.monotonic() + current_app.config.get("IDEMPOTENCY_WAIT", 10)
+
+        while True:
+            until = claim(user_id, key, fingerprint) or take_over(user_id, key, fingerprint)
+            if until is not None:
+                break
+            row = lookup(user_id, key)
+            if row is None:
+                continue  # released between our insert and the lookup: try again
+            if row.fingerprint != fingerprint:
+                return {"error": f"{HEADER} was already used for a different request."}, 422
+            if row.status == "done":
+                return replay(row)
+            if time.monotonic() >= deadline:
+                return in_progress()
+            time.sleep(WAIT_STEP)
+
+        g.idempotency_tags = set()
+        try:
+            resp = make_response(fn(*args, **kwargs))
+            if resp.status_code >= 500 or resp.is_streamed:
+                db.session.rollback()
+                release(user_id, key, until)
+                return resp
+
+            if not store(user_id, key, until, resp):
+                # ran past IDEMPOTENCY_LOCK_TIMEOUT and another request took
+                # the key over: drop our writes, that one's result will stand
+                db.session.rollback()
+                return in_progress()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            release(user_id, key, until)
+            raise
+        finally:
+            tags = g.pop("idempotency_tags")
+
+        if tags:
+            cache.invalidate(*tags)
+        return resp
+    return wrapper
@@ -0,0 +1,136 @@
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..extensions import db, cache
+from ..models.cache_version import CacheVersion
+
+# Cross-worker cache invalidation.
+#
+# Each gunicorn worker has its own local cache, so an invalidation in one
+# worker has to reach the others. cache.invalidate(tag) takes the next version
+# from a counter row in cache_versions (HEAD_TAG, bumped with UPDATE ...
+# RETURNING) and sets the tag's row to it; before each request every worker
+# asks for the tags whose version is above the last one it saw (one indexed
+# range query on the primary) and drops them from its own cache.
+#
+# The counter row stays locked until the publisher commits, so on Postgres
+# concurrent bumps are serialized and commit in version order. The poll still
+# re-reads GAP_WINDOW versions below the newest it saw and acts on any
+# (tag, version) it hasn't applied yet, so a version that becomes visible late
+# is never skipped.
+#
+# Only used with the "local" backend: the shared SQLite backend already sees
+# every invalidation.
+#
+# Tables that have no cheap change marker of their own (skills: count + max(id)
+# scans, and SQLite reuses a deleted max id) call bump_tag_version(tag) in the
+# writer's transaction; tag_version(tag) is then a primary-key read for
+# @conditional, whatever the cache backend.
+
+HEAD_TAG = "__head__"
+GAP_WINDOW = 100  # versions re-read below the newest seen
+
+NEXT_VERSION = text(
+    "INSERT INTO cache_versions (tag, version, updated_at) "
+    "VALUES (:head, (SELECT COALESCE(MAX(version), 0) + 1 FROM cache_versions), :now) "
+    "ON CONFLICT (tag) DO UPDATE SET version = cache_versions.version + 1, updated_at = excluded.updated_at "
+    "RETURNING version"
+)
+
+BUMP = text(
+    "INSERT INTO cache_versions (tag, version, updated_at) VALUES (:tag, :version, :now) "
+    "ON CONFLICT (tag) DO UPDATE SET version = excluded.version, updated_at = excluded.updated_at"
+)
+
+
+def bump_tag_version(tag: str):
+    """Move `tag` to a new version as part of the current transaction."""
+    now = datetime.utcnow()
+    version = db.session.execute(NEXT_VERSION, {"head": HEAD_TAG, "now": now}).scalar()
+    db.session.execute(BUMP, {"tag": tag, "version": version, "now": now})
+
+
+def tag_version(tag: str) -> int:
+    return db.session.execute(select(CacheVersion.version).where(CacheVersion.tag == tag)).scalar() or 0
+
+
+class InvalidationBus:
+    def __init__(self, cache, interval: float = 0):
+        self.cache = cache
+        self.interval = interval  # seconds between polls; 0 = every request
+        self.seen = None
+        self.applied = {}  # tag -> version already dropped, for versions inside the gap window
+        self.published = 0
+        self.received = 0
+        self._next_poll = 0.0
+        self._lock = threading.Lock()
+
+    def publish(self, tags):
+        now = datetime.utcnow()
+        try:
+            # db.engine is always the primary, whatever the session is routed to
+            with db.engine.begin() as conn:
+                version = conn.execute(NEXT_VERSION, {"head": HEAD_TAG, "now": now}).scalar()
+                conn.execute(BUMP, [{"tag": tag, "version": version, "now": now} for tag in tags])
+        except SQLAlchemyError as e:
+            # the write itself already committed; other workers fall back to TTLs
+            current_app.logger.warning("cache invalidation not published for %s: %s", tags, e)
+            return
+        self.published += len(tags)
+
+    def poll(self):
+        if self.interval and time.monotonic() < self._next_poll:
+            return
+        # one thread polls at a time; the others go ahead with what they have
+        if not self._lock.acquire(blocking=False):
+            return
+
+        try:
+            self._next_poll = time.monotonic() + self.interval
+            with db.engine.connect() as conn:
+                fresh = self.seen is None
+                if fresh:
+                    # new worker, empty cache: start from the current head
+                    self.seen = conn.execute(
+                        select(func.coalesce(func.max(CacheVersion.version), 0))
+                    ).scalar()
+
+                rows = conn.execute(
+                    select(CacheVersion.tag, CacheVersion.version).where(
+                        CacheVersion.version > self.seen - GAP_WINDOW,
+                        CacheVersion.tag != HEAD_TAG,
+                    )
+                ).all()
+
+                new = [r for r in rows if self.applied.get(r.tag) != r.version]
+                if new and not fresh:
+                    self.cache.backend.invalidate([r.tag for r in new])
+                    self.received += len(new)
+                if rows:
+                    self.seen = max(self.seen, max(r.version for r in rows))
+                floor = self.seen - GAP_WINDOW
+                self.applied = {r.tag: r.version for r in rows if r.version > floor}
+        except SQLAlchemyError as e:
+            current_app.logger.warning("cache invalidation poll failed: %s", e)
+        finally:
+            self._lock.release()
+
+    def stats(self) -> dict:
+        return {"published": self.published, "received": self.received, "seen": self.seen}
+
+
+def register_invalidation_bus(app):
+    if not app.config.get("CACHE_BUS_ENABLED", True) or cache.backend.name != "local":
+        return
+
+    bus = InvalidationBus(cache, app.config.get("CACHE_BUS_INTERVAL", 0))
+    cache.bus = bus
+
+    @app.before_request
+    def poll_invalidations():
+        bus.poll()
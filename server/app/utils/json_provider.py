@@ -0,0 +1,71 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+# Fast JSON for every response.
+#
+# Routes hand back datetimes and SQLAlchemy rows as-is; this provider encodes
+# them natively (orjson when installed) instead of each handler calling
+# .isoformat() per field. Keys are not sorted.
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def encode_default(o):
+    if isinstance(o, Row):
+        return o._asdict()
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=encode_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=encode_default, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+    default = staticmethod(encode_default)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=encode_default, option=ORJSON_OPTIONS).decode("utf-8")
+        kwargs.setdefault("default", encode_default)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+
+        # keep the pretty debug output Flask gives by default
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(obj)
+
+        return self._app.response_class(dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
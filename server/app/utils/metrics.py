@@ -0,0 +1,152 @@
+import hmac
+import os
+import time
+
+from flask import Response, current_app, g, has_app_context, request
+from sqlalchemy import event
+
+from ..extensions import db
+from .statement_timer import subscribe
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        REGISTRY,
+        generate_latest,
+        multiprocess,
+    )
+except ImportError:  # optional: no /metrics without it
+    Counter = None
+
+# Request instrumentation, exposed on GET /metrics in Prometheus text format.
+#
+# Per endpoint: latency histogram, status counts, SQL statement count and SQL
+# time per request (engine cursor events, summed on flask.g). Per engine: pool
+# connections checked out.
+#
+# Under gunicorn every worker is its own process: with PROMETHEUS_MULTIPROC_DIR
+# set (start.sh does), prometheus_client keeps the values in per-process files
+# in that directory and /metrics aggregates all of them, whichever worker
+# answers the scrape.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SQL_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+if Counter is not None:
+    REQUESTS = Counter(
+        "skillswap_http_requests_total",
+        "HTTP requests by endpoint and status.",
+        ["blueprint", "endpoint", "method", "status"],
+    )
+    LATENCY = Histogram(
+        "skillswap_http_request_duration_seconds",
+        "Time spent handling a request (until the response is returned).",
+        ["blueprint", "endpoint", "method"],
+        buckets=LATENCY_BUCKETS,
+    )
+    SQL_QUERIES = Histogram(
+        "skillswap_db_queries_per_request",
+        "SQL statements executed per request.",
+        ["blueprint", "endpoint"],
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+    SQL_TIME = Histogram(
+        "skillswap_db_time_per_request_seconds",
+        "Total SQL execution time per request.",
+        ["blueprint", "endpoint"],
+        buckets=SQL_TIME_BUCKETS,
+    )
+    POOL_CHECKED_OUT = Gauge(
+        "skillswap_db_pool_checked_out",
+        "DB connections currently checked out of the pool.",
+        ["bind"],
+        multiprocess_mode="livesum",
+    )
+    POOL_SIZE = Gauge(
+        "skillswap_db_pool_size",
+        "Configured pool size per worker.",
+        ["bind"],
+        multiprocess_mode="livemax",
+    )
+
+
+def request_labels():
+    # endpoint names, never raw paths: unmatched URLs would explode cardinality
+    return request.blueprint or "app", request.endpoint or "unmatched"
+
+
+def count_query(conn, statement, parameters, context, executemany, elapsed):
+    if has_app_context():
+        g.sql_count = g.get("sql_count", 0) + 1
+        g.sql_time = g.get("sql_time", 0.0) + elapsed
+
+
+def install_pool_gauges(engine, bind: str):
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        POOL_SIZE.labels(bind).set(size())
+
+    checked_out = POOL_CHECKED_OUT.labels(bind)
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+def metrics_registry():
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def register_metrics(app):
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    if Counter is None:
+        app.logger.warning("prometheus_client is not installed; /metrics disabled.")
+        return
+
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            subscribe(engine, count_query)
+            install_pool_gauges(engine, bind or "primary")
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+        g.sql_count = 0
+        g.sql_time = 0.0
+
+    @app.after_request
+    def record_request(response):
+        start = g.pop("metrics_start", None)
+        if start is None or request.endpoint == "metrics":
+            return response
+
+        blueprint, endpoint = request_labels()
+        LATENCY.labels(blueprint, endpoint, request.method).observe(time.perf_counter() - start)
+        REQUESTS.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+        SQL_QUERIES.labels(blueprint, endpoint).observe(g.get("sql_count", 0))
+        SQL_TIME.labels(blueprint, endpoint).observe(g.get("sql_time", 0.0))
+        return response
+
+    @app.get("/metrics", endpoint="metrics")
+    def metrics():
+        token = current_app.config.get("METRICS_TOKEN")
+        if token:
+            sent = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            if not hmac.compare_digest(sent, token):
+                return {"error": "Not authorized."}, 401
+
+        return Response(generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST)
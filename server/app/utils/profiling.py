@@ -0,0 +1,163 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import g, has_app_context, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+from ..extensions import db
+from .statement_timer import subscribe
+
+# On-demand request profiling.
+#
+# A request is profiled when an admin sends "X-Profile: 1" (or ?_profile=1),
+# or when it's picked by PROFILE_SAMPLE_RATE. The whole request, view and JSON
+# encoding included, runs under cProfile. Time is split into:
+#   - sql:       cursor.execute time (engine events)
+#   - serialize: outermost calls into app/serializers + the JSON provider
+#   - python:    everything else
+# Profiles go to a small per-worker store (GET /admin/profiles), downloadable
+# as .prof files for snakeviz / pstats.
+#
+# Unprofiled requests pay one header/arg lookup (plus one random() when
+# sampling is on) and an attribute check per SQL statement.
+
+SERIALIZER_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "serializers") + os.sep
+JSON_PROVIDER_FILE = os.path.join(os.path.dirname(__file__), "json_provider.py")
+TOP_FUNCTIONS = 30
+
+
+class ProfileStore:
+    def __init__(self, size: int = 20):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: dict):
+        with self._lock:
+            self._items[profile["id"]] = profile
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def get(self, profile_id: str):
+        with self._lock:
+            return self._items.get(profile_id)
+
+    def recent(self) -> list:
+        with self._lock:
+            items = list(self._items.values())
+        items.reverse()
+        return items
+
+
+profiles = ProfileStore()
+
+
+def summary(profile: dict) -> dict:
+    return {k: v for k, v in profile.items() if k not in ("stats", "top")}
+
+
+def is_serialization(key) -> bool:
+    filename, _, funcname = key
+    return filename.startswith(SERIALIZER_DIR) or (filename == JSON_PROVIDER_FILE and funcname != "<module>")
+
+
+def outermost_time(stats: dict, match) -> float:
+    """Cumulative seconds spent in calls to `match` functions made from outside them."""
+    total = 0.0
+    for key, (cc, nc, tt, ct, callers) in stats.items():
+        if match(key) and not any(match(c) for c in callers):
+            total += ct
+    return total
+
+
+def top_functions(prof) -> str:
+    out = io.StringIO()
+    pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    return out.getvalue()
+
+
+def wants_profile(app) -> bool:
+    flag = request.headers.get("X-Profile") or request.args.get("_profile")
+    if flag:
+        try:
+            verify_jwt_in_request(optional=True)
+            return (get_jwt() or {}).get("role") == "admin"
+        except Exception:  # bad/expired token: just don't profile, the view will answer 401
+            return False
+
+    rate = app.config.get("PROFILE_SAMPLE_RATE", 0)
+    return rate > 0 and random.random() < rate
+
+
+def add_sql_time(conn, statement, parameters, context, executemany, elapsed):
+    if has_app_context() and g.get("profiler") is not None:
+        g.profile_sql += elapsed
+        g.profile_queries += 1
+
+
+def register_profiling(app):
+    if not app.config.get("PROFILE_ENABLED", True):
+        return
+
+    profiles.size = app.config.get("PROFILE_STORE_SIZE", 20)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            subscribe(engine, add_sql_time)
+
+    @app.before_request
+    def start_profile():
+        if not wants_profile(app):
+            return
+
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:  # another profiler already active on this thread
+            return
+        g.profiler = prof
+        g.profile_sql = 0.0
+        g.profile_queries = 0
+        g.profile_start = time.perf_counter()
+
+    @app.after_request
+    def finish_profile(response):
+        prof = g.pop("profiler", None)
+        if prof is None:
+            return response
+
+        prof.disable()
+        total = time.perf_counter() - g.profile_start
+        prof.create_stats()
+        stats = prof.stats  # pstats.Stats(prof) empties prof.stats
+
+        sql = g.profile_sql
+        serialize = outermost_time(stats, is_serialization)
+        profile = {
+            "id": uuid.uuid4().hex[:12],
+            "at": datetime.utcnow(),
+            "method": request.method,
+            "path": request.full_path.rstrip("?"),
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "sql_ms": round(sql * 1000, 2),
+            "sql_queries": g.profile_queries,
+            "serialize_ms": round(serialize * 1000, 2),
+            "python_ms": round(max(total - sql - serialize, 0) * 1000, 2),
+            "top": top_functions(prof),
+            "stats": marshal.dumps(stats),
+        }
+        profiles.add(profile)
+
+        response.headers["X-Profile-Id"] = profile["id"]
+        return response
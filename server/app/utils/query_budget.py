@@ -0,0 +1,150 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, g, has_app_context, request
+
+from ..extensions import db
+from .slow_queries import fingerprint
+from .statement_timer import subscribe
+
+# Query debugging (QUERY_DEBUG=true, meant for dev and tests).
+#
+# Every statement of a request is recorded on flask.g. After the request:
+#   - the same statement run QUERY_DEBUG_REPEAT+ times with different
+#     parameters is reported as an N+1 suspect (warning log + headers)
+#   - views decorated with @query_budget(n) that ran more than n statements
+#     raise QueryBudgetExceeded under TESTING / QUERY_DEBUG_STRICT (so the test
+#     fails), otherwise log a warning. It's raised from after_request so the
+#     catch-all error handler doesn't turn it into a 500.
+#
+# X-Query-Count / X-Query-Repeats headers show the numbers on every response.
+# Per-process lookups that only run once (e.g. has_fts_table) go through
+# unrecorded(), so a view's count is the same on the first request and later.
+# With QUERY_DEBUG off nothing is hooked and @query_budget is a plain call.
+
+_capture = threading.local()  # count_queries() outside a request
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def record_statement(statement, parameters):
+    if getattr(_capture, "paused", False):
+        return
+    entry = (fingerprint(statement), repr(parameters))
+    log = getattr(_capture, "log", None)
+    if log is not None:
+        log.append(entry)
+    if has_app_context() and "query_log" in g:
+        g.query_log.append(entry)
+
+
+def install_query_recorder(engine):
+    def _record(conn, statement, parameters, context, executemany, elapsed):
+        record_statement(statement, parameters)
+
+    subscribe(engine, _record)
+
+
+def repeated_statements(log, threshold: int) -> dict:
+    """{fingerprint: count} for statements run >= threshold times with varying params."""
+    params = defaultdict(list)
+    for fp, p in log:
+        params[fp].append(p)
+    return {
+        fp: len(ps) for fp, ps in params.items()
+        if len(ps) >= threshold and len(set(ps)) > 1
+    }
+
+
+def budget_failed(message: str):
+    if current_app.testing or current_app.config.get("QUERY_DEBUG_STRICT"):
+        raise QueryBudgetExceeded(message)
+    current_app.logger.warning(message)
+
+
+def query_budget(max_queries: int):
+    """Fail (tests) / warn (dev) when the view runs more than max_queries statements."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            log = g.get("query_log")
+            if log is None:
+                return fn(*args, **kwargs)
+
+            start = len(log)
+            result = fn(*args, **kwargs)
+            used = len(log) - start
+            if used > max_queries:
+                g.query_budget_error = (
+                    f"{request.endpoint} ran {used} queries, budget is {max_queries}:\n  "
+                    + "\n  ".join(fp for fp, _ in log[start:])
+                )
+            return result
+
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def count_queries():
+    """
+    Collect the statements run inside the block (test client calls included).
+
+        with count_queries() as log:
+            client.get("/sessions/mine")
+        assert len(log) <= 4
+    """
+    _capture.log = []
+    try:
+        yield _capture.log
+    finally:
+        del _capture.log
+
+
+@contextmanager
+def unrecorded():
+    """Keep the block's statements (one-off schema introspection) out of query logs and budgets."""
+    paused = getattr(_capture, "paused", False)
+    _capture.paused = True
+    try:
+        yield
+    finally:
+        _capture.paused = paused
+
+
+def register_query_debug(app):
+    if not app.config.get("QUERY_DEBUG"):
+        return
+
+    threshold = app.config.get("QUERY_DEBUG_REPEAT", 3)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            install_query_recorder(engine)
+
+    @app.before_request
+    def start_query_log():
+        g.query_log = []
+
+    @app.after_request
+    def report_queries(response):
+        log = g.pop("query_log", None)
+        if log is None:
+            return response
+
+        repeats = repeated_statements(log, threshold)
+        response.headers["X-Query-Count"] = str(len(log))
+        if repeats:
+            response.headers["X-Query-Repeats"] = str(sum(repeats.values()))
+            for fp, n in repeats.items():
+                app.logger.warning("possible N+1 in %s: %dx %s", request.endpoint, n, fp)
+
+        error = g.pop("query_budget_error", None)
+        if error:
+            budget_failed(error)
+        return response
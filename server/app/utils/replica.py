@@ -0,0 +1,60 @@
+from functools import wraps
+
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+
+# Optional read/write splitting.
+#
+# When SQLALCHEMY_BINDS has a "replica" entry (DATABASE_REPLICA_URL), reads
+# issued while handling a GET/HEAD request go to the replica engine. Anything
+# else uses the primary: non-GET requests, CLI/jobs, flushes, and every
+# statement after the session has written or committed (read-after-write stays
+# on the primary for the rest of the request). No replica configured -> no-op.
+
+REPLICA_BIND = "replica"
+READ_METHODS = {"GET", "HEAD"}
+
+
+class RoutingSession(Session):
+    # db.session is app-context scoped, so this resets every request
+    _use_primary = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+        if bind is None and self._replica_allowed():
+            engines = self._db.engines
+            # only reroute the default bind; explicit __bind_key__ models keep theirs
+            if engine is engines.get(None):
+                return engines[REPLICA_BIND]
+
+        return engine
+
+    def commit(self):
+        self._use_primary = True
+        super().commit()
+
+    def _replica_allowed(self) -> bool:
+        if self._use_primary or REPLICA_BIND not in self._db.engines:
+            return False
+
+        if self._flushing or self.new or self.dirty or self.deleted:
+            self._use_primary = True
+            return False
+
+        return has_request_context() and request.method in READ_METHODS
+
+
+def use_primary():
+    """Pin the current request's reads to the primary (e.g. right after a redirect from a write)."""
+    from ..extensions import db
+    db.session()._use_primary = True
+
+
+def primary_reads(fn):
+    """Route decorator for GET handlers that must never see replica lag."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        use_primary()
+        return fn(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,229 @@
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, or_
+
+from ..extensions import db
+from ..models.user import User
+from ..models.skill import Skill
+from ..models.session_request import SessionRequest
+from ..models.review import Review
+from ..models.rollup import DailyRollup, RollupWatermark
+
+# Daily rollups for admin analytics.
+#
+# update_rollups() folds new rows into daily_rollups in id (or timestamp)
+# batches starting from each source's high-water mark, so a run only touches
+# rows added since the last one. The timeseries endpoint reads daily_rollups only.
+#
+# Ids and timestamps are handed out before commit, so a row can become visible
+# after the watermark moved past it (Postgres sequences vs. commit order). A
+# watermark only advances to rows stamped ROLLUP_SAFETY_LAG seconds ago or
+# earlier: anything with a lower id or timestamp has committed by then, as long
+# as no transaction stays open longer than the lag.
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_SAFETY_LAG = 300
+
+# source -> (model, metric, summed column)
+ID_SOURCES = {
+    "users": (User, "users.new", None),
+    "skills": (Skill, "skills.new", None),
+    "requests": (SessionRequest, "requests.new", None),
+    "reviews": (Review, "reviews.new", Review.rating),
+}
+
+RESPONDED_SOURCE = "requests.responded"
+RESPONDED_STATUSES = ("accepted", "declined", "cancelled", "completed")
+
+# metric -> (stored metric, how to read it)
+METRICS = {
+    "users.new": ("users.new", "count"),
+    "skills.new": ("skills.new", "count"),
+    "requests.new": ("requests.new", "count"),
+    **{f"requests.{s}": (f"requests.{s}", "count") for s in RESPONDED_STATUSES},
+    "reviews.new": ("reviews.new", "count"),
+    "reviews.avg_rating": ("reviews.new", "avg"),
+}
+
+
+def as_date(value):
+    # SQLite's date() hands back a string, Postgres a date
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def get_watermark(source: str) -> RollupWatermark:
+    wm = db.session.get(RollupWatermark, source)
+    if wm is None:
+        wm = RollupWatermark(source=source)
+        db.session.add(wm)
+    return wm
+
+
+def bump(metric: str, day, count: int, total: float = 0):
+    row = db.session.get(DailyRollup, (metric, day))
+    if row is None:
+        row = DailyRollup(metric=metric, day=day, count=0, total=0)
+        db.session.add(row)
+    row.count += count
+    row.total += total or 0
+
+
+def safety_cutoff() -> datetime:
+    lag = current_app.config.get("ROLLUP_SAFETY_LAG", DEFAULT_SAFETY_LAG)
+    return datetime.utcnow() - timedelta(seconds=lag)
+
+
+def roll_id_source(source: str, batch_size: int) -> int:
+    """Fold rows with id above the watermark into daily counts. Returns rows processed."""
+    model, metric, value_col = ID_SOURCES[source]
+    wm = get_watermark(source)
+    cutoff = safety_cutoff()
+    processed = 0
+
+    while True:
+        lo = wm.last_id or 0
+
+        # upper bound of this batch, straight off the PK index
+        hi = (
+            db.session.query(model.id)
+            .filter(model.id > lo)
+            .order_by(model.id)
+            .offset(batch_size - 1)
+            .limit(1)
+            .scalar()
+        )
+        if hi is None:
+            hi = db.session.query(func.max(model.id)).filter(model.id > lo).scalar()
+        if hi is None:
+            break
+
+        # stop at the last row old enough that every lower id has committed
+        hi = (
+            db.session.query(func.max(model.id))
+            .filter(
+                model.id > lo,
+                model.id <= hi,
+                or_(model.created_at <= cutoff, model.created_at.is_(None)),
+            )
+            .scalar()
+        )
+        if hi is None:
+            break
+
+        day_col = func.date(model.created_at)
+        cols = [day_col, func.count(model.id)]
+        if value_col is not None:
+            cols.append(func.sum(value_col))
+
+        rows = (
+            db.session.query(*cols)
+            .filter(model.id > lo, model.id <= hi)
+            .group_by(day_col)
+            .all()
+        )
+        for row in rows:
+            day = as_date(row[0])
+            if day is None:
+                continue
+            bump(metric, day, row[1], row[2] if value_col is not None else 0)
+            processed += row[1]
+
+        wm.last_id = hi
+        db.session.commit()
+
+    return processed
+
+
+def roll_responded(batch_size: int) -> int:
+    """
+    Count status transitions by the day they happened.
+
+    responded_at is overwritten on every transition, so a request that moves
+    twice between two runs only counts its latest status; run the job often.
+    """
+    wm = get_watermark(RESPONDED_SOURCE)
+    cutoff = safety_cutoff()
+    processed = 0
+
+    while True:
+        query = SessionRequest.query.filter(
+            SessionRequest.responded_at <= cutoff,
+            SessionRequest.status.in_(RESPONDED_STATUSES),
+        )
+        if wm.last_ts is not None:
+            query = query.filter(SessionRequest.responded_at > wm.last_ts)
+
+        hi = (
+            query.with_entities(SessionRequest.responded_at)
+            .order_by(SessionRequest.responded_at)
+            .offset(batch_size - 1)
+            .limit(1)
+            .scalar()
+        )
+        if hi is None:
+            hi = query.with_entities(func.max(SessionRequest.responded_at)).scalar()
+        if hi is None:
+            break
+
+        day_col = func.date(SessionRequest.responded_at)
+        rows = (
+            query.filter(SessionRequest.responded_at <= hi)
+            .with_entities(day_col, SessionRequest.status, func.count(SessionRequest.id))
+            .group_by(day_col, SessionRequest.status)
+            .all()
+        )
+        for day, status, count in rows:
+            bump(f"requests.{status}", as_date(day), count)
+            processed += count
+
+        wm.last_ts = hi
+        db.session.commit()
+
+    return processed
+
+
+def update_rollups(batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    batch_size = max(int(batch_size), 1)
+    stats = {source: roll_id_source(source, batch_size) for source in ID_SOURCES}
+    stats[RESPONDED_SOURCE] = roll_responded(batch_size)
+    return stats
+
+
+def timeseries(metric: str, start: date, end: date, bucket: str = "day"):
+    """Points for [start, end] bucketed by day or ISO week (keyed by Monday)."""
+    stored, kind = METRICS[metric]
+
+    rows = (
+        DailyRollup.query
+        .filter(DailyRollup.metric == stored, DailyRollup.day >= start, DailyRollup.day <= end)
+        .all()
+    )
+    by_day = {r.day: (r.count, r.total) for r in rows}
+
+    buckets = {}
+    day = start
+    while day <= end:
+        key = day if bucket == "day" else day - timedelta(days=day.weekday())
+        count, total = by_day.get(day, (0, 0))
+        acc = buckets.setdefault(key, [0, 0])
+        acc[0] += count
+        acc[1] += total
+        day += timedelta(days=1)
+
+    points = []
+    for key in sorted(buckets):
+        count, total = buckets[key]
+        if kind == "avg":
+            value = round(total / count, 2) if count else None
+        else:
+            value = count
+        points.append({"date": key.isoformat(), "value": value, "count": count})
+
+    return points
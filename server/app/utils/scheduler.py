@@ -0,0 +1,280 @@
+import json
+import os
+import random
+import signal
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from ..extensions import db
+from ..models.job import JobRun, ScheduledJob
+
+# Periodic jobs (`flask jobs run`).
+#
+# Jobs are registered in app/jobs.py with a cron expression (UTC):
+#
+#     @scheduler.job("*/15 * * * *", jitter=60)
+#     def expire_slots(): ...
+#
+# Any number of `flask jobs run` processes can be up. Each job has a row in
+# scheduled_jobs with its next_run_at; a scheduler runs a due job only after
+# winning its lease with one conditional UPDATE (next_run_at <= now and no
+# live lease), so each due run happens on exactly one instance. A crashed
+# instance's lease lapses after the job's timeout and the run is picked up
+# again. next_run_at gets a random 0..jitter seconds added so jobs sharing a
+# schedule don't all hit the database on the same second.
+#
+# Every run is recorded in job_runs (status, duration, error/result).
+
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),  # 0 = Sunday (7 is accepted too)
+)
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+
+class Cron:
+    """5-field cron expression: minute hour day month weekday (*, a-b, */n, a-b/n, lists)."""
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        fields = CRON_ALIASES.get(expr.strip(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+
+        self.sets = {}
+        for text, (name, lo, hi) in zip(fields, CRON_FIELDS):
+            self.sets[name] = self.parse_field(text, name, lo, hi)
+        if 7 in self.sets["weekday"]:
+            self.sets["weekday"] = (self.sets["weekday"] - {7}) | {0}
+
+        # cron: when both day and weekday are restricted, either may match
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def parse_field(text, name, lo, hi) -> set:
+        hi_allowed = 7 if name == "weekday" else hi
+        values = set()
+        for part in text.split(","):
+            rng, _, step = part.partition("/")
+            step = int(step) if step else 1
+            if rng == "*":
+                start, end = lo, hi
+            elif "-" in rng:
+                start, end = (int(v) for v in rng.split("-", 1))
+            else:
+                start = end = int(rng)
+                if step > 1:
+                    end = hi
+            if not (lo <= start <= end <= hi_allowed) or step < 1:
+                raise ValueError(f"bad cron {name} field: {text!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def day_matches(self, dt) -> bool:
+        day_ok = dt.day in self.sets["day"]
+        weekday_ok = (dt.isoweekday() % 7) in self.sets["weekday"]
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        """First matching minute strictly after dt."""
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.sets["month"]:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self.day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.sets["hour"]:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.sets["minute"]:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"cron expression never matches: {self.expr!r}")
+
+
+class Job:
+    def __init__(self, name, fn, schedule, jitter, timeout):
+        self.name = name
+        self.fn = fn
+        self.cron = Cron(schedule)
+        self.jitter = jitter
+        self.timeout = timeout
+
+    def next_run(self, after: datetime) -> datetime:
+        return self.cron.next_after(after) + timedelta(seconds=random.uniform(0, self.jitter))
+
+
+def instance_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"[:100]
+
+
+class Scheduler:
+    def __init__(self):
+        self.jobs = {}
+        self.instance = instance_name()
+        self._stop = threading.Event()
+
+    def job(self, schedule: str, name=None, jitter: float = 30, timeout: float = 600):
+        """Register fn to run on `schedule`; its return value (JSON-able) goes into job_runs."""
+        def decorator(fn):
+            job = Job(name or fn.__name__, fn, schedule, jitter, timeout)
+            if job.name in self.jobs:
+                raise ValueError(f"job {job.name!r} is registered twice")
+            self.jobs[job.name] = job
+            return fn
+        return decorator
+
+    # --- database state ---
+
+    def sync(self):
+        """Create rows for new jobs and reschedule ones whose cron changed."""
+        now = datetime.utcnow()
+        rows = {r.name: r for r in db.session.execute(select(ScheduledJob)).scalars()}
+
+        for job in self.jobs.values():
+            row = rows.get(job.name)
+            if row is None:
+                db.session.add(ScheduledJob(name=job.name, schedule=job.cron.expr, next_run_at=job.next_run(now)))
+            elif row.schedule != job.cron.expr:
+                row.schedule = job.cron.expr
+                row.next_run_at = job.next_run(now)
+
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # another instance synced the same new job first
+            db.session.rollback()
+
+    def claim(self, job: Job, now: datetime, force: bool = False) -> bool:
+        """Take the job's lease if it's due (or `force`) and nobody holds it."""
+        cond = [
+            ScheduledJob.name == job.name,
+            or_(ScheduledJob.locked_until.is_(None), ScheduledJob.locked_until < now),
+        ]
+        if not force:
+            cond.append(ScheduledJob.next_run_at <= now)
+
+        result = db.session.execute(
+            update(ScheduledJob)
+            .where(*cond)
+            .values(locked_by=self.instance, locked_until=now + timedelta(seconds=job.timeout))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def run_job(self, job: Job, force: bool = False):
+        """Claim and run one job; returns the JobRun, or None if it wasn't ours to run."""
+        if not self.claim(job, datetime.utcnow(), force=force):
+            return None
+
+        started = datetime.utcnow()
+        t0 = time.perf_counter()
+        status, error, result = "ok", None, None
+        try:
+            result = job.fn()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            status, error = "error", traceback.format_exc()
+            current_app.logger.error("job %s failed:\n%s", job.name, error)
+        duration_ms = (time.perf_counter() - t0) * 1000
+
+        finished = datetime.utcnow()
+        run = JobRun(
+            name=job.name,
+            instance=self.instance,
+            status=status,
+            error=error,
+            result=json.dumps(result, default=str) if result is not None else None,
+            started_at=started,
+            duration_ms=round(duration_ms, 2),
+        )
+        db.session.add(run)
+        db.session.execute(
+            update(ScheduledJob)
+            .where(ScheduledJob.name == job.name, ScheduledJob.locked_by == self.instance)
+            .values(
+                next_run_at=job.next_run(finished),
+                locked_by=None,
+                locked_until=None,
+                last_run_at=started,
+                last_status=status,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return run
+
+    def due(self) -> list:
+        now = datetime.utcnow()
+        names = db.session.execute(
+            select(ScheduledJob.name).where(
+                ScheduledJob.next_run_at <= now,
+                or_(ScheduledJob.locked_until.is_(None), ScheduledJob.locked_until < now),
+            )
+        ).scalars().all()
+        db.session.rollback()  # don't hold the read snapshot while jobs run
+        return [self.jobs[n] for n in names if n in self.jobs]
+
+    # --- loop ---
+
+    def run_forever(self, app, tick: float = 5, threads: int = 2):
+        def run_in_context(job):
+            with app.app_context():
+                try:
+                    self.run_job(job)
+                except SQLAlchemyError as e:
+                    app.logger.warning("job %s: lease/bookkeeping failed: %s", job.name, e)
+
+        def stop(signum, frame):
+            self._stop.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        with app.app_context():
+            self.sync()
+
+        running = {}
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="job") as pool:
+            while not self._stop.is_set():
+                running = {name: f for name, f in running.items() if not f.done()}
+                try:
+                    with app.app_context():
+                        due = self.due()
+                except SQLAlchemyError as e:
+                    app.logger.warning("scheduler tick failed: %s", e)
+                    due = []
+
+                for job in due:
+                    if job.name not in running:
+                        running[job.name] = pool.submit(run_in_context, job)
+
+                # small random offset so instances don't poll in lockstep
+                self._stop.wait(tick + random.uniform(0, tick / 5))
+            # leaving the with-block waits for jobs in flight
+
+
+scheduler = Scheduler()
@@ -0,0 +1,115 @@
+import re
+
+from sqlalchemy import and_, or_, select, inspect, literal_column, table, column
+
+from ..extensions import db
+from .query_budget import unrecorded
+
+# Admin search box syntax:
+#   "42" / "#42"            -> exact primary/foreign key lookup (index hit)
+#   "email:bob status:open" -> field:value targets one column
+#   anything else           -> free text, indexed text search
+#
+# Free text uses the FTS5 trigram tables on SQLite and ILIKE on Postgres
+# (backed by pg_trgm GIN indexes), see the admin_search_indexes migration.
+
+TOKEN_RE = re.compile(r'(?:(\w+):)?("[^"]*"|\S+)')
+
+# trigram indexes can't answer anything shorter than one trigram
+MIN_TRIGRAM_LEN = 3
+
+_fts_tables = {}
+
+
+def parse_search(q: str, field_names):
+    """Split a search string into ({field: [values]}, free_text)."""
+    fields = {}
+    terms = []
+
+    for m in TOKEN_RE.finditer(q or ""):
+        field = (m.group(1) or "").lower()
+        value = m.group(2).strip('"').strip()
+        if not value:
+            continue
+
+        if field in field_names:
+            fields.setdefault(field, []).append(value)
+        else:
+            # unknown "foo:bar" is just text
+            terms.append(m.group(0).replace('"', ""))
+
+    return fields, " ".join(terms).strip()
+
+
+def parse_id(value: str):
+    value = value.strip().lstrip("#")
+    return int(value) if value.isdigit() else None
+
+
+def has_fts_table(name: str) -> bool:
+    engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return False
+
+    key = (engine.url.render_as_string(hide_password=False), name)
+    if key not in _fts_tables:
+        with unrecorded():  # once per process, not the view's own work
+            _fts_tables[key] = inspect(engine).has_table(name)
+    return _fts_tables[key]
+
+
+def text_search(model, columns, term: str, fts_table: str = None):
+    """Substring match on `columns` that can use an index."""
+    if fts_table and len(term) >= MIN_TRIGRAM_LEN and has_fts_table(fts_table):
+        names = " ".join(c.key for c in columns)
+        phrase = '"' + term.replace('"', '""') + '"'
+
+        fts = table(fts_table, column("rowid"))
+        match = literal_column(fts_table).op("MATCH")(f"{{{names}}} : {phrase}")
+        return model.id.in_(select(fts.c.rowid).where(match))
+
+    like = f"%{term}%"
+    return or_(*[c.ilike(like) for c in columns])
+
+
+def build_search_filter(q: str, *, model, id_columns, fields, text_columns, fts_table=None):
+    """
+    Turn an admin search string into a single SQL filter.
+
+    fields maps a field name to (kind, [columns]) where kind is:
+      - "id":    exact integer match on any of the columns
+      - "exact": case-insensitive equality (values are stored lowercase)
+      - "text":  text_search over the columns
+
+    Returns (clause | None, error) like parse_pagination.
+    """
+    q = (q or "").strip()
+    if not q:
+        return None, None
+
+    n = parse_id(q)
+    if n is not None:
+        return or_(*[c == n for c in id_columns]), None
+
+    parsed, free_text = parse_search(q, fields)
+    clauses = []
+
+    for name, values in parsed.items():
+        kind, cols = fields[name]
+        for value in values:
+            if kind == "id":
+                n = parse_id(value)
+                if n is None:
+                    return None, ({"error": f"'{name}:' expects a numeric id."}, 400)
+                clauses.append(or_(*[c == n for c in cols]))
+            elif kind == "exact":
+                clauses.append(or_(*[c == value.lower() for c in cols]))
+            else:
+                clauses.append(text_search(model, cols, value, fts_table))
+
+    if free_text:
+        clauses.append(text_search(model, text_columns, free_text, fts_table))
+
+    if not clauses:
+        return None, None
+    return and_(*clauses), None
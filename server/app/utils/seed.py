@@ -0,0 +1,298 @@
+import random
+import time
+from array import array
+from datetime import datetime, timedelta
+
+import bcrypt
+from sqlalchemy import func, select
+
+from ..extensions import db, cache
+from ..models.user import User
+from ..models.skill import Skill
+from ..models.session_request import SessionRequest
+from ..models.availabililty import Availability
+from ..models.review import Review
+from ..models.notification import Notification
+from .invalidation import bump_tag_version
+
+# Synthetic data for scale testing (`flask seed`).
+#
+# Everything is derived from one random.Random(seed) and a fixed epoch, and ids
+# are assigned explicitly from the current max(id) up, so the same command on
+# an empty database produces the same rows on any machine. Rows are generated
+# lazily and written with executemany in batches; memory stays flat at 1M+
+# rows. Skill ownership and popularity are skewed (a few users own many
+# skills, a few skills get most requests) like real catalogs.
+
+TOPICS = [
+    "guitar", "piano", "drums", "singing", "music theory", "python", "javascript",
+    "react", "sql", "excel", "data analysis", "machine learning", "photography",
+    "video editing", "graphic design", "figma", "drawing", "watercolor", "pottery",
+    "knitting", "sewing", "cooking", "baking", "coffee brewing", "spanish", "french",
+    "japanese", "german", "public speaking", "resume writing", "interviewing",
+    "chess", "yoga", "running", "climbing", "swimming", "calculus", "statistics",
+    "physics", "chemistry", "essay writing", "poetry", "woodworking", "bike repair",
+]
+
+TITLE_TEMPLATES = [
+    "Intro to {t}", "{T} for beginners", "Intermediate {t}", "{T} study buddy",
+    "Help with {t} homework", "Weekend {t} sessions", "{T} practice partner",
+    "Advanced {t} tips", "Learn {t} from scratch", "{T} crash course",
+]
+
+SENTENCES = [
+    "I've been doing this for a few years and love teaching it.",
+    "Happy to meet on campus or over video.",
+    "Looking for someone patient who can explain the basics.",
+    "We can go at whatever pace works for you.",
+    "Bring your own questions and we'll work through them together.",
+    "I learn best with hands-on practice.",
+    "Evenings and weekends work best for me.",
+    "I can share notes and practice material afterwards.",
+    "Total beginners welcome.",
+    "I'd like to trade this for help with something else.",
+]
+
+FIRST_NAMES = [
+    "Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery",
+    "Quinn", "Maria", "Wei", "Aisha", "Diego", "Priya", "Noah", "Emma", "Liam", "Olivia",
+    "Mateo", "Yuki", "Fatima", "Lucas", "Chloe", "Omar", "Sofia", "Ethan", "Zoe",
+]
+LAST_NAMES = [
+    "Smith", "Garcia", "Nguyen", "Patel", "Kim", "Johnson", "Lopez", "Brown", "Chen",
+    "Martinez", "Davis", "Wilson", "Anderson", "Thomas", "Moore", "Lee", "Clark", "Hall",
+]
+
+TIMEZONES = ["America/Denver", "America/New_York", "America/Los_Angeles", "America/Chicago"]
+
+# status mix of session requests (weights)
+STATUS_WEIGHTS = {"pending": 25, "accepted": 25, "declined": 15, "cancelled": 10, "completed": 25}
+
+DEFAULT_EPOCH = datetime(2026, 1, 1)
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def next_id(model) -> int:
+    return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def skewed(rng, n: int) -> int:
+    """0..n-1, biased toward low values (roughly power-law)."""
+    return min(int(n * rng.random() ** 2.5), n - 1)
+
+
+class Seeder:
+    def __init__(self, seed=42, epoch=DEFAULT_EPOCH, days=180, batch_size=5000, password="password", echo=print):
+        self.rng = random.Random(seed)
+        self.epoch = epoch
+        self.days = days
+        self.batch_size = batch_size
+        self.echo = echo
+        # one bcrypt hash shared by every seeded account (hashing per row would dominate)
+        self.password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+    def at(self, max_days=None) -> datetime:
+        span = (max_days or self.days) * 86400
+        return self.epoch + timedelta(seconds=self.rng.randrange(span))
+
+    def write(self, model, rows, after_batch=None) -> int:
+        """Batched executemany inserts, one commit per batch."""
+        table = model.__table__
+        total = 0
+        t0 = time.perf_counter()
+
+        for batch in batched(rows, self.batch_size):
+            db.session.execute(table.insert(), batch)
+            if after_batch:
+                after_batch()
+            db.session.commit()
+            total += len(batch)
+
+        elapsed = time.perf_counter() - t0
+        self.echo(f"{table.name}: {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+        return total
+
+    # --- generators ---
+
+    def users(self, first_id, n, admins):
+        rng = self.rng
+        for i in range(n):
+            uid = first_id + i
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            yield {
+                "id": uid,
+                "name": name,
+                "email": f"user{uid}@seed.skillswap.test",
+                "password_hash": self.password_hash,
+                "is_active": rng.random() > 0.02,
+                "role": "admin" if i < admins else "student",
+                "bio": rng.choice(SENTENCES) if rng.random() < 0.4 else None,
+                "created_at": self.at(),
+            }
+
+    def skills(self, first_id, n, first_user, users):
+        rng = self.rng
+        for i in range(n):
+            topic = rng.choice(TOPICS)
+            extra = rng.sample(TOPICS, rng.randint(0, 2))
+            yield {
+                "id": first_id + i,
+                "user_id": first_user + skewed(rng, users),
+                "type": "offer" if rng.random() < 0.6 else "seek",
+                "title": rng.choice(TITLE_TEMPLATES).format(t=topic, T=topic.capitalize())[:120],
+                "description": " ".join(rng.sample(SENTENCES, rng.randint(1, 4))),
+                "tags": ",".join(dict.fromkeys([topic] + extra)),
+                "visibility": "public" if rng.random() < 0.9 else "private",
+                "created_at": self.at(),
+            }
+
+    def requests(self, first_id, n, first_user, users, skill_ids, skill_owners):
+        """Yields (request_row, notification_rows, review_rows)."""
+        rng = self.rng
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+
+        for i in range(n):
+            rid = first_id + i
+            pick = skewed(rng, len(skill_ids))
+            skill_id, provider_id = skill_ids[pick], skill_owners[pick]
+            requester_id = first_user + rng.randrange(users)
+            if requester_id == provider_id:
+                requester_id = first_user + (requester_id - first_user + 1) % users
+
+            status = rng.choices(statuses, weights)[0]
+            created = self.at()
+            responded = created + timedelta(hours=rng.randint(1, 72)) if status != "pending" else None
+
+            schedule_status, start, end, tz = "none", None, None, None
+            if status in ("accepted", "completed"):
+                schedule_status = "confirmed" if status == "completed" else rng.choice(["none", "proposed", "confirmed"])
+                if schedule_status != "none":
+                    start = created + timedelta(days=rng.randint(1, 14), hours=rng.randint(8, 20))
+                    end = start + timedelta(hours=1)
+                    tz = rng.choice(TIMEZONES)
+
+            req = {
+                "id": rid,
+                "requester_id": requester_id,
+                "provider_id": provider_id,
+                "skill_id": skill_id,
+                "message": rng.choice(SENTENCES) if rng.random() < 0.7 else None,
+                "status": status,
+                "schedule_status": schedule_status,
+                "scheduled_start": start,
+                "scheduled_end": end,
+                "timezone": tz,
+                "created_at": created,
+                "responded_at": responded,
+            }
+
+            notes = [self.notification(provider_id, "session_requested", "New session request", rid, skill_id, created)]
+            if responded:
+                notes.append(self.notification(
+                    requester_id, f"session_{status}", f"Your session request was {status}", rid, skill_id, responded,
+                ))
+
+            reviews = []
+            if status == "completed":
+                for frm, to, p in ((requester_id, provider_id, 0.7), (provider_id, requester_id, 0.4)):
+                    if rng.random() < p:
+                        reviews.append({
+                            "session_request_id": rid,
+                            "from_user_id": frm,
+                            "to_user_id": to,
+                            "rating": rng.choices([1, 2, 3, 4, 5], [2, 3, 10, 35, 50])[0],
+                            "comment": rng.choice(SENTENCES) if rng.random() < 0.5 else None,
+                            "created_at": end + timedelta(hours=rng.randint(1, 48)),
+                        })
+
+            yield req, notes, reviews
+
+    def notification(self, user_id, ntype, title, request_id, skill_id, at):
+        return {
+            "user_id": user_id,
+            "type": ntype,
+            "title": title,
+            "body": None,
+            "session_request_id": request_id,
+            "skill_id": skill_id,
+            "is_read": self.rng.random() < 0.7,
+            "created_at": at,
+        }
+
+    def slots(self, n, first_user, users):
+        rng = self.rng
+        for _ in range(n):
+            start = self.at().replace(minute=0, second=0) + timedelta(hours=rng.randint(0, 12))
+            yield {
+                "user_id": first_user + skewed(rng, users),
+                "start_time": start,
+                "end_time": start + timedelta(hours=rng.choice([1, 1, 2])),
+                "timezone": rng.choice(TIMEZONES),
+                "is_active": rng.random() < 0.85,
+                "created_at": start - timedelta(days=rng.randint(1, 14)),
+            }
+
+    # --- driver ---
+
+    def run(self, users, skills, requests, slots, admins=1) -> dict:
+        first_user = next_id(User)
+        first_skill = next_id(Skill)
+        first_request = next_id(SessionRequest)
+
+        stats = {"users": self.write(User, self.users(first_user, users, admins))}
+        stats["skills"] = self.write(Skill, self.skills(first_skill, skills, first_user, users))
+
+        # public skills and their owners, in id order: requests pick from these
+        skill_ids, skill_owners = array("q"), array("q")
+        rows = db.session.execute(
+            select(Skill.id, Skill.user_id)
+            .where(Skill.id >= first_skill, Skill.visibility == "public")
+            .order_by(Skill.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        for sid, owner in rows:
+            skill_ids.append(sid)
+            skill_owners.append(owner)
+
+        notes, reviews = [], []
+        stats["notifications"] = stats["reviews"] = 0
+
+        def request_rows():
+            for req, n, r in self.requests(first_request, requests, first_user, users, skill_ids, skill_owners):
+                notes.extend(n)
+                reviews.extend(r)
+                yield req
+
+        def write_dependents():
+            # reviews reference session_requests: written right after their batch
+            if notes:
+                db.session.execute(Notification.__table__.insert(), notes)
+                stats["notifications"] += len(notes)
+                notes.clear()
+            if reviews:
+                db.session.execute(Review.__table__.insert(), reviews)
+                stats["reviews"] += len(reviews)
+                reviews.clear()
+
+        stats["session_requests"] = (
+            self.write(SessionRequest, request_rows(), after_batch=write_dependents) if skill_ids else 0
+        )
+        self.echo(f"notifications: {stats['notifications']} rows, reviews: {stats['reviews']} rows")
+        stats["availability"] = self.write(Availability, self.slots(slots, first_user, users))
+
+        # anything cached before the seed is now wrong
+        bump_tag_version("skills")
+        db.session.commit()
+        cache.invalidate("skills", "users", "sessions", "notifications")
+        return stats
@@ -0,0 +1,52 @@
+import threading
+
+# Single-flight: concurrent callers asking for the same key share one
+# computation. The first caller runs fn; the others block until it finishes
+# and get its result (or its exception). Nothing is remembered afterwards,
+# that's the cache's job.
+#
+# Only threads within one worker coalesce here; cache.get_or_set(coalesce=True)
+# adds a lock in the shared cache backend so workers coalesce too.
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self.coalesced = 0  # callers that waited instead of computing
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
@@ -0,0 +1,158 @@
+import logging
+import re
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import has_request_context, request
+
+from ..extensions import db
+from .json_provider import dumps_bytes
+from .statement_timer import subscribe
+
+# Slow-query log.
+#
+# Every statement whose cursor.execute takes at least SLOW_QUERY_MS is recorded
+# with its SQL, a grouping fingerprint, the parameter *types* (values can be
+# emails/messages, so they're never kept), the route that issued it and, for
+# SELECTs, the plan (EXPLAIN QUERY PLAN on SQLite, EXPLAIN on Postgres).
+#
+# Records go to a per-worker ring buffer (GET /admin/slow-queries) and to the
+# "app.slow_queries" logger as one JSON object per line. Bulk CLI work (`flask
+# seed`) runs under slow_queries.paused(): every batch there is slow on purpose.
+#
+# On Postgres a failing EXPLAIN would abort the request's transaction, so it
+# runs inside a savepoint that's rolled back on error.
+
+logger = logging.getLogger("app.slow_queries")
+
+WHITESPACE_RE = re.compile(r"\s+")
+IN_LIST_RE = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))+\s*\)")
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+
+
+class SlowQueryLog:
+    def __init__(self, size: int = 200):
+        self._records = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def paused(self):
+        """Don't record statements run by this thread inside the block."""
+        self._local.paused = True
+        try:
+            yield
+        finally:
+            self._local.paused = False
+
+    def is_paused(self) -> bool:
+        return getattr(self._local, "paused", False)
+
+    def add(self, record: dict):
+        with self._lock:
+            self._records.append(record)
+
+    def recent(self, limit: int = None) -> list:
+        with self._lock:
+            records = list(self._records)
+        records.reverse()  # newest first
+        return records[:limit] if limit else records
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def resize(self, size: int):
+        with self._lock:
+            self._records = deque(self._records, maxlen=size)
+
+
+slow_queries = SlowQueryLog()
+
+
+def fingerprint(statement: str) -> str:
+    """SQL with whitespace collapsed and IN (...) lists folded, for grouping."""
+    sql = WHITESPACE_RE.sub(" ", statement).strip()
+    return IN_LIST_RE.sub("(...)", sql)
+
+
+def param_types(parameters):
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]
+    return None
+
+
+def route_info():
+    if not has_request_context():
+        return None
+    return {"method": request.method, "endpoint": request.endpoint, "path": request.path}
+
+
+def explain(conn, statement, parameters):
+    prefix = EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+
+    # straight on the DBAPI connection: no engine events, so no recursion
+    fenced = conn.dialect.name == "postgresql"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if fenced:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if fenced:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        finally:
+            if fenced:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    except Exception as e:  # the plan is best-effort; never break the query
+        return f"EXPLAIN failed: {e}"
+    finally:
+        cursor.close()
+
+    if conn.dialect.name == "sqlite":
+        # (id, parent, notused, detail) -> "detail" lines, e.g. "SCAN users"
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def install_slow_query_log(engine, threshold_ms: float, with_explain: bool):
+    def check(conn, statement, parameters, context, executemany, elapsed):
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms < threshold_ms or slow_queries.is_paused():
+            return
+
+        record = {
+            "at": datetime.utcnow(),
+            "duration_ms": round(elapsed_ms, 2),
+            "statement": statement,
+            "fingerprint": fingerprint(statement),
+            "params": None if executemany else param_types(parameters),
+            "executemany": executemany,
+            "route": route_info(),
+            "plan": explain(conn, statement, parameters) if with_explain and not executemany else None,
+        }
+        slow_queries.add(record)
+        logger.warning(dumps_bytes({"event": "slow_query", **record}).decode("utf-8"))
+
+    subscribe(engine, check)
+
+
+def register_slow_query_log(app):
+    threshold = app.config.get("SLOW_QUERY_MS")
+    if threshold is None or threshold < 0:
+        return
+
+    slow_queries.resize(app.config.get("SLOW_QUERY_BUFFER", 200))
+
+    with app.app_context():
+        for engine in db.engines.values():
+            install_slow_query_log(engine, threshold, app.config.get("SLOW_QUERY_EXPLAIN", True))
@@ -0,0 +1,39 @@
+import time
+import weakref
+
+from sqlalchemy import event
+
+# One timer around every SQL statement, shared by metrics, the slow-query log,
+# query debugging and the profiler.
+#
+#     subscribe(engine, fn)   # fn(conn, statement, parameters, context, executemany, elapsed)
+#
+# The first subscriber on an engine installs a single before/after
+# cursor_execute pair; every subscriber is then called with the elapsed
+# seconds after each statement. The start time is one slot in conn.info, not a
+# stack: a statement that errors never reaches "after", and the next
+# statement simply overwrites its start.
+
+_subscribers = weakref.WeakKeyDictionary()  # engine -> [fn]
+
+
+def _start(conn, cursor, statement, parameters, context, executemany):
+    conn.info["statement_start"] = time.perf_counter()
+
+
+def _stop(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("statement_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    for fn in _subscribers.get(conn.engine, ()):
+        fn(conn, statement, parameters, context, executemany, elapsed)
+
+
+def subscribe(engine, fn):
+    fns = _subscribers.get(engine)
+    if fns is None:
+        fns = _subscribers[engine] = []
+        event.listen(engine, "before_cursor_execute", _start)
+        event.listen(engine, "after_cursor_execute", _stop)
+    fns.append(fn)
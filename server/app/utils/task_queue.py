@@ -0,0 +1,217 @@
+import json
+import multiprocessing
+import random
+import signal
+import threading
+import traceback
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..extensions import db
+from ..models.task import Task
+from .scheduler import instance_name
+
+# Background tasks stored in the app database (`flask tasks work`).
+#
+#     @task_queue.task(max_attempts=5)
+#     def create_notification(user_id, ...): ...
+#
+#     create_notification.delay(user_id, ...)   # in a request
+#
+# delay() adds a tasks row to the current session, so the task is committed
+# (or rolled back) together with the request's own writes. Workers claim
+# batches with one UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)
+# RETURNING; on SQLite FOR UPDATE compiles away and the single-writer lock
+# makes the same UPDATE an atomic claim. A claimed task is invisible for
+# TASKS_VISIBILITY_TIMEOUT seconds; if its worker dies it's handed out again,
+# so delivery is at-least-once and tasks should be idempotent. Failures retry
+# with exponential backoff (with jitter) until max_attempts, then go "dead".
+#
+# TASKS_EAGER=true (the default, for setups without a worker) runs delay()
+# inline in the caller's transaction instead.
+
+BACKOFF_CAP = 3600
+
+
+class TaskFunction:
+    def __init__(self, queue, fn, name, max_attempts, backoff):
+        self.queue = queue
+        self.fn = fn
+        self.name = name
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        wraps(fn)(self)
+
+    def __call__(self, *args, **kwargs):
+        return self.fn(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        """Queue a run (committed with the current transaction); runs inline under TASKS_EAGER."""
+        payload = json.dumps({"args": args, "kwargs": kwargs}, default=str)
+        if current_app.config.get("TASKS_EAGER", True):
+            return self.fn(*args, **kwargs)
+
+        db.session.add(Task(name=self.name, payload=payload, max_attempts=self.max_attempts))
+
+    def retry_in(self, attempts: int) -> float:
+        base = min(self.backoff * 2 ** max(attempts - 1, 0), BACKOFF_CAP)
+        return base * random.uniform(0.5, 1.5)
+
+
+class TaskQueue:
+    def __init__(self):
+        self.tasks = {}
+        self.instance = instance_name()
+        self._stop = threading.Event()
+
+    def task(self, name=None, max_attempts: int = 5, backoff: float = 10):
+        def decorator(fn):
+            t = TaskFunction(self, fn, name or fn.__name__, max_attempts, backoff)
+            if t.name in self.tasks:
+                raise ValueError(f"task {t.name!r} is registered twice")
+            self.tasks[t.name] = t
+            return t
+        return decorator
+
+    # --- worker side ---
+
+    def claim(self, limit: int, worker: str) -> list:
+        now = datetime.utcnow()
+        until = now + timedelta(seconds=current_app.config.get("TASKS_VISIBILITY_TIMEOUT", 300))
+        ready = or_(
+            and_(Task.status == "queued", Task.run_at <= now),
+            and_(Task.status == "running", Task.locked_until < now),  # worker died
+        )
+        ids = (
+            select(Task.id)
+            .where(ready)
+            .order_by(Task.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        tasks = Task.__table__
+        rows = db.session.execute(
+            tasks.update()
+            .where(tasks.c.id.in_(ids.scalar_subquery()), ready)
+            .values(status="running", locked_by=worker, locked_until=until, attempts=tasks.c.attempts + 1)
+            .returning(tasks.c.id, tasks.c.name, tasks.c.payload, tasks.c.attempts, tasks.c.max_attempts)
+        ).all()
+        db.session.commit()
+        return rows
+
+    def finish(self, task_id: int, worker: str, **values):
+        tasks = Task.__table__
+        db.session.execute(
+            tasks.update().where(tasks.c.id == task_id, tasks.c.locked_by == worker).values(**values)
+        )
+        db.session.commit()
+
+    def execute(self, row, worker: str) -> str:
+        """Run one claimed task; returns its new status."""
+        t = self.tasks.get(row.name)
+        try:
+            if t is None:
+                raise LookupError(f"no task registered as {row.name!r} on this worker")
+            if row.attempts > row.max_attempts:
+                raise RuntimeError("visibility timeout expired on every attempt")
+            payload = json.loads(row.payload)
+            t.fn(*payload["args"], **payload["kwargs"])
+            # the task's own writes commit together with its "done" mark
+            self.finish(row.id, worker, status="done", finished_at=datetime.utcnow(), locked_by=None,
+                        locked_until=None)
+            return "done"
+        except Exception:
+            db.session.rollback()
+            error = traceback.format_exc()
+            current_app.logger.warning("task %s #%d failed (attempt %d):\n%s", row.name, row.id, row.attempts, error)
+
+            if t is not None and row.attempts < row.max_attempts:
+                run_at = datetime.utcnow() + timedelta(seconds=t.retry_in(row.attempts))
+                self.finish(row.id, worker, status="queued", run_at=run_at, locked_by=None,
+                            locked_until=None, last_error=error)
+                return "queued"
+            self.finish(row.id, worker, status="dead", finished_at=datetime.utcnow(), locked_by=None,
+                        locked_until=None, last_error=error)
+            return "dead"
+
+    def work_thread(self, app, worker: str, batch: int, poll: float):
+        idle = poll
+        while not self._stop.is_set():
+            try:
+                with app.app_context():
+                    rows = self.claim(batch, worker)
+                    for row in rows:
+                        self.execute(row, worker)
+            except SQLAlchemyError as e:
+                app.logger.warning("task worker %s: %s", worker, e)
+                rows = []
+
+            if rows:
+                idle = poll
+            else:
+                # back off while the queue is empty, up to 10x the poll interval
+                self._stop.wait(idle * random.uniform(0.8, 1.2))
+                idle = min(idle * 2, poll * 10)
+
+    def work(self, app, threads: int = 4, batch: int = 1, poll: float = 1.0):
+        """Run `threads` worker loops in this process until SIGTERM/SIGINT."""
+        def stop(signum, frame):
+            self._stop.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.instance = instance_name()  # per process after a fork
+        pool = [
+            threading.Thread(
+                target=self.work_thread,
+                args=(app, f"{self.instance}/{i}", batch, poll),
+                name=f"task-{i}",
+            )
+            for i in range(threads)
+        ]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+
+    def work_processes(self, app, processes: int, threads: int, batch: int, poll: float):
+        """Fork `processes` workers (each with its own pools) and wait for them."""
+        ctx = multiprocessing.get_context("fork")
+
+        def child():
+            with app.app_context():
+                for engine in db.engines.values():
+                    engine.dispose(close=False)  # never share the parent's connections
+            self.work(app, threads, batch, poll)
+
+        procs = [ctx.Process(target=child, name=f"tasks-{i}") for i in range(processes)]
+        for p in procs:
+            p.start()
+
+        def stop(signum, frame):
+            for p in procs:
+                if p.is_alive():
+                    p.terminate()  # children stop after their current task
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for p in procs:
+            p.join()
+
+    def stats(self) -> dict:
+        counts = dict(db.session.execute(select(Task.status, func.count(Task.id)).group_by(Task.status)).all())
+        oldest = db.session.execute(
+            select(func.min(Task.run_at)).where(Task.status == "queued", Task.run_at <= datetime.utcnow())
+        ).scalar()
+        return {
+            "counts": counts,
+            "oldest_ready_s": round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else 0,
+        }
+
+
+task_queue = TaskQueue()
@@ -0,0 +1,4 @@
+from app.asgi import create_asgi_app
+
+# uvicorn asgi:app --port 5000   (see app/asgi.py)
+app = create_asgi_app()
@@ -0,0 +1,79 @@
+"""Shared helpers for the benchmark scripts (not imported by the app)."""
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+
+def make_app(db_path=None):
+    """create_app() against a throwaway SQLite file with the schema created."""
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(suffix=".db", prefix="skillswap-bench-")
+        os.close(fd)
+        os.unlink(db_path)
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app, db_path
+
+
+def fill_skills(db, n, users=100):
+    from app.models.user import User
+    from app.models.skill import Skill
+
+    now = datetime.utcnow()
+    db.session.execute(
+        User.__table__.insert(),
+        [
+            {"name": f"user {i}", "email": f"user{i}@bench.local", "password_hash": "x",
+             "role": "student", "is_active": True, "created_at": now}
+            for i in range(1, users + 1)
+        ],
+    )
+    db.session.execute(
+        Skill.__table__.insert(),
+        [
+            {"user_id": i % users + 1, "type": "offer" if i % 2 else "seek", "title": f"skill {i}",
+             "description": "lorem ipsum dolor sit amet " * 12, "tags": "music,guitar,theory",
+             "visibility": "public", "created_at": now - timedelta(seconds=i)}
+            for i in range(n)
+        ],
+    )
+    db.session.commit()
+
+
+def measure(fn, repeat=10):
+    """Median/p95 wall time (ms) plus tracemalloc peak (bytes) of one run."""
+    fn()  # warm caches (compiled statement cache, imports)
+
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "p95_ms": round(times[min(int(0.95 * len(times)), len(times) - 1)], 3),
+        "peak_bytes": peak,
+    }
+
+
+def cleanup(db_path):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.unlink(db_path + suffix)
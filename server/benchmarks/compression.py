@@ -0,0 +1,116 @@
+"""
+Compression CPU cost vs bytes saved for typical SkillSwap payloads.
+
+Payloads: one /api/skills page (50 rows with descriptions), one /admin/sessions
+page (50 rows with nested users/skills) and a 10k-row NDJSON export.
+Codecs: gzip at levels 1/6/9 and brotli at quality 1/4/11 (if installed).
+
+    cd server
+    python -m benchmarks.compression [--json]
+"""
+import argparse
+import json
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from app.utils.compression import brotli
+from app.utils.json_provider import dumps_bytes
+
+
+def skills_page(n=50):
+    now = datetime.utcnow()
+    return {
+        "data": [
+            {"id": i, "user_id": i % 17, "type": "offer", "title": f"Intro to guitar #{i}",
+             "description": "Learn chords, strumming patterns and a couple of songs. " * 4,
+             "tags": "music,guitar,beginner", "visibility": "public", "created_at": now - timedelta(hours=i)}
+            for i in range(n)
+        ],
+        "meta": {"page": 1, "pageSize": n, "total": 5000, "totalPages": 100},
+    }
+
+
+def sessions_page(n=50):
+    now = datetime.utcnow()
+    user = lambda i: {"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "role": "student"}
+    return {
+        "data": [
+            {"id": i, "requester_id": i % 13, "provider_id": i % 7, "skill_id": i, "message": "Hey, can we meet Tuesday?",
+             "status": "accepted", "schedule_status": "proposed", "scheduled_start": now, "scheduled_end": now,
+             "timezone": "America/Denver", "created_at": now, "responded_at": now,
+             "requester": user(i % 13), "provider": user(i % 7),
+             "skill": {"id": i, "title": f"Skill {i}", "type": "offer", "visibility": "public"}}
+            for i in range(n)
+        ],
+        "meta": {"page": 1, "pageSize": n, "total": 5000, "totalPages": 100},
+    }
+
+
+def export_ndjson(n=10000):
+    rows = skills_page(n)["data"]
+    return b"\n".join(dumps_bytes(r) for r in rows) + b"\n"
+
+
+def codecs():
+    for level in (1, 6, 9):
+        def gz(data, level=level):
+            c = zlib.compressobj(level, zlib.DEFLATED, 31)
+            return c.compress(data) + c.flush()
+        yield f"gzip-{level}", gz
+    if brotli is not None:
+        for q in (1, 4, 11):
+            yield f"br-{q}", lambda data, q=q: brotli.compress(data, quality=q)
+
+
+def bench(data, fn, repeat):
+    times = []
+    out = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(data)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return times[len(times) // 2] * 1000, len(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    payloads = {
+        "skills_page": dumps_bytes(skills_page()),
+        "admin_sessions_page": dumps_bytes(sessions_page()),
+        "export_10k": export_ndjson(),
+    }
+
+    results = []
+    for pname, data in payloads.items():
+        for cname, fn in codecs():
+            ms, size = bench(data, fn, args.repeat if pname != "export_10k" else max(args.repeat // 4, 1))
+            results.append({
+                "payload": pname,
+                "codec": cname,
+                "raw_bytes": len(data),
+                "compressed_bytes": size,
+                "ratio": round(size / len(data), 3),
+                "cpu_ms": round(ms, 3),
+                "mb_per_s": round(len(data) / 1e6 / (ms / 1000), 1) if ms else None,
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    if brotli is None:
+        print("(brotli not installed: gzip only)")
+    print(f"{'payload':<22}{'codec':<9}{'raw KB':>9}{'out KB':>9}{'ratio':>8}{'cpu ms':>9}{'MB/s':>8}")
+    for r in results:
+        print(f"{r['payload']:<22}{r['codec']:<9}{r['raw_bytes'] / 1024:>9.1f}{r['compressed_bytes'] / 1024:>9.1f}"
+              f"{r['ratio']:>8}{r['cpu_ms']:>9}{r['mb_per_s']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Gunicorn worker profiles (gunicorn.conf.py) against a real server.
+
+Seeds a throwaway SQLite file, then for each GUNICORN_PROFILE starts gunicorn
+on a free port and drives it over HTTP for --seconds with --concurrency
+client threads. Each client logs in once, then mixes:
+
+    bcrypt-bound  POST /auth/login                         (--login-ratio)
+    IO-bound      GET /sessions/mine, /notifications,
+                  /api/skills?q=<topic>                    (the rest)
+
+Prints req/s plus p50/p95 per route class and errors per profile. gevent is
+skipped unless it's installed.
+
+    cd server
+    python -m benchmarks.gunicorn_profiles --concurrency 16 --seconds 15
+    python -m benchmarks.gunicorn_profiles --profiles sync,gthread --workers 2 --json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks.common import cleanup
+from benchmarks.load import TOPICS, percentile, setup_app
+
+SERVER_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def available_profiles():
+    profiles = ["sync", "gthread"]
+    try:
+        import gevent  # noqa: F401
+        profiles.append("gevent")
+    except ImportError:
+        pass
+    return profiles
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seeded_emails(app, n):
+    from sqlalchemy import select
+    from app.extensions import db
+    from app.models.user import User
+
+    with app.app_context():
+        return db.session.execute(
+            select(User.email).where(User.is_active.is_(True)).order_by(User.id).limit(n)
+        ).scalars().all()
+
+
+def start_server(profile, port, db_path, args, metrics_dir):
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "GUNICORN_PROFILE": profile,
+        "PORT": str(port),
+        "PROMETHEUS_MULTIPROC_DIR": metrics_dir,
+        "SLOW_QUERY_MS": "-1",
+    }
+    if args.workers:
+        env["WEB_CONCURRENCY"] = str(args.workers)
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:create_app()", "--config", "gunicorn.conf.py"],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn ({profile}) exited:\n{proc.stderr.read()}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/api/skills")
+            conn.getresponse().read()
+            conn.close()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+
+    proc.kill()
+    raise RuntimeError(f"gunicorn ({profile}) didn't come up in 30s")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+class Client:
+    def __init__(self, port):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        self.cookie = None
+
+    def send(self, method, url, body=None):
+        headers = {"Cookie": self.cookie} if self.cookie else {}
+        if body is not None:
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            self.conn.request(method, url, body=body, headers=headers)
+            resp = self.conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()  # reconnects on the next request
+            return None, None
+        return resp.status, resp.msg.get_all("Set-Cookie") or []
+
+    def login(self, email, password):
+        status, cookies = self.send("POST", "/auth/login", {"email": email, "password": password})
+        for cookie in cookies or []:
+            if cookie.startswith("access_token_cookie="):
+                self.cookie = cookie.split(";", 1)[0]
+        return status
+
+
+def drive(port, email, args, stop, samples, lock, rng):
+    client = Client(port)
+    client.login(email, "password")
+
+    local = defaultdict(list)
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        if rng.random() < args.login_ratio:
+            kind, status = "bcrypt", client.login(email, "password")
+        else:
+            url = rng.choice(["/sessions/mine", "/notifications", f"/api/skills?q={rng.choice(TOPICS)}"])
+            kind, (status, _) = "io", client.send("GET", url)
+        local[kind].append(((time.perf_counter() - t0) * 1000, status))
+
+    with lock:
+        for kind, rows in local.items():
+            samples[kind].extend(rows)
+
+
+def run_profile(profile, db_path, emails, args):
+    metrics_dir = tempfile.mkdtemp(prefix="skillswap-metrics-")
+    port = free_port()
+    proc = start_server(profile, port, db_path, args, metrics_dir)
+
+    samples, lock, stop = defaultdict(list), threading.Lock(), threading.Event()
+    threads = [
+        threading.Thread(
+            target=drive,
+            args=(port, emails[i % len(emails)], args, stop, samples, lock, random.Random(args.seed + i)),
+        )
+        for i in range(args.concurrency)
+    ]
+    try:
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+    finally:
+        stop_server(proc)
+        for name in os.listdir(metrics_dir):
+            os.unlink(os.path.join(metrics_dir, name))
+        os.rmdir(metrics_dir)
+
+    result = {"rps": round(sum(len(rows) for rows in samples.values()) / wall, 1)}
+    for kind in ("bcrypt", "io"):
+        rows = samples.get(kind, [])
+        times = sorted(ms for ms, status in rows if status)
+        result[kind] = {
+            "count": len(rows),
+            "errors": sum(1 for _, status in rows if not status or status >= 500),
+            "p50_ms": percentile(times, 50),
+            "p95_ms": percentile(times, 95),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default=",".join(available_profiles()))
+    parser.add_argument("--workers", type=int, help="WEB_CONCURRENCY for every profile (default: CPU-derived)")
+    parser.add_argument("--concurrency", type=int, default=16, help="client threads")
+    parser.add_argument("--seconds", type=float, default=15, help="load duration per profile")
+    parser.add_argument("--login-ratio", type=float, default=0.1, help="share of requests that are logins")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--skills", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    app, db_path = setup_app(args)
+    try:
+        emails = seeded_emails(app, args.concurrency)
+        results = {p: run_profile(p, db_path, emails, args) for p in args.profiles.split(",")}
+    finally:
+        cleanup(db_path)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.concurrency} clients, {args.seconds}s per profile, {args.login_ratio:.0%} logins")
+    print(f"{'profile':<10}{'req/s':>8}{'login p50':>11}{'login p95':>11}{'io p50':>9}{'io p95':>9}{'errors':>8}")
+    for name, r in results.items():
+        errors = r["bcrypt"]["errors"] + r["io"]["errors"]
+        print(f"{name:<10}{r['rps']:>8}{r['bcrypt']['p50_ms']!s:>11}{r['bcrypt']['p95_ms']!s:>11}"
+              f"{r['io']['p50_ms']!s:>9}{r['io']['p95_ms']!s:>9}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
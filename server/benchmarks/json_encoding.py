@@ -0,0 +1,98 @@
+"""
+Response encoding: Flask's default provider vs FastJSONProvider.
+
+Encodes an admin-sessions-shaped list of N rows (default 10k):
+  - default: per-field .isoformat() in the handler + DefaultJSONProvider
+  - fast:    raw datetimes/rows + FastJSONProvider (orjson when installed)
+
+    cd server
+    python -m benchmarks.json_encoding --rows 10000 [--json]
+"""
+import argparse
+import json
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.serializers.session_request import session_dict
+from app.utils import json_provider
+from benchmarks.common import measure
+
+
+class FakeRow:
+    __slots__ = (
+        "id", "requester_id", "provider_id", "skill_id", "message", "status", "schedule_status",
+        "scheduled_start", "scheduled_end", "timezone", "created_at", "responded_at",
+    )
+
+    def __init__(self, i, now):
+        self.id = i
+        self.requester_id = i % 97
+        self.provider_id = i % 89
+        self.skill_id = i % 1000
+        self.message = "Hi! I'd love to learn this, are you free next week? " * 2
+        self.status = "accepted"
+        self.schedule_status = "confirmed"
+        self.scheduled_start = now + timedelta(hours=i)
+        self.scheduled_end = now + timedelta(hours=i + 1)
+        self.timezone = "America/Denver"
+        self.created_at = now - timedelta(minutes=i)
+        self.responded_at = now
+
+
+def iso(dt):
+    return dt.isoformat() if dt else None
+
+
+def legacy_dict(r):
+    d = session_dict(r)
+    for k in ("scheduled_start", "scheduled_end", "created_at", "responded_at"):
+        d[k] = iso(d[k])
+    return d
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    rows = [FakeRow(i, now) for i in range(args.rows)]
+
+    default_app = Flask("default")
+    default_app.json = DefaultJSONProvider(default_app)
+    fast_app = Flask("fast")
+    fast_app.json = json_provider.FastJSONProvider(fast_app)
+
+    def run_default():
+        with default_app.app_context():
+            return default_app.json.response({"data": [legacy_dict(r) for r in rows]}).get_data()
+
+    def run_fast():
+        with fast_app.app_context():
+            return fast_app.json.response({"data": [session_dict(r) for r in rows]}).get_data()
+
+    results = []
+    for name, fn in (("default", run_default), ("fast", run_fast)):
+        r = measure(fn, args.repeat)
+        r["variant"] = name
+        r["rows"] = args.rows
+        r["bytes"] = len(fn())
+        results.append(r)
+
+    encoder = "orjson" if json_provider.orjson is not None else "stdlib json"
+    if args.json:
+        print(json.dumps({"encoder": encoder, "results": results}, indent=2))
+        return
+
+    print(f"encoder: {encoder}")
+    print(f"{'variant':<10}{'median ms':>11}{'p95 ms':>10}{'peak KB':>10}{'body KB':>10}")
+    for r in results:
+        print(f"{r['variant']:<10}{r['median_ms']:>11}{r['p95_ms']:>10}{r['peak_bytes'] // 1024:>10}{r['bytes'] // 1024:>10}")
+
+
+if __name__ == "__main__":
+    main()
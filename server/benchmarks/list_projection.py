@@ -0,0 +1,80 @@
+"""
+ORM entity hydration vs column projection for list endpoints.
+
+Loads N skill rows (default 10k) both ways and builds the same response dicts
+the /api/skills handler does.
+
+    cd server
+    python -m benchmarks.list_projection --rows 10000 [--json]
+"""
+import argparse
+import json
+
+from sqlalchemy import select
+
+from benchmarks.common import cleanup, fill_skills, make_app, measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    app, db_path = make_app()
+
+    from app.extensions import db
+    from app.models.skill import Skill
+    from app.routes.skills import SKILL_COLUMNS
+
+    def to_dict(s):
+        return {
+            "id": s.id,
+            "user_id": s.user_id,
+            "type": s.type,
+            "title": s.title,
+            "description": s.description,
+            "tags": s.tags,
+            "visibility": s.visibility,
+            "created_at": s.created_at.isoformat(),
+        }
+
+    def orm_entities():
+        rows = Skill.query.order_by(Skill.created_at.desc()).limit(args.rows).all()
+        out = [to_dict(s) for s in rows]
+        db.session.expunge_all()  # don't let the identity map carry over between runs
+        return out
+
+    def projected_rows():
+        rows = db.session.execute(
+            select(*SKILL_COLUMNS.values()).order_by(Skill.created_at.desc()).limit(args.rows)
+        ).all()
+        return [to_dict(s) for s in rows]
+
+    try:
+        with app.app_context():
+            fill_skills(db, args.rows)
+
+            results = []
+            for name, fn in (("orm_entities", orm_entities), ("projected_rows", projected_rows)):
+                r = measure(fn, args.repeat)
+                r["variant"] = name
+                r["rows"] = args.rows
+                r["us_per_row"] = round(r["median_ms"] * 1000 / args.rows, 3)
+                r["bytes_per_row"] = round(r["peak_bytes"] / args.rows, 1)
+                results.append(r)
+    finally:
+        cleanup(db_path)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'variant':<16}{'median ms':>11}{'p95 ms':>10}{'us/row':>9}{'peak B/row':>12}")
+    for r in results:
+        print(f"{r['variant']:<16}{r['median_ms']:>11}{r['p95_ms']:>10}{r['us_per_row']:>9}{r['bytes_per_row']:>12}")
+
+
+if __name__ == "__main__":
+    main()
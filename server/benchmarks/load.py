@@ -0,0 +1,249 @@
+"""
+End-to-end load test through the full WSGI stack.
+
+Boots create_app() on a fresh migrated SQLite file, seeds it (utils/seed.py),
+then runs --concurrency virtual users in threads. Each VU is a requester/
+provider pair that logs in, then repeats the full journey:
+
+    search skills -> request a session -> provider polls notifications,
+    publishes a slot and accepts -> requester picks the slot -> provider
+    confirms and completes -> requester reviews and checks /sessions/mine
+
+Reports p50/p95/p99 latency, error count and throughput per endpoint. --out
+writes the results as JSON (with the git commit), --compare diffs against a
+previous file.
+
+    cd server
+    python -m benchmarks.load --concurrency 8 --iterations 5 --out before.json
+    python -m benchmarks.load --concurrency 8 --iterations 5 --compare before.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from benchmarks.common import cleanup
+
+TOPICS = ["guitar", "python", "spanish", "cooking", "chess", "photography", "calculus", "yoga"]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)  # endpoint -> [(ms, status)]
+        self._lock = threading.Lock()
+
+    def call(self, client, label, method, url, **kwargs):
+        t0 = time.perf_counter()
+        resp = client.open(url, method=method, **kwargs)
+        ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self.samples[label].append((ms, resp.status_code))
+        return resp
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    k = min(int(round(p / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return round(sorted_values[k], 2)
+
+
+def summarize(samples, wall_s):
+    endpoints = {}
+    for label, rows in sorted(samples.items()):
+        times = sorted(ms for ms, _ in rows)
+        endpoints[label] = {
+            "count": len(rows),
+            "errors": sum(1 for _, status in rows if status >= 500),
+            "rejected": sum(1 for _, status in rows if 400 <= status < 500),
+            "p50_ms": percentile(times, 50),
+            "p95_ms": percentile(times, 95),
+            "p99_ms": percentile(times, 99),
+            "rps": round(len(rows) / wall_s, 1),
+        }
+    total = sum(e["count"] for e in endpoints.values())
+    return {"wall_s": round(wall_s, 2), "requests": total, "rps": round(total / wall_s, 1), "endpoints": endpoints}
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def setup_app(args):
+    fd, db_path = tempfile.mkstemp(suffix=".db", prefix="skillswap-load-")
+    os.close(fd)
+    os.unlink(db_path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("SLOW_QUERY_MS", "-1")  # bulk seeding would flood the log
+
+    from flask_migrate import upgrade
+    from app import create_app
+    from app.utils.seed import Seeder
+
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=os.path.join(os.path.dirname(__file__), "..", "migrations"))
+        Seeder(seed=args.seed, echo=lambda *_: None).run(
+            users=args.users, skills=args.skills, requests=args.requests, slots=args.users, admins=0,
+        )
+    return app, db_path
+
+
+def pick_pairs(app, n, rng):
+    """(requester_email, provider_email, provider_skill_id) per VU; all active accounts."""
+    from sqlalchemy import func, select
+    from app.extensions import db
+    from app.models.skill import Skill
+    from app.models.user import User
+
+    with app.app_context():
+        owners = db.session.execute(
+            select(Skill.user_id, func.min(Skill.id).label("id"))
+            .join(User, User.id == Skill.user_id)
+            .where(Skill.visibility == "public", User.is_active.is_(True))
+            .group_by(Skill.user_id)
+        ).all()
+        users = db.session.execute(select(User.id, User.email).where(User.is_active.is_(True))).all()
+
+    emails = {u.id: u.email for u in users}
+    owners = rng.sample(owners, n)
+    used = {o.user_id for o in owners}
+    requesters = rng.sample([u.id for u in users if u.id not in used], n)
+    return [(emails[r], emails[o.user_id], o.id) for r, o in zip(requesters, owners)]
+
+
+def virtual_user(app, rec, vu, pair, iterations, password, rng, errors):
+    requester_email, provider_email, skill_id = pair
+    req, prov = app.test_client(), app.test_client()
+    for c in (req, prov):
+        c.environ_base["HTTP_ACCEPT_ENCODING"] = "gzip"
+
+    try:
+        for client, email in ((req, requester_email), (prov, provider_email)):
+            r = rec.call(client, "POST /auth/login", "POST", "/auth/login", json={"email": email, "password": password})
+            assert r.status_code == 200, r.get_json()
+
+        # slots far enough out not to collide across VUs/iterations
+        base = datetime.utcnow().replace(microsecond=0, second=0) + timedelta(days=30 + vu)
+
+        for i in range(iterations):
+            rec.call(req, "GET /api/skills", "GET", "/api/skills")
+            rec.call(req, "GET /api/skills?q", "GET", f"/api/skills?q={rng.choice(TOPICS)}&pageSize=12")
+
+            r = rec.call(req, "POST /sessions", "POST", "/sessions", json={"skill_id": skill_id, "message": "hi!"})
+            assert r.status_code == 201, r.get_json()
+            rid = r.get_json()["id"]
+
+            etag = None
+            for _ in range(2):  # the bell polls; second poll revalidates
+                headers = {"If-None-Match": etag} if etag else {}
+                r = rec.call(prov, "GET /notifications", "GET", "/notifications", headers=headers)
+                etag = r.headers.get("ETag") or etag
+                rec.call(prov, "GET /notifications/unread-count", "GET", "/notifications/unread-count")
+
+            start = base + timedelta(hours=2 * i)
+            r = rec.call(prov, "POST /availability", "POST", "/availability", json={
+                "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat(),
+            })
+            assert r.status_code == 201, r.get_json()
+            slot = r.get_json()["id"]
+
+            rec.call(prov, "POST /sessions/<id>/respond", "POST", f"/sessions/{rid}/respond", json={"action": "accept"})
+            rec.call(req, "GET /sessions/<id>/availability", "GET", f"/sessions/{rid}/availability")
+            rec.call(req, "POST /sessions/<id>/schedule", "POST", f"/sessions/{rid}/schedule",
+                     json={"action": "propose", "slot_id": slot})
+            rec.call(prov, "POST /sessions/<id>/schedule", "POST", f"/sessions/{rid}/schedule",
+                     json={"action": "confirm"})
+            rec.call(prov, "POST /sessions/<id>/respond", "POST", f"/sessions/{rid}/respond", json={"action": "complete"})
+            rec.call(req, "POST /reviews", "POST", "/reviews",
+                     json={"session_request_id": rid, "rating": rng.randint(3, 5), "comment": "thanks"})
+            rec.call(req, "GET /sessions/mine", "GET", "/sessions/mine")
+    except Exception as e:  # keep the other VUs going; report at the end
+        errors.append(f"vu {vu}: {e!r}")
+
+
+def print_table(result, baseline=None):
+    print(f"{result['requests']} requests in {result['wall_s']}s -> {result['rps']} req/s")
+    header = f"{'endpoint':<36}{'n':>6}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>8}"
+    if baseline:
+        header += f"{'Δp95':>9}"
+    print(header)
+    for label, e in result["endpoints"].items():
+        line = (f"{label:<36}{e['count']:>6}{e['errors']:>5}{e['p50_ms']:>9}{e['p95_ms']:>9}"
+                f"{e['p99_ms']:>9}{e['rps']:>8}")
+        old = (baseline or {}).get("endpoints", {}).get(label)
+        if old and old["p95_ms"]:
+            line += f"{(e['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100:>+8.0f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="virtual users (threads)")
+    parser.add_argument("--iterations", type=int, default=5, help="journeys per virtual user")
+    parser.add_argument("--users", type=int, default=2000, help="seeded users")
+    parser.add_argument("--skills", type=int, default=20000, help="seeded skills")
+    parser.add_argument("--requests", type=int, default=20000, help="seeded session requests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="previous results JSON to diff p95 against")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    app, db_path = setup_app(args)
+    rng = random.Random(args.seed)
+    try:
+        pairs = pick_pairs(app, args.concurrency, rng)
+        rec, errors = Recorder(), []
+        threads = [
+            threading.Thread(
+                target=virtual_user,
+                args=(app, rec, vu, pairs[vu], args.iterations, "password", random.Random(args.seed + vu), errors),
+            )
+            for vu in range(args.concurrency)
+        ]
+
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+    finally:
+        cleanup(db_path)
+
+    result = {
+        "commit": git_commit(),
+        "at": datetime.utcnow().isoformat(timespec="seconds"),
+        "params": vars(args),
+        "vu_errors": errors,
+        **summarize(rec.samples, wall),
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        baseline = None
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        print_table(result, baseline)
+        for err in errors:
+            print("!", err)
+
+
+if __name__ == "__main__":
+    main()
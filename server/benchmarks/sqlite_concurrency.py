@@ -0,0 +1,175 @@
+"""
+SQLite concurrency benchmark: default connection setup vs the tuned pragmas.
+
+Simulates gunicorn workers as separate processes hammering one SQLite file
+with a read-heavy mix (skill listing page reads + notification inserts).
+
+    cd server
+    python -m benchmarks.sqlite_concurrency --workers 4 --seconds 5 --write-ratio 0.2
+
+Prints ops/sec, "database is locked" errors and p50/p95 latency per profile.
+Pass --json for machine-readable output.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.utils.db_tuning import install_sqlite_pragmas, sqlite_pragmas
+
+PROFILES = {
+    # what create_app did before: rollback journal, no busy timeout
+    "default": {},
+    "tuned": {
+        "SQLITE_JOURNAL_MODE": "WAL",
+        "SQLITE_SYNCHRONOUS": "NORMAL",
+        "SQLITE_BUSY_TIMEOUT_MS": 5000,
+        "SQLITE_MMAP_SIZE": 256 * 1024 * 1024,
+        "SQLITE_CACHE_SIZE": -20000,
+        "SQLITE_FOREIGN_KEYS": True,
+    },
+}
+
+
+def make_engine(path, profile):
+    engine = create_engine(f"sqlite:///{path}")
+    pragmas = sqlite_pragmas(PROFILES[profile])
+    if pragmas:
+        install_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def setup_db(path, rows):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE skills (id INTEGER PRIMARY KEY, user_id INTEGER, title TEXT,"
+            " description TEXT, visibility TEXT, created_at TEXT)"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_skills_created_at ON skills (created_at)")
+        conn.exec_driver_sql(
+            "CREATE TABLE notifications (id INTEGER PRIMARY KEY, user_id INTEGER,"
+            " title TEXT, body TEXT, created_at TEXT)"
+        )
+        conn.execute(
+            text(
+                "INSERT INTO skills (user_id, title, description, visibility, created_at)"
+                " VALUES (:u, :t, :d, 'public', :c)"
+            ),
+            [
+                {"u": i % 500, "t": f"skill {i}", "d": "x" * 200, "c": f"2026-01-01T00:{i % 60:02d}:00"}
+                for i in range(rows)
+            ],
+        )
+    engine.dispose()
+
+
+def worker(path, profile, seconds, write_ratio, seed, out):
+    rnd = random.Random(seed)
+    engine = make_engine(path, profile)
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    with engine.connect() as conn:
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                if rnd.random() < write_ratio:
+                    with conn.begin():
+                        conn.execute(
+                            text("INSERT INTO notifications (user_id, title, body, created_at) VALUES (:u, 't', 'b', 'now')"),
+                            {"u": rnd.randrange(500)},
+                        )
+                else:
+                    with conn.begin():
+                        conn.execute(
+                            text("SELECT id, title, description FROM skills WHERE visibility = 'public'"
+                                 " ORDER BY created_at DESC LIMIT 12 OFFSET :o"),
+                            {"o": rnd.randrange(0, 500)},
+                        ).fetchall()
+                latencies.append(time.perf_counter() - t0)
+            except OperationalError:
+                errors += 1
+
+    engine.dispose()
+    out.put((latencies, errors))
+
+
+def run_profile(profile, workers, seconds, write_ratio, rows):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.unlink(path)
+    try:
+        setup_db(path, rows)
+        if PROFILES[profile].get("SQLITE_JOURNAL_MODE"):
+            # journal_mode=WAL is persistent; set it once up front like the first app connection would
+            make_engine(path, profile).connect().close()
+
+        out = mp.Queue()
+        procs = [
+            mp.Process(target=worker, args=(path, profile, seconds, write_ratio, i, out))
+            for i in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+    latencies = sorted(l for lat, _ in results for l in lat)
+    errors = sum(e for _, e in results)
+    ok = len(latencies)
+
+    def pct(p):
+        return round(latencies[min(int(p * ok), ok - 1)] * 1000, 3) if ok else None
+
+    return {
+        "profile": profile,
+        "workers": workers,
+        "ops": ok,
+        "ops_per_sec": round(ok / seconds, 1),
+        "locked_errors": errors,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3) if ok else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = [
+        run_profile(profile, args.workers, args.seconds, args.write_ratio, args.rows)
+        for profile in PROFILES
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'profile':<10}{'ops/s':>10}{'locked':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r['profile']:<10}{r['ops_per_sec']:>10}{r['locked_errors']:>8}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Gunicorn settings, picked up automatically from the working directory
+# (start.sh runs `gunicorn "app:create_app()"` from server/).
+#
+# GUNICORN_PROFILE picks the worker model:
+#   sync    - one request per process; workers = 2 * CPUs + 1
+#   gthread - CPUs workers x GUNICORN_THREADS threads (default 4); bcrypt and
+#             sqlite3/psycopg2 release the GIL, so threads overlap login hashing
+#             and DB waits at a fraction of the memory of extra processes
+#   gevent  - CPUs workers x GUNICORN_CONNECTIONS greenlets; needs `pip install
+#             gevent` (and psycogreen for Postgres), only pays off for slow IO
+# WEB_CONCURRENCY overrides the worker count (Render sets it per instance size).
+#
+# preload_app imports the app once in the master and forks it, so workers
+# start fast and share the code pages. Anything holding a socket must then be
+# reopened per worker: post_fork drops the SQLAlchemy pools inherited from the
+# master (the cache's SQLite backend reopens on its own, see utils/cache.py).
+# gevent doesn't preload by default: the app's locks would be created before
+# the worker monkey-patches threading.
+#
+# `python -m benchmarks.gunicorn_profiles` compares the profiles on this app.
+import multiprocessing
+import os
+
+
+def cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # respects container CPU pinning
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+PROFILES = {
+    "sync": {"worker_class": "sync", "workers": 2 * cpu_count() + 1},
+    "gthread": {"worker_class": "gthread", "workers": max(cpu_count(), 2)},
+    "gevent": {"worker_class": "gevent", "workers": max(cpu_count(), 2)},
+}
+
+profile = os.getenv("GUNICORN_PROFILE", "gthread").lower()
+if profile not in PROFILES:
+    raise ValueError(f"GUNICORN_PROFILE must be one of {', '.join(PROFILES)}, not {profile!r}.")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = PROFILES[profile]["worker_class"]
+workers = int(os.getenv("WEB_CONCURRENCY") or PROFILES[profile]["workers"])
+threads = int(os.getenv("GUNICORN_THREADS", "4")) if profile == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_CONNECTIONS", "100"))  # gevent; keep near the DB pool size
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "false" if profile == "gevent" else "true").lower() == "true"
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))  # behind Render's proxy
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))  # 0 = never recycle workers
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG")  # "-" for stdout; off by default
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+
+    from app.extensions import db
+
+    app = worker.app.wsgi()  # already loaded in the master
+    with app.app_context():
+        for engine in db.engines.values():
+            # close=False: leave the parent's connections alone, just forget them
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    server.log.info(
+        "profile %s: %d x %s worker(s), %d thread(s), preload=%s",
+        profile, workers, worker_class, threads, preload_app,
+    )
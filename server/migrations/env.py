@@ -90,21 +90,47 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # FTS5 virtual tables (and their shadow tables) are managed by hand in
+    # the admin search migration; keep autogenerate from trying to drop them
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == "table" and reflected and "_fts" in name:
+            return False
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=get_metadata(),
-            **conf_args
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        # batch migrations recreate tables; with FK enforcement on (see
+        # SQLITE_FOREIGN_KEYS) the implicit DROP TABLE would cascade/fail
+        restore_fks = False
+        if connection.dialect.name == "sqlite":
+            restore_fks = bool(connection.exec_driver_sql("PRAGMA foreign_keys").scalar())
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            # close the autobegun transaction so alembic owns (and commits) its own
+            connection.commit()
+
+        try:
+            context.configure(
+                connection=connection,
+                target_metadata=get_metadata(),
+                **conf_args
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if restore_fks:
+                # the connection goes back to the pool: an in-process upgrade
+                # (tests, benchmarks) must not leave the app without FKs
+                connection.rollback()
+                connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+                connection.commit()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,81 @@
+"""admin search indexes
+
+Revision ID: 4b7e1f0c9a21
+Revises: 72ce4e9dc02c
+Create Date: 2026-02-02 10:14:52.118304
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "4b7e1f0c9a21"
+down_revision = "72ce4e9dc02c"
+branch_labels = None
+depends_on = None
+
+# SQLite: external-content FTS5 tables (trigram tokenizer => substring search)
+# kept in sync with triggers. Postgres: pg_trgm GIN indexes so ILIKE '%x%' is indexed.
+FTS_TABLES = {
+    "users_fts": ("users", ["name", "email"]),
+    "session_requests_fts": ("session_requests", ["message"]),
+}
+
+TRGM_INDEXES = {
+    "ix_users_name_trgm": ("users", "name"),
+    "ix_users_email_trgm": ("users", "email"),
+    "ix_session_requests_message_trgm": ("session_requests", "message"),
+}
+
+
+def _create_fts(fts, table, cols):
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+
+    op.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{col_list}, content='{table}', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END"
+    )
+    # backfill existing rows
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        for fts, (table, cols) in FTS_TABLES.items():
+            _create_fts(fts, table, cols)
+
+    elif dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, (table, col) in TRGM_INDEXES.items():
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({col} gin_trgm_ops)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        for fts in FTS_TABLES:
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
+
+    elif dialect == "postgresql":
+        for name in TRGM_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,46 @@
+"""add user changes
+
+Revision ID: 7d2a6c91e0b4
+Revises: e5f19b7c3d42
+Create Date: 2026-02-16 10:04:12.918342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2a6c91e0b4'
+down_revision = 'e5f19b7c3d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table('user_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('user_changes', schema=None) as batch_op:
+        batch_op.create_index('ix_user_changes_user_seq', ['user_id', 'seq'], unique=False)
+        batch_op.create_index(batch_op.f('ix_user_changes_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_changes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_changes_created_at'))
+        batch_op.drop_index('ix_user_changes_user_seq')
+
+    op.drop_table('user_changes')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('change_seq')
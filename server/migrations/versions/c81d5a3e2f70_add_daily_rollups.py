@@ -0,0 +1,45 @@
+"""add daily rollups
+
+Revision ID: c81d5a3e2f70
+Revises: 4b7e1f0c9a21
+Create Date: 2026-02-05 16:40:11.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81d5a3e2f70'
+down_revision = '4b7e1f0c9a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_rollups',
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('metric', 'day')
+    )
+    op.create_table('rollup_watermarks',
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('last_id', sa.Integer(), nullable=True),
+    sa.Column('last_ts', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('source')
+    )
+    # the rollup job scans status transitions by responded_at
+    with op.batch_alter_table('session_requests', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_session_requests_responded_at'), ['responded_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('session_requests', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_session_requests_responded_at'))
+
+    op.drop_table('rollup_watermarks')
+    op.drop_table('daily_rollups')
@@ -0,0 +1,34 @@
+"""add cache versions
+
+Revision ID: e5f19b7c3d42
+Revises: c81d5a3e2f70
+Create Date: 2026-02-09 11:27:45.530218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f19b7c3d42'
+down_revision = 'c81d5a3e2f70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cache_versions',
+    sa.Column('tag', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('tag')
+    )
+    with op.batch_alter_table('cache_versions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_cache_versions_version'), ['version'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('cache_versions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cache_versions_version'))
+
+    op.drop_table('cache_versions')
@@ -3,4 +3,25 @@ set -o errexit
 
 flask db upgrade
 
-gunicorn "app:create_app()" --bind 0.0.0.0:$PORT
+# per-worker metric files, aggregated by /metrics (see app/utils/metrics.py)
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/skillswap-metrics}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# SERVER_MODE=jobs: the periodic job scheduler instead of a web server (see app/jobs.py)
+if [ "${SERVER_MODE:-wsgi}" = "jobs" ]; then
+  exec flask jobs run
+fi
+
+# SERVER_MODE=tasks: a background task worker (set TASKS_EAGER=false on the web service)
+if [ "${SERVER_MODE:-wsgi}" = "tasks" ]; then
+  exec flask tasks work
+fi
+
+# SERVER_MODE=asgi: uvicorn with async notification streams (see app/asgi.py)
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+  exec uvicorn asgi:app --host 0.0.0.0 --port "$PORT" --workers "${WEB_CONCURRENCY:-2}" --proxy-headers
+fi
+
+# worker model, counts and preload: see gunicorn.conf.py (GUNICORN_PROFILE etc.)
+gunicorn "app:create_app()" --config gunicorn.conf.py
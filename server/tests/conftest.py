@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+import pytest
+
+# Config reads the environment at import time, so this runs before `app` is imported
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+_tmp = tempfile.mkdtemp(prefix="skillswap-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["QUERY_DEBUG"] = "true"
+os.environ["CACHE_BACKEND"] = "null"  # every request does its uncached work
+os.environ["METRICS_ENABLED"] = "false"
+os.environ["PROFILE_ENABLED"] = "false"
+
+from flask_migrate import upgrade  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    return app
+
+
+@pytest.fixture(scope="session")
+def login(app):
+    def login(email, name="Test User", admin=False):
+        client = app.test_client()
+        client.post("/auth/register", json={"name": name, "email": email, "password": "pw"})
+        if admin:
+            with app.app_context():
+                db.session.execute(db.update(User).where(User.email == email).values(role="admin"))
+                db.session.commit()
+        r = client.post("/auth/login", json={"email": email, "password": "pw"})
+        assert r.status_code == 200, r.get_json()
+        return client
+    return login
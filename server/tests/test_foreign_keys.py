@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models.availabililty import Availability
+
+# SQLITE_FOREIGN_KEYS is on by default: deletes have to clean up every row
+# that points at what they remove.
+
+
+def test_foreign_keys_survive_migrations(app):
+    # the migration env turns enforcement off on its connection; the pool must not keep it that way
+    with app.app_context():
+        assert db.session.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+
+def test_delete_reviewed_skill_with_reserved_slot(app, login):
+    dana = login("dana@example.com", "Dana")
+    erin = login("erin@example.com", "Erin")
+
+    skill_id = dana.post("/api/skills", json={"type": "offer", "title": "Pottery"}).get_json()["id"]
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=3)
+    slot_id = dana.post("/availability", json={
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+    }).get_json()["id"]
+
+    request_id = erin.post("/sessions", json={"skill_id": skill_id, "message": "hi"}).get_json()["id"]
+    assert dana.post(f"/sessions/{request_id}/respond", json={"action": "accept"}).status_code == 200
+    r = erin.post(f"/sessions/{request_id}/schedule", json={"action": "propose", "slot_id": slot_id})
+    assert r.status_code == 200, r.get_json()
+    assert dana.post(f"/sessions/{request_id}/respond", json={"action": "complete"}).status_code == 200
+    r = erin.post("/reviews", json={"session_request_id": request_id, "rating": 5})
+    assert r.status_code == 201, r.get_json()
+
+    r = dana.delete(f"/api/skills/{skill_id}")
+    assert r.status_code == 200, r.get_json()
+
+    with app.app_context():
+        slot = db.session.get(Availability, slot_id)
+        assert slot is not None and slot.reserved_request_id is None
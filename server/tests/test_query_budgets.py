@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+# Every view with @query_budget, called through the test client. Under TESTING
+# an overrun raises QueryBudgetExceeded out of the request, failing the test.
+# The process is fresh, so first-request-only work (lazy lookups, warm-ups)
+# is counted too.
+
+SEARCHES = ["", "q=guitar", "q=%231", "q=email:bob@example.com", "q=status:accepted", "q=gu"]
+
+
+def budgeted_rules(app):
+    return [
+        rule for rule in app.url_map.iter_rules()
+        if "GET" in rule.methods and hasattr(app.view_functions[rule.endpoint], "query_budget")
+    ]
+
+
+@pytest.fixture(scope="module")
+def seeded(app, login):
+    admin = login("admin@example.com", "Admin", admin=True)
+    bob = login("bob@example.com", "Bob Guitar")
+    carol = login("carol@example.com", "Carol")
+
+    skill_id = bob.post("/api/skills", json={"type": "offer", "title": "Guitar", "tags": "music"}).get_json()["id"]
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=2)
+    r = bob.post("/availability", json={
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+    })
+    assert r.status_code == 201, r.get_json()
+
+    request_id = carol.post("/sessions", json={"skill_id": skill_id, "message": "hi"}).get_json()["id"]
+    assert bob.post(f"/sessions/{request_id}/respond", json={"action": "accept"}).status_code == 200
+
+    return {"clients": {"admin": admin, "bob": bob, "carol": carol}, "request_id": request_id}
+
+
+def test_every_budgeted_route_is_covered(app):
+    # a new budgeted GET route with url arguments needs a value in test_query_budgets
+    for rule in budgeted_rules(app):
+        assert set(rule.arguments) <= {"request_id"}, rule.rule
+
+
+@pytest.mark.parametrize("who", ["admin", "bob", "carol"])
+def test_budgets_hold(app, seeded, who):
+    client = seeded["clients"][who]
+    rules = budgeted_rules(app)
+    assert rules
+
+    for rule in rules:
+        path = rule.rule.replace("<int:request_id>", str(seeded["request_id"]))
+        for query in SEARCHES:
+            r = client.get(f"{path}?{query}" if query else path)
+            assert r.status_code < 500, (path, query, r.status_code)
+            assert "X-Query-Count" in r.headers